@@ -23,12 +23,21 @@ Usage:
    - The program will begin extracting hyperlinks from the PDF and downloading the linked files.
    - Downloaded files will be saved in the chosen directory with their respective names from the PDF hyperlinks.
 
-5. **Monitor Progress**:
+5. **Batch Mode (Folder of PDFs)**:
+   - Click the "Load PDF Folder" button and select a directory instead of a single PDF.
+   - Every PDF in the directory tree is scanned in parallel worker processes, and the links of all PDFs are
+     deduplicated into one shared download queue, so a file linked from many catalogues is fetched only once.
+   - After the downloads finish, a `manifest.json` is written to the download folder. It maps each source PDF
+     and page number to the downloaded file (or to the error that prevented the download).
+
+6. **Monitor Progress**:
    - The status area below the buttons will display messages indicating the progress, including any errors or issues encountered during the download process.
 
 Note:
 -------------
 - Ensure you have a stable internet connection during the download process.
+- Links are taken from URI and Launch link annotations. Widgets and links without an action are skipped.
+  Tick "Also find plain-text URLs in page text" to also pick up URLs that are printed but not clickable.
 - The program attempts to name downloaded files based on the hyperlink text in the PDF. If a name cannot be extracted, a default name will be used.
 
 Dependencies:
@@ -38,21 +47,65 @@ Ensure you have the following Python packages installed:
 - PyQt5 or PyQt6: For the graphical user interface.
 - requests: To handle file downloads.
 - PyPDF2: Used for extracting hyperlinks from PDFs.
+- http_session.py: Shared pooled HTTP session, shipped alongside this script.
+- download_storage.py: Streaming downloads with cleanup of partial files, shipped alongside this script.
 
 To install the required packages, use the following pip commands:
 `pip install PyQt5 requests PyPDF2`
 or
 `pip install PyQt6 requests PyPDF2`
 '''
+import json
+import multiprocessing
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import PyPDF2
-import requests
+
+from http_session import get_session, DEFAULT_TIMEOUT
+from download_storage import download_to_file, plan_admission, probe_sizes
 
 try:
-	from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QFileDialog, QTextEdit, QVBoxLayout, QWidget
-	from PyQt6.QtCore import Qt
+	from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QFileDialog, QTextEdit, QVBoxLayout, QWidget, QCheckBox
+	from PyQt6.QtCore import Qt, QThread, pyqtSignal
 except ImportError:
-	from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QFileDialog, QTextEdit, QVBoxLayout, QWidget
-	from PyQt5.QtCore import Qt
+	from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QFileDialog, QTextEdit, QVBoxLayout, QWidget, QCheckBox
+	from PyQt5.QtCore import Qt, QThread, pyqtSignal
+
+MANIFEST_NAME = 'manifest.json'
+DOWNLOAD_WORKERS = 8
+
+# kind is 'uri', 'launch' (file launched or opened remotely), 'named' (named destination or action) or 'text'
+PDFLink = namedtuple('PDFLink', ['page', 'kind', 'target'])
+DOWNLOADABLE_KINDS = ('uri', 'launch', 'text')
+URL_PATTERN = re.compile(r'(?:https?|ftp)://[^\s<>"\'()\[\]{}]+', re.IGNORECASE)
+
+
+class BatchDownloader(QThread):
+	update_signal = pyqtSignal(str)
+
+	def __init__(self, source_folder, download_folder, scan_text=False):
+		super().__init__()
+		self.source_folder = source_folder
+		self.download_folder = download_folder
+		self.scan_text = scan_text
+
+	def run(self):
+		try:
+			self.update_signal.emit(f"Scanning PDFs in {self.source_folder}...")
+			sources, errors = harvest_links_from_directory(self.source_folder, scan_text=self.scan_text)
+			for pdf_path, error in errors.items():
+				self.update_signal.emit(f"Could not read {pdf_path}: {error}")
+			pdf_count = len({pdf_path for refs in sources.values() for pdf_path, _ in refs})
+			self.update_signal.emit(f"Found {len(sources)} unique links in {pdf_count} PDFs.")
+
+			results = download_links_batch(list(sources), self.download_folder, self.update_signal.emit)
+			manifest_path = write_manifest(self.download_folder, self.source_folder, sources, results)
+			self.update_signal.emit(f"Manifest written to {manifest_path}")
+		except Exception as e:
+			self.update_signal.emit(str(e))
 
 
 class PDFDownloaderApp(QMainWindow):
@@ -63,6 +116,12 @@ class PDFDownloaderApp(QMainWindow):
 		self.load_button = QPushButton('Load PDF', self)
 		self.load_button.clicked.connect(self.load_pdf)
 
+		self.load_folder_button = QPushButton('Load PDF Folder', self)
+		self.load_folder_button.clicked.connect(self.load_pdf_folder)
+		self.source_folder = ''
+
+		self.scan_text_checkbox = QCheckBox('Also find plain-text URLs in page text', self)
+
 		self.choose_folder_button = QPushButton('Choose Download Folder', self)
 		self.choose_folder_button.clicked.connect(self.choose_folder)
 		self.download_folder = ''  # Initialize with an empty string
@@ -78,6 +137,8 @@ class PDFDownloaderApp(QMainWindow):
 		# Set layout
 		layout = QVBoxLayout()
 		layout.addWidget(self.load_button)
+		layout.addWidget(self.load_folder_button)
+		layout.addWidget(self.scan_text_checkbox)
 		layout.addWidget(self.choose_folder_button)
 		layout.addWidget(self.start_download_button)
 		layout.addWidget(self.text_edit)
@@ -93,10 +154,23 @@ class PDFDownloaderApp(QMainWindow):
 		options = QFileDialog.Options()
 		file_name, _ = QFileDialog.getOpenFileName(self, "Open PDF File", "", "PDF Files (*.pdf);;All Files (*)", options=options)
 		if file_name:
-			self.links = extract_links_from_pdf(file_name)
-			self.text_edit.setPlainText('\n'.join(self.links))
+			self.source_folder = ''
+			try:
+				self.links = extract_links_from_pdf(file_name, self.scan_text_checkbox.isChecked())
+				self.text_edit.setPlainText('\n'.join(self.links))
+			except Exception as e:
+				self.links = []
+				self.text_edit.setPlainText(f"Failed to read links from PDF: {e}")
 		else:
 			self.text_edit.append("\nFailed to load PDF. Please try again.")
+
+	def load_pdf_folder(self):
+		folder = QFileDialog.getExistingDirectory(self, "Select Folder of PDFs")
+		if folder:
+			self.source_folder = folder
+			self.links = []
+			self.text_edit.setPlainText(f"Batch mode: PDFs in {folder} will be scanned when the download starts.")
+
 	def choose_folder(self):
 		self.download_folder = QFileDialog.getExistingDirectory(self, "Select Download Directory")
 		if self.download_folder:
@@ -108,6 +182,13 @@ class PDFDownloaderApp(QMainWindow):
 		if not self.download_folder:
 			self.text_edit.append("\nPlease choose a download folder first!")
 			return
+		if self.source_folder:
+			self.batch_downloader = BatchDownloader(self.source_folder, self.download_folder,
+											   self.scan_text_checkbox.isChecked())
+			self.batch_downloader.update_signal.connect(self.text_edit.append)
+			self.batch_downloader.finished.connect(lambda: self.text_edit.append("\nBatch download completed!"))
+			self.batch_downloader.start()
+			return
 		if not hasattr(self, 'links') or not self.links:
 			self.text_edit.append("\nPlease load a PDF file first!")
 			return
@@ -115,23 +196,198 @@ class PDFDownloaderApp(QMainWindow):
 		self.text_edit.append("\nDownload completed!")
 
 
-def extract_links_from_pdf(pdf_path):
+def _resolve(obj):
+	return obj.get_object() if obj is not None and hasattr(obj, 'get_object') else obj
+
+def _file_spec_target(spec):
+	# A file specification is either a plain string or a dictionary with /UF or /F
+	spec = _resolve(spec)
+	if isinstance(spec, dict):
+		spec = _resolve(spec.get('/UF')) or _resolve(spec.get('/F'))
+	return str(spec) if spec else None
+
+def _annotation_link(annotation):
+	"""Return (kind, target) for a link annotation, or None if it has no usable target"""
+	action = _resolve(annotation.get('/A'))
+	if isinstance(action, dict):
+		action_type = action.get('/S')
+		if action_type == '/URI':
+			uri = _resolve(action.get('/URI'))
+			return ('uri', str(uri)) if uri else None
+		if action_type in ('/Launch', '/GoToR'):
+			target = _file_spec_target(action.get('/F'))
+			return ('launch', target) if target else None
+		if action_type == '/Named':
+			name = _resolve(action.get('/N'))
+			return ('named', str(name)) if name else None
+		if action_type == '/GoTo':
+			destination = _resolve(action.get('/D'))
+			# Explicit destinations are arrays; named ones are names or strings
+			if isinstance(destination, str):
+				return ('named', str(destination))
+		return None
+	destination = _resolve(annotation.get('/Dest'))
+	if isinstance(destination, str):
+		return ('named', str(destination))
+	return None
+
+def extract_pdf_links(pdf_path, scan_text=False):
+	"""
+	Return a PDFLink for every link in the PDF, page numbers starting at 1.
+
+	Annotations without a usable target (widgets, links without actions,
+	explicit in-document destinations) are skipped instead of aborting the scan.
+	With `scan_text`, bare URLs in the page text are reported as kind 'text'.
+	"""
 	links = []
-	
+
 	with open(pdf_path, 'rb') as f:
 		reader = PyPDF2.PdfReader(f)
-		for page in reader.pages:
-			if page.get('/Annots'):
-				annotations = page['/Annots']
-				for annotation in annotations:
-					uri = annotation.get_object().get("/A").get("/URI")
-					if uri:
-						links.append(uri)
+		for page_number, page in enumerate(reader.pages, start=1):
+			# Resolve the annotation array and each annotation once per page
+			annotations = _resolve(page.get('/Annots')) or []
+			seen = set()
+			for annotation in annotations:
+				try:
+					annotation = _resolve(annotation)
+					if not isinstance(annotation, dict) or annotation.get('/Subtype') != '/Link':
+						continue
+					link = _annotation_link(annotation)
+				except Exception:
+					# A malformed annotation only costs its own link, not the whole page
+					continue
+				if link:
+					seen.add(link[1])
+					links.append(PDFLink(page_number, *link))
+
+			if scan_text:
+				try:
+					text = page.extract_text() or ''
+				except Exception:
+					text = ''
+				for match in URL_PATTERN.finditer(text):
+					url = match.group(0).rstrip('.,;:')
+					if url not in seen:
+						seen.add(url)
+						links.append(PDFLink(page_number, 'text', url))
 	return links
 
+def extract_page_links_from_pdf(pdf_path, scan_text=False):
+	"""Return (page_number, url) pairs for every downloadable link"""
+	return [(link.page, link.target) for link in extract_pdf_links(pdf_path, scan_text)
+			if link.kind in DOWNLOADABLE_KINDS and URL_PATTERN.match(link.target)]
+
+def extract_links_from_pdf(pdf_path, scan_text=False):
+	return [url for _, url in extract_page_links_from_pdf(pdf_path, scan_text)]
+
+def _harvest_pdf(pdf_path, scan_text=False):
+	# Runs in a worker process; errors are returned so one bad PDF does not stop the batch
+	try:
+		return pdf_path, extract_page_links_from_pdf(pdf_path, scan_text), None
+	except Exception as e:
+		return pdf_path, [], str(e)
+
+def find_pdfs(folder):
+	pdfs = []
+	for root, _, files in os.walk(folder):
+		for name in files:
+			if name.lower().endswith('.pdf'):
+				pdfs.append(os.path.join(root, name))
+	return sorted(pdfs)
+
+def harvest_links_from_directory(folder, max_workers=None, scan_text=False):
+	"""
+	Extract links from every PDF under `folder` in a process pool.
+	Returns ({uri: [(pdf_path, page_number), ...]}, {pdf_path: error}) with URIs
+	deduplicated across all PDFs, in the order they were first seen.
+	"""
+	sources = {}
+	errors = {}
+	pdfs = find_pdfs(folder)
+	if not pdfs:
+		return sources, errors
+	# Spawned, not forked: this runs from the BatchDownloader QThread, and forking a threaded Qt process is unsafe
+	context = multiprocessing.get_context('spawn')
+	with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+		for pdf_path, links, error in executor.map(_harvest_pdf, pdfs, [scan_text] * len(pdfs), chunksize=4):
+			if error:
+				errors[pdf_path] = error
+			for page_number, uri in links:
+				sources.setdefault(uri, []).append((pdf_path, page_number))
+	return sources, errors
+
+def unique_filename(link, used_names):
+	"""Name the file after the last URL segment, suffixing duplicates so nothing is overwritten"""
+	name = link.split('/')[-1].split('?')[0] or 'download'
+	base, ext = os.path.splitext(name)
+	counter = 1
+	while name in used_names:
+		name = f"{base}_{counter}{ext}"
+		counter += 1
+	used_names.add(name)
+	return name
+
+def download_links_batch(links, download_folder='.', report=print, max_workers=DOWNLOAD_WORKERS):
+	"""
+	Download every link once through the shared session, admitting only as many
+	files as fit in the free space of `download_folder` (see download_storage.py).
+	Returns {link: (filename, error)}, with filename None when the download failed or was deferred.
+	"""
+	session = get_session()
+	links = list(dict.fromkeys(links))
+	# Make sure the whole batch fits on disk before writing anything
+	sizes = probe_sizes(session, links)
+	admitted, deferred = plan_admission(links, sizes, download_folder)
+	total = sum(sizes.get(link) or 0 for link in admitted)
+	report(f"Queued {len(admitted)} files ({total / 1024 / 1024:.1f} MB known size).")
+	results = {}
+	if deferred:
+		report(f"Not enough free space for {len(deferred)} files, skipping:")
+		for link in deferred:
+			results[link] = (None, 'not enough free space')
+			report(f"  {link}")
+
+	used_names = set(os.listdir(download_folder))
+	targets = {link: unique_filename(link, used_names) for link in admitted}
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		futures = {
+			executor.submit(download_to_file, session, link, os.path.join(download_folder, name),
+							sizes.get(link)): link
+			for link, name in targets.items()
+		}
+		for future in as_completed(futures):
+			link = futures[future]
+			try:
+				future.result()
+				results[link] = (targets[link], None)
+				report(f"Downloaded: {targets[link]}")
+			except Exception as e:
+				results[link] = (None, str(e))
+				report(f"Failed: {link} ({e})")
+	return results
+
+def write_manifest(download_folder, source_folder, sources, results):
+	"""Write a manifest mapping each source PDF and page to the downloaded file"""
+	pdfs = {}
+	for link, refs in sources.items():
+		filename, error = results.get(link, (None, 'not downloaded'))
+		for pdf_path, page_number in refs:
+			entry = {'page': page_number, 'url': link, 'file': filename}
+			if error:
+				entry['error'] = error
+			pdfs.setdefault(os.path.relpath(pdf_path, source_folder), []).append(entry)
+	for entries in pdfs.values():
+		entries.sort(key=lambda entry: entry['page'])
+
+	manifest_path = os.path.join(download_folder, MANIFEST_NAME)
+	with open(manifest_path, 'w', encoding='utf-8') as f:
+		json.dump({'source_folder': source_folder, 'pdfs': pdfs}, f, indent=2)
+	return manifest_path
+
 def download_files_from_links(links, download_folder='.'):
+	session = get_session()
 	for link in links:
-		response = requests.get(link)
+		response = session.get(link, timeout=DEFAULT_TIMEOUT)
 		filename = link.split('/')[-1]
 		with open(f"{download_folder}/{filename}", 'wb') as f:
 			f.write(response.content)
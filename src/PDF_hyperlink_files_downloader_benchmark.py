@@ -0,0 +1,150 @@
+'''
+PDF Hyperlink Extraction Benchmark - User Manual
+
+Description:
+-------------
+Compares `extract_pdf_links` of `PDF_hyperlink_files_downloader.py` against the extractor it
+replaced, which looked up /A /URI on every annotation of every page. A synthetic annotation-heavy
+PDF is generated with a fixed random seed: every page carries many URI link annotations spread
+over the page. Only URI links are generated, since the old extractor stops at the first
+annotation without an action.
+
+Before timing, both extractors are checked to return the same (page, url) pairs.
+
+Timed operations:
+  - old_extractor    The previous per-annotation /A /URI lookup
+  - extract_links    extract_pdf_links() on the same file
+  - extract_text     extract_pdf_links(scan_text=True), which also scans the page text for URLs
+
+Usage:
+-------------
+    python PDF_hyperlink_files_downloader_benchmark.py
+    python PDF_hyperlink_files_downloader_benchmark.py --pages 2000 --links-per-page 200
+    python PDF_hyperlink_files_downloader_benchmark.py --output results.json
+
+Each operation is run `--repeat` times and the median is recorded. The script exits with
+status 1 if extract_links is slower than the old extractor by more than `--threshold`.
+
+Dependencies:
+-------------
+Same as PDF_hyperlink_files_downloader.py: PyPDF2 (3.x), PyQt5 or PyQt6 and requests.
+'''
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import PyPDF2
+from PyPDF2.generic import AnnotationBuilder
+
+from PDF_hyperlink_files_downloader import extract_page_links_from_pdf, extract_pdf_links
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+LINK_WIDTH, LINK_HEIGHT = 120, 12
+HOSTS = ['example.com', 'files.example.org', 'cdn.example.net', 'downloads.example.edu']
+
+
+def generate_pdf(path, page_count, links_per_page, seed=0):
+	"""Write a synthetic PDF whose pages are covered in URI link annotations"""
+	rng = random.Random(seed)
+	writer = PyPDF2.PdfWriter()
+	for page_num in range(page_count):
+		writer.add_blank_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+		for link_num in range(links_per_page):
+			x = rng.randrange(PAGE_WIDTH - LINK_WIDTH)
+			y = rng.randrange(PAGE_HEIGHT - LINK_HEIGHT)
+			url = f"https://{rng.choice(HOSTS)}/docs/{page_num}/file_{link_num}.pdf"
+			annotation = AnnotationBuilder.link(rect=(x, y, x + LINK_WIDTH, y + LINK_HEIGHT), url=url)
+			writer.add_annotation(page_number=page_num, annotation=annotation)
+	with open(path, 'wb') as f:
+		writer.write(f)
+
+
+def old_extract_page_links(pdf_path):
+	"""The extractor before extract_pdf_links: (page_number, uri) pairs, page numbers starting at 1"""
+	links = []
+
+	with open(pdf_path, 'rb') as f:
+		reader = PyPDF2.PdfReader(f)
+		for page_number, page in enumerate(reader.pages, start=1):
+			if page.get('/Annots'):
+				annotations = page['/Annots']
+				for annotation in annotations:
+					uri = annotation.get_object().get("/A").get("/URI")
+					if uri:
+						links.append((page_number, uri))
+	return links
+
+
+def time_call(func, repeat):
+	"""Median wall time of `repeat` calls to func, in seconds"""
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func()
+		timings.append(time.perf_counter() - start)
+	return statistics.median(timings)
+
+
+def run_benchmarks(pdf_path, repeat):
+	# Both extractors must agree before their timings mean anything
+	old = [(page, str(uri)) for page, uri in old_extract_page_links(pdf_path)]
+	if old != extract_page_links_from_pdf(pdf_path):
+		raise AssertionError("extract_pdf_links differs from the old extractor")
+
+	return {
+		'old_extractor': time_call(lambda: old_extract_page_links(pdf_path), repeat),
+		'extract_links': time_call(lambda: extract_pdf_links(pdf_path), repeat),
+		'extract_text': time_call(lambda: extract_pdf_links(pdf_path, scan_text=True), repeat),
+	}, len(old)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark PDF hyperlink extraction')
+	parser.add_argument('--pages', type=int, default=500, help='pages in the generated PDF')
+	parser.add_argument('--links-per-page', type=int, default=100, help='link annotations per page')
+	parser.add_argument('--repeat', type=int, default=3, help='runs per operation (median is kept)')
+	parser.add_argument('--seed', type=int, default=0, help='seed for the generated PDF')
+	parser.add_argument('--threshold', type=float, default=0.1,
+						help='allowed slowdown of extract_links over the old extractor, as a fraction')
+	parser.add_argument('--output', help='write the results to this JSON file')
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as folder:
+		pdf_path = os.path.join(folder, 'links.pdf')
+		print(f"Generating a {args.pages}-page PDF with {args.links_per_page} links per page...")
+		generate_pdf(pdf_path, args.pages, args.links_per_page, args.seed)
+		results, link_count = run_benchmarks(pdf_path, args.repeat)
+
+	for name, seconds in results.items():
+		print(f"{name:>14}: {seconds * 1000:9.1f} ms  ({link_count / seconds:12,.0f} links/s)")
+	ratio = results['extract_links'] / results['old_extractor']
+	print(f"extract_pdf_links takes {ratio:.2f}x the time of the old extractor.")
+
+	if args.output:
+		report = {
+			'pages': args.pages,
+			'links_per_page': args.links_per_page,
+			'seed': args.seed,
+			'repeat': args.repeat,
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'pypdf2': PyPDF2.__version__,
+			'results': results,
+		}
+		with open(args.output, 'w', encoding='utf-8') as f:
+			json.dump(report, f, indent=2)
+
+	if ratio > 1 + args.threshold:
+		print("Regression: extract_pdf_links is slower than the old extractor.")
+		sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
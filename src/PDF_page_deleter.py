@@ -22,17 +22,29 @@ Usage:
 	"Delete Page" button. The page will be marked for deletion, and the preview will 
  	update to reflect this.
 
-5. You can continue to delete additional pages as needed.
+5. You can continue to delete additional pages as needed. To remove many pages at once, click
+	"Delete Pages..." and choose page ranges (e.g. "1-5, 8, 10-"), every Nth page, odd or even
+	pages, pages containing some text, or the pages selected in the thumbnail dock
+	(Ctrl/Shift+click to select several).
 
 6. Once you have marked all the pages you wish to delete, click the "Save Changes" button.
 	This will save the modified PDF with a "_modified" suffix added to the original filename.
+	The default save compacts the output: unused objects are dropped and streams are compressed.
+	File > Save Incrementally instead appends the deletions to a copy of the original, which is
+	faster when only a few pages are removed from a very large file. Saving runs in the
+	background, and a progress bar shows how far it has got.
 
 7. If you wish to work on a different PDF, simply click "Load PDF" again and repeat the
 	process.
 
 Note:
 -------------
-- The program always starts with the original PDF for each deletion to ensure accurate page deletion.
+- The PDF is opened once and shared by the preview, search, thumbnails and save. Deleted pages are only
+  left out when the modified PDF is written, so the original document is never changed.
+- View > Performance Overlay (Ctrl+Shift+P) shows where rendering time goes, and
+  View > Export Performance Trace writes a Chrome trace JSON (open it in chrome://tracing).
+- Pages open fitted to the window width and grow or shrink with the zoom level. At high zoom, large
+  pages are drawn tile by tile, and only the visible tiles are rendered.
 - The modified PDF is saved with a "_modified" suffix. The original PDF remains unchanged.
 
 Dependencies:
@@ -41,10 +53,10 @@ To run the PDF Page Deleter program, you'll need to install the following Python
 
 1. PyQt5: Provides the graphical user interface.
 Installation: `pip install PyQt5`
-2. PyPDF2: Used for PDF processing.
-Installation: `pip install PyPDF2`
-3. PyMuPDF (fitz): Required for rendering PDF pages as images for the preview functionality.
+2. PyMuPDF (fitz): Used for rendering the preview, searching and saving the modified PDF.
 Installation: `pip install PyMuPDF`
+3. pdf_document.py: Shared document backend, shipped alongside this script.
+4. perf_trace.py: Timing instrumentation, shipped alongside this script.
 
 '''
 
@@ -54,21 +66,352 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QFileDialog, 
     QSpinBox, QVBoxLayout, QWidget, QTextEdit, QLabel, 
     QSizePolicy, QHBoxLayout, QScrollArea, QShortcut, 
-    QLineEdit, QTreeWidget, QListWidget, QDockWidget, 
-    QTreeWidgetItem, QListWidgetItem, QAction, QInputDialog,
-    QToolBar
+    QLineEdit, QTreeView, QListWidget, QDockWidget, 
+    QListWidgetItem, QAction, QInputDialog,
+    QToolBar, QProgressBar
 )
 from PyQt5.QtGui import (
     QPixmap, QImage, QPalette, QColor, QKeySequence, 
     QPainter, QIcon
 )
 from PyQt5.QtCore import (
-    Qt, QSettings, QTimer, QSize
+    Qt, QSettings, QTimer, QSize, QRect, QRectF, QPointF,
+    QThread, QEvent, pyqtSignal, QAbstractItemModel, QModelIndex
 )
-from PyPDF2 import PdfReader, PdfWriter
 import fitz
+import math
+import multiprocessing
 import os
+import queue
+import time
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_document import (
+	PDFDocument, SAVE_FAST, SAVE_INCREMENTAL, PART_SUFFIX,
+	load_outline, parse_page_ranges, save_pages_in_worker
+)
+from perf_trace import PerfTracer, traced
+
+# Fraction of the final resolution used for the immediate preview pass
+PREVIEW_RENDER_FRACTION = 0.25
+
+# Pages larger than this (in device pixels) are rendered as tiles instead of one pixmap
+TILED_RENDER_MIN_PIXELS = 8_000_000
+TILE_SIZE = 512
+MAX_TILE_CACHE = 128
+
+
+# Predictive prefetch tuning
+MIN_PREFETCH_HORIZON = 0.25  # seconds of scrolling to stay ahead of
+PREFETCH_RENDER_BATCH = 4  # renders that should complete before the viewport arrives
+MAX_PREFETCH_PAGES = 8
+
+
+# Outlines up to this many entries get their first level expanded after loading
+TOC_AUTO_EXPAND_LIMIT = 1000
+# Memory for inverted twins of rendered pixmaps kept for dark mode: the pages on screen and the
+# prefetch window at high DPI; older twins are inverted again when shown
+MAX_DARK_PIXMAP_BYTES = 96 * 1024 * 1024
+THUMBNAIL_PIXMAP_ROLE = Qt.UserRole + 1
+
+
+class OutlineNode:
+	__slots__ = ('title', 'page', 'raw_children', 'children', 'parent', 'row')
+
+	def __init__(self, title, page, raw_children, parent, row):
+		self.title = title
+		self.page = page
+		self.raw_children = raw_children
+		self.children = None  # Created on first expand
+		self.parent = parent
+		self.row = row
+
+
+class OutlineModel(QAbstractItemModel):
+	"""Outline model whose child nodes are only created when their parent is expanded"""
+	def __init__(self, outline, parent=None):
+		super().__init__(parent)
+		self.root = OutlineNode(None, None, outline, None, 0)
+		self.fetch_children(self.root)
+
+	@staticmethod
+	def placeholder(text, parent=None):
+		"""A one-row model showing a message instead of an outline"""
+		return OutlineModel([(text, None, [])], parent)
+
+	def fetch_children(self, node):
+		node.children = [OutlineNode(title, page, children, node, row)
+						 for row, (title, page, children) in enumerate(node.raw_children)]
+
+	def node(self, index):
+		return index.internalPointer() if index.isValid() else self.root
+
+	def index(self, row, column, parent=QModelIndex()):
+		node = self.node(parent)
+		if node.children is None or not (0 <= row < len(node.children)) or column != 0:
+			return QModelIndex()
+		return self.createIndex(row, 0, node.children[row])
+
+	def parent(self, index):
+		if not index.isValid():
+			return QModelIndex()
+		parent = index.internalPointer().parent
+		if parent is None or parent is self.root:
+			return QModelIndex()
+		return self.createIndex(parent.row, 0, parent)
+
+	def rowCount(self, parent=QModelIndex()):
+		node = self.node(parent)
+		return len(node.children) if node.children is not None else 0
+
+	def columnCount(self, parent=QModelIndex()):
+		return 1
+
+	def hasChildren(self, parent=QModelIndex()):
+		return bool(self.node(parent).raw_children)
+
+	def canFetchMore(self, parent):
+		node = self.node(parent)
+		return node.children is None and bool(node.raw_children)
+
+	def fetchMore(self, parent):
+		node = self.node(parent)
+		if node.children is not None:
+			return
+		self.beginInsertRows(parent, 0, len(node.raw_children) - 1)
+		self.fetch_children(node)
+		self.endInsertRows()
+
+	def data(self, index, role=Qt.DisplayRole):
+		if not index.isValid():
+			return None
+		node = index.internalPointer()
+		if role == Qt.DisplayRole:
+			return node.title if node.page is None else f"{node.title} (Page {node.page})"
+		if role == Qt.UserRole:
+			return node.page
+		return None
+
+	def headerData(self, section, orientation, role=Qt.DisplayRole):
+		if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+			return "Contents"
+		return None
+
+
+class TocLoader(QThread):
+	"""Reads the outline in a worker process so huge outlines do not stall the GUI"""
+	# Results carry the generation they were requested for, so stale ones can be told apart
+	loaded = pyqtSignal(int, object, int)
+	failed = pyqtSignal(int, str)
+
+	def __init__(self, pdf_path, generation, parent=None):
+		super().__init__(parent)
+		self.pdf_path = pdf_path
+		self.generation = generation
+
+	def run(self):
+		try:
+			context = multiprocessing.get_context('spawn')
+			with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+				outline, entry_count = executor.submit(load_outline, self.pdf_path).result()
+			self.loaded.emit(self.generation, outline, entry_count)
+		except Exception as e:
+			self.failed.emit(self.generation, str(e))
+
+
+class SaveWorker(QThread):
+	"""Writes the modified PDF in a separate process so saving large files never blocks the UI"""
+	progress = pyqtSignal(int, str)
+	saved = pyqtSignal(str)
+	failed = pyqtSignal(str)
+
+	# Share of the progress bar covered by the stages before the output is written
+	WRITE_STAGE_START = 40
+
+	def __init__(self, source_path, kept_pages, out_path, mode, total_pages):
+		super().__init__()
+		self.source_path = source_path
+		self.kept_pages = kept_pages
+		self.out_path = out_path
+		self.mode = mode
+		# Rough output size, used to estimate progress while the file is being written
+		self.expected_size = os.path.getsize(source_path) * len(kept_pages) / max(1, total_pages)
+
+	def run(self):
+		context = multiprocessing.get_context('spawn')
+		messages = context.Queue()
+		process = context.Process(
+			target=save_pages_in_worker,
+			args=(self.source_path, self.kept_pages, self.out_path, self.mode, messages))
+		process.start()
+		
+		error = None
+		writing = False
+		while process.is_alive() or not messages.empty():
+			try:
+				kind, percent, text = messages.get(timeout=0.2)
+			except queue.Empty:
+				if writing and self.expected_size:
+					try:
+						written = os.path.getsize(self.out_path + PART_SUFFIX)
+					except OSError:
+						continue
+					share = min(1.0, written / self.expected_size)
+					span = 99 - self.WRITE_STAGE_START
+					self.progress.emit(self.WRITE_STAGE_START + int(span * share), "Writing output...")
+				continue
+			if kind == 'error':
+				error = text
+			else:
+				writing = percent >= self.WRITE_STAGE_START and percent < 100
+				self.progress.emit(percent, text)
+		process.join()
+		
+		if error or process.exitcode != 0:
+			self.failed.emit(error or f"Save process exited with code {process.exitcode}")
+		else:
+			self.saved.emit(self.out_path)
+
+
+class ScrollPrefetcher:
+	"""Tracks scroll direction and velocity and decides how many pages to render ahead"""
+	def __init__(self):
+		self.last_value = 0
+		self.last_time = time.monotonic()
+		self.velocity = 0.0  # pixels per second, positive when scrolling down
+		self.avg_render_time = 0.05
+
+	@property
+	def direction(self):
+		return (self.velocity > 0) - (self.velocity < 0)
+
+	def on_scroll(self, value):
+		now = time.monotonic()
+		dt = now - self.last_time
+		if dt > 0:
+			instant = (value - self.last_value) / dt
+			# Smooth over recent events; a long pause starts a new gesture
+			self.velocity = instant if dt > 0.5 else 0.5 * self.velocity + 0.5 * instant
+		self.last_value = value
+		self.last_time = now
+
+	def record_render_time(self, seconds):
+		self.avg_render_time = 0.8 * self.avg_render_time + 0.2 * seconds
+
+	def pages_ahead(self, page_height):
+		if page_height <= 0:
+			return 1
+		if time.monotonic() - self.last_time > 0.5:
+			self.velocity = 0.0
+		horizon = max(MIN_PREFETCH_HORIZON, self.avg_render_time * PREFETCH_RENDER_BATCH)
+		pages = 1 + math.ceil(abs(self.velocity) * horizon / page_height)
+		return min(MAX_PREFETCH_PAGES, pages)
+
+
+def invert_pixmap(pixmap):
+	"""Color-inverted copy of a pixmap, used as its dark mode twin"""
+	image = pixmap.toImage()
+	image.invertPixels()
+	inverted = QPixmap.fromImage(image)
+	inverted.setDevicePixelRatio(pixmap.devicePixelRatio())
+	return inverted
+
+
+def pixmap_bytes(pixmap):
+	return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class PageLabel(QLabel):
+	"""Page label that paints itself from rendered tiles when the page is too large for one pixmap"""
+	def __init__(self, page_num, tile_renderer):
+		super().__init__()
+		self.page_num = page_num
+		self.tile_renderer = tile_renderer
+		self.tiled = False
+		self.tile_scale = 0.0
+		# Rendered pixmap in light colors, and whether the dark twin is on display
+		self.source_pixmap = None
+		self.dark = False
+		# Whether source_pixmap is only the fast preview pass, still to be refined
+		self.preview = False
+
+	def paintEvent(self, event):
+		if not self.tiled:
+			super().paintEvent(event)
+			return
+		painter = QPainter(self)
+		self.tile_renderer.paint(painter, self, event.rect())
+		painter.end()
+
+
+class TileRenderer:
+	"""Renders only the visible tiles of a page using a fitz clip rectangle, with an LRU tile cache"""
+	def __init__(self, app):
+		self.app = app
+		self.tile_cache = OrderedDict()
+		self.pending = OrderedDict()
+		self.timer = QTimer()
+		self.timer.setInterval(0)
+		self.timer.timeout.connect(self.process_pending)
+
+	def tile_key(self, label, tx, ty):
+		return (label.page_num, label.tile_scale, tx, ty)
+
+	def tile_rect(self, label, tx, ty):
+		tile_logical = TILE_SIZE / label.devicePixelRatioF()
+		return QRectF(tx * tile_logical, ty * tile_logical, tile_logical, tile_logical)
+
+	def paint(self, painter, label, rect):
+		"""Paint cached tiles intersecting rect and queue the missing ones"""
+		tile_logical = TILE_SIZE / label.devicePixelRatioF()
+		first_x, last_x = int(rect.left() // tile_logical), int(rect.right() // tile_logical)
+		first_y, last_y = int(rect.top() // tile_logical), int(rect.bottom() // tile_logical)
+		for ty in range(first_y, last_y + 1):
+			for tx in range(first_x, last_x + 1):
+				key = self.tile_key(label, tx, ty)
+				pixmap = self.tile_cache.get(key)
+				target = self.tile_rect(label, tx, ty)
+				if pixmap is not None:
+					self.tile_cache.move_to_end(key)
+					painter.drawPixmap(target.topLeft(), self.app.themed(pixmap))
+				else:
+					painter.fillRect(target, QColor(128, 128, 128))
+					self.pending[key] = label
+		if self.pending and not self.timer.isActive():
+			self.timer.start()
+
+	def process_pending(self):
+		"""Render one queued tile per timer tick"""
+		if not self.pending:
+			self.timer.stop()
+			return
+		
+		key, label = self.pending.popitem(last=False)
+		page_num, scale, tx, ty = key
+		try:
+			# Skip tiles of pages that were re-laid out or zoomed since they were queued
+			if self.app.get_page_label(page_num) is not label or key != self.tile_key(label, tx, ty):
+				return
+			page = self.app.pdf_document[page_num]
+			clip = fitz.Rect(tx * TILE_SIZE / scale, ty * TILE_SIZE / scale,
+							 (tx + 1) * TILE_SIZE / scale, (ty + 1) * TILE_SIZE / scale)
+			pixmap = self.app.page_to_pixmap(page, scale, clip)
+			pixmap.setDevicePixelRatio(label.devicePixelRatioF())
+			
+			self.tile_cache[key] = pixmap
+			while len(self.tile_cache) > MAX_TILE_CACHE:
+				self.tile_cache.popitem(last=False)
+			label.update(self.tile_rect(label, tx, ty).toAlignedRect())
+		except Exception as e:
+			print(f"Tile rendering error: {e}")
+			self.app.tracer.mark('error', source='tile', page=page_num, message=str(e))
+
+	def clear(self):
+		self.tile_cache.clear()
+		self.pending.clear()
+		self.timer.stop()
 
 class PDFPageDeleterApp(QMainWindow):
 	def __init__(self):
@@ -76,8 +419,8 @@ class PDFPageDeleterApp(QMainWindow):
 		# Initialize document-related attributes
 		self.pdf_document = None
 		self.pdf_path = None
-		self.deleted_pages = set()
-		self.modified_pdf = None
+		# Bumped for every outline load; only the latest loader's result is shown
+		self.toc_generation = 0
 		
 		# Initialize UI-related attributes
 		self.zoom_level = 1.0
@@ -86,9 +429,19 @@ class PDFPageDeleterApp(QMainWindow):
 		self.search_results = []
 		self.current_page = 1
 		
+		# Timing instrumentation for the overlay and trace export
+		self.tracer = PerfTracer()
+		
 		# Initialize caching
 		self.page_cache = OrderedDict()
 		self.max_cache_size = 20
+		self.tile_renderer = TileRenderer(self)
+		self.dark_pixmaps = OrderedDict()
+		self.dark_pixmap_bytes = 0
+		
+		# Continuous view index: page number -> (container, page label), plus container tops
+		self.page_widgets = []
+		self.page_tops = None
 		
 		# Initialize settings
 		self.settings = QSettings('YourCompany', 'PDFPageDeleter')
@@ -106,14 +459,22 @@ class PDFPageDeleterApp(QMainWindow):
 		self.continuous_preview = QLabel(self)
 		self.continuous_preview.setAlignment(Qt.AlignCenter)
 		
-		# Setup render timer
-		self.render_timer = QTimer()
-		self.render_timer.setSingleShot(True)
-		self.render_timer.timeout.connect(self.render_visible_pages)
-		
-		# Optimize scroll handling
-		self.scroll_area.verticalScrollBar().valueChanged.connect(
-			lambda: self.render_timer.start(150))  # Increased delay for better performance
+		# Sharp renders and prefetches run one page per event-loop pass, nearest page first
+		self.refine_queue = []
+		self.refine_timer = QTimer()
+		self.refine_timer.setInterval(0)
+		self.refine_timer.timeout.connect(self.process_refine_queue)
+		self.prefetcher = ScrollPrefetcher()
+		
+		# Performance overlay floating over the preview, refreshed while visible
+		self.perf_overlay = QLabel(self.scroll_area)
+		self.perf_overlay.setStyleSheet(
+			"QLabel { background: rgba(0, 0, 0, 170); color: #7CFC00; "
+			"font-family: monospace; padding: 6px; }")
+		self.perf_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+		self.perf_overlay.hide()
+		self.perf_overlay_timer = QTimer()
+		self.perf_overlay_timer.timeout.connect(self.update_perf_overlay)
 		
 		# Restore window state
 		geometry = self.settings.value('geometry')
@@ -300,7 +661,11 @@ class PDFPageDeleterApp(QMainWindow):
 		self.load_button = QPushButton('📂 Load PDF')
 		self.page_spinbox = QSpinBox()
 		self.delete_button = QPushButton('🗑️ Delete Page')
+		self.bulk_delete_button = QPushButton('🗑️ Delete Pages...')
 		self.save_button = QPushButton('💾 Save Changes')
+		self.save_progress = QProgressBar()
+		self.save_progress.setRange(0, 100)
+		self.save_progress.hide()
 		self.dark_mode_button = QPushButton('🌓 Toggle Theme')
 		
 		# Add status area with modern style
@@ -319,7 +684,7 @@ class PDFPageDeleterApp(QMainWindow):
 		
 		# Add widgets to control layout
 		for widget in [self.load_button, self.page_spinbox, self.delete_button,
-					  self.save_button, self.dark_mode_button, self.status_area]:
+					  self.bulk_delete_button, self.save_button, self.save_progress, self.dark_mode_button, self.status_area]:
 			control_layout.addWidget(widget)
 		
 		# Create modern scroll area for PDF preview
@@ -350,6 +715,8 @@ class PDFPageDeleterApp(QMainWindow):
 		self.scroll_layout = QVBoxLayout(self.scroll_content)
 		self.scroll_layout.setAlignment(Qt.AlignCenter)
 		self.scroll_area.setWidget(self.scroll_content)
+		# Page positions move whenever the content is resized or laid out again
+		self.scroll_content.installEventFilter(self)
 		
 		# Create preview label
 		self.preview_label = QLabel()
@@ -382,15 +749,15 @@ class PDFPageDeleterApp(QMainWindow):
 					background: #3b3b3b;
 					padding: 5px;
 				}
-				QTreeWidget, QListWidget {
+				QTreeView, QListWidget {
 					background: #2b2b2b;
 					border: none;
 					color: white;
 				}
-				QTreeWidget::item:hover, QListWidget::item:hover {
+				QTreeView::item:hover, QListWidget::item:hover {
 					background: #3b3b3b;
 				}
-				QTreeWidget::item:selected, QListWidget::item:selected {
+				QTreeView::item:selected, QListWidget::item:selected {
 					background: #4b4b4b;
 				}
 			"""
@@ -398,9 +765,10 @@ class PDFPageDeleterApp(QMainWindow):
 			# Table of Contents dock
 			toc_dock = QDockWidget("📚 Table of Contents", self)
 			toc_dock.setObjectName("toc_dock")
-			self.toc_widget = QTreeWidget()
+			self.toc_widget = QTreeView()
 			self.toc_widget.setUniformRowHeights(True)  # Performance optimization
-			self.toc_widget.setHeaderLabel("Contents")
+			self.toc_widget.setEditTriggers(QTreeView.NoEditTriggers)
+			self.toc_widget.setModel(OutlineModel([], self.toc_widget))
 			toc_dock.setWidget(self.toc_widget)
 			toc_dock.setStyleSheet(dock_style)
 			
@@ -413,6 +781,7 @@ class PDFPageDeleterApp(QMainWindow):
 			self.thumbnail_widget.setSpacing(10)
 			self.thumbnail_widget.setResizeMode(QListWidget.Adjust)
 			self.thumbnail_widget.setUniformItemSizes(True)  # Performance optimization
+			self.thumbnail_widget.setSelectionMode(QListWidget.ExtendedSelection)  # For bulk deletion
 			thumb_dock.setWidget(self.thumbnail_widget)
 			thumb_dock.setStyleSheet(dock_style)
 			
@@ -441,13 +810,60 @@ class PDFPageDeleterApp(QMainWindow):
 		# Update zoom indicator
 		self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
 		
-		# Clear cache to force redraw
-		self.page_cache.clear()
-		self.render_visible_pages()
+		# Re-layout pages at the new size and redraw
+		self.apply_zoom()
 		
-		# Maintain center point
+		# Maintain center point once the new layout has been applied
 		new_pos = int((center_y * self.zoom_level / old_zoom) - viewport_height / 2)
-		self.scroll_area.verticalScrollBar().setValue(new_pos)
+		QTimer.singleShot(0, lambda: self.scroll_area.verticalScrollBar().setValue(new_pos))
+
+	def apply_zoom(self):
+		"""Resize the continuous view to the current zoom level and drop renders at the old size"""
+		self.page_cache.clear()
+		self.clear_dark_pixmaps()
+		self.tile_renderer.clear()
+		if self.page_widgets:
+			self.resize_continuous_view()
+		else:
+			self.setup_continuous_view()
+
+	def resize_continuous_view(self):
+		"""Resize the existing page containers in place; only the visible pages are re-rendered"""
+		self.scroll_area.verticalScrollBar().blockSignals(True)
+		self.refine_queue.clear()
+		
+		viewport_width = self.scroll_area.viewport().width()
+		content_width = viewport_width
+		total_height = 0
+		for page_num, (container, label) in enumerate(self.page_widgets):
+			page_rect = self.pdf_document[page_num].rect
+			page_width = int(page_rect.width * self.zoom_level)
+			page_height = int(page_rect.height * self.zoom_level)
+			
+			container_width = max(viewport_width - 20, page_width + 20)
+			container.setFixedWidth(container_width)
+			container.setMinimumHeight(page_height + 40)
+			content_width = max(content_width, container_width + 20)
+			total_height += page_height + 40 + 10
+			
+			# Renders at the old size are dropped; visible pages are rendered again when laid out
+			label.setFixedSize(page_width, page_height)
+			label.clear()
+			label.source_pixmap = None
+			label.preview = False
+			label.tiled = False
+		
+		self.scroll_content.setFixedWidth(content_width)
+		self.scroll_content.setMinimumHeight(total_height)
+		self.page_tops = None
+		
+		self.scroll_area.verticalScrollBar().blockSignals(False)
+		QTimer.singleShot(50, self.render_visible_pages)
+
+	def fit_width_zoom(self):
+		"""Zoom level at which the first page fills the viewport width"""
+		viewport_width = self.scroll_area.viewport().width()
+		return max(0.1, min(5.0, (viewport_width - 60) / self.pdf_document[0].rect.width))
 
 	def zoom_to_fit(self):
 		"""Zoom to fit page height"""
@@ -460,8 +876,7 @@ class PDFPageDeleterApp(QMainWindow):
 		
 		self.zoom_level = (viewport_height / page_height) * 0.9  # 90% of viewport
 		self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
-		self.page_cache.clear()
-		self.render_visible_pages()
+		self.apply_zoom()
 
 	def zoom_to_width(self):
 		"""Zoom to fit page width"""
@@ -474,61 +889,60 @@ class PDFPageDeleterApp(QMainWindow):
 		
 		self.zoom_level = (viewport_width / page_width) * 0.95  # 95% of viewport
 		self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
-		self.page_cache.clear()
-		self.render_visible_pages()
+		self.apply_zoom()
 
 	def get_visible_pages(self):
 		"""Get list of currently visible pages with dynamic page size handling"""
-		if not self.pdf_document or not self.scroll_layout:
+		if not self.pdf_document or not self.page_widgets:
 			return []
 		
 		try:
-			scroll_bar = self.scroll_area.verticalScrollBar()
-			viewport_top = scroll_bar.value()
-			viewport_height = self.scroll_area.viewport().height()
-			viewport_bottom = viewport_top + viewport_height
-			visible_pages = []
-			
-			total_height = 0
-			for i in range(self.scroll_layout.count()):
-				widget = self.scroll_layout.itemAt(i).widget()
-				if not widget:
-					continue
-					
-				widget_height = widget.height()
-				widget_top = total_height
-				widget_bottom = total_height + widget_height
-				
-				# A page is considered visible if:
-				# 1. Its top is in the viewport, OR
-				# 2. Its bottom is in the viewport, OR
-				# 3. It spans the viewport
-				is_visible = (
-					(widget_top >= viewport_top and widget_top < viewport_bottom) or
-					(widget_bottom > viewport_top and widget_bottom <= viewport_bottom) or
-					(widget_top <= viewport_top and widget_bottom >= viewport_bottom)
-				)
-				
-				if is_visible:
-					visible_pages.append(i)
-					
-				total_height += widget_height
-				
-				# Optimization: Stop if we're past the viewport
-				if widget_top > viewport_bottom:
-					break
-			
-			return visible_pages
+			viewport_top = self.scroll_area.verticalScrollBar().value()
+			viewport_bottom = viewport_top + self.scroll_area.viewport().height()
+			return list(self.page_range_at(viewport_top, viewport_bottom))
 		except Exception as e:
 			print(f"Error getting visible pages: {e}")
 			return []
 
+	def get_page_container(self, page_num):
+		"""Page container from the continuous view index"""
+		if 0 <= page_num < len(self.page_widgets):
+			return self.page_widgets[page_num][0]
+		return None
+
+	def get_page_tops(self):
+		"""Top y of each page container, cached once the layout has placed them"""
+		if self.page_tops is None and self.page_widgets:
+			tops = [container.y() for container, _ in self.page_widgets]
+			if len(tops) > 1 and tops[-1] == 0:
+				return tops  # Layout not applied yet, try again later
+			self.page_tops = tops
+		return self.page_tops or []
+
+	def page_range_at(self, top, bottom):
+		"""Range of pages intersecting the vertical span [top, bottom)"""
+		tops = self.get_page_tops()
+		first = max(0, bisect_right(tops, top) - 1)
+		last = max(first + 1, bisect_left(tops, bottom))
+		return range(first, min(last, len(tops)))
+
+	def scroll_to_page(self, page_num):
+		"""Jump straight to a page using the index"""
+		container = self.get_page_container(page_num)
+		if container:
+			self.scroll_area.verticalScrollBar().setValue(container.y())
+
+	def on_scroll(self, value):
+		"""Track scroll velocity and render without waiting for scrolling to stop"""
+		self.prefetcher.on_scroll(value)
+		self.render_visible_pages()
+
 	def render_visible_pages(self):
 		"""
-		Efficiently render only the visible pages in the scroll area
-		with robust error handling and performance optimizations.
+		Render the visible pages immediately and schedule background renders
+		ahead of the viewport in the direction of travel.
 		"""
-		if not self.pdf_document or not self.scroll_layout:
+		if not self.pdf_document or not self.page_widgets:
 			return
 
 		try:
@@ -537,104 +951,223 @@ class PDFPageDeleterApp(QMainWindow):
 			scroll_pos = self.scroll_area.verticalScrollBar().value()
 			viewport_height = viewport.height()
 			
-			# Performance optimization: Calculate page metrics once
-			PAGE_MARGIN = 20
-			BUFFER_PAGES = 1  # Number of pages to pre-render above/below viewport
+			# Calculate visible page range from the page index
+			page_count = len(self.page_widgets)
+			visible = self.page_range_at(scroll_pos, scroll_pos + viewport_height)
+			first_visible, last_visible = visible.start, visible.stop
 			
-			# Get actual page height from first page if available
+			# Height of the page at the viewport, including layout spacing
 			actual_page_height = viewport_height
-			if self.scroll_layout.count() > 0:
-				first_container = self.scroll_layout.itemAt(0).widget()
-				if first_container and first_container.height() > 0:
-					actual_page_height = first_container.height() + PAGE_MARGIN
-
-			# Calculate visible page range with buffer
-			first_visible = max(0, (scroll_pos // actual_page_height) - BUFFER_PAGES)
-			last_visible = min(
-				len(self.pdf_document),
-				((scroll_pos + viewport_height) // actual_page_height) + BUFFER_PAGES + 1
-			)
-
-			# Debug logging for development
-			# print(f"Rendering pages {first_visible} to {last_visible}")
+			if first_visible < page_count:
+				container = self.get_page_container(first_visible)
+				if container.height() > 0:
+					actual_page_height = container.height() + self.scroll_layout.spacing()
+
+			# Pages ahead adapt to scroll velocity and measured render time
+			ahead = self.prefetcher.pages_ahead(actual_page_height)
+			before = ahead if self.prefetcher.direction < 0 else 1
+			after = ahead if self.prefetcher.direction > 0 else 1
+			first_prefetch = max(0, first_visible - before)
+			last_prefetch = min(page_count, last_visible + after)
 			
-			# Batch render visible pages
-			for page_num in range(int(first_visible), int(last_visible)):
-				if not (0 <= page_num < self.scroll_layout.count()):
+			# Visible pages get the fast preview pass now; pages shown before a theme toggle are re-themed
+			for page_num in range(first_visible, last_visible):
+				label = self.get_page_label(page_num)
+				if not label or label.tiled:
 					continue
-					
-				# Get container widget safely
-				container_item = self.scroll_layout.itemAt(page_num)
-				if not container_item:
+				if not label.pixmap():
+					self.render_page(page_num)
+				elif label.dark != self.is_dark_mode and label.source_pixmap is not None:
+					self.show_pixmap(label, label.source_pixmap, label.preview)
+
+			# Queued pages that left the prefetch window are dropped, so a fast scroll does not
+			# full-render every page passed over; previews still showing are queued again when back
+			self.refine_queue = [page_num for page_num in self.refine_queue
+								 if first_prefetch <= page_num < last_prefetch]
+
+			# Pages in the prefetch window are queued for a full render
+			for page_num in range(first_prefetch, last_prefetch):
+				if page_num in self.refine_queue:
 					continue
-					
-				container = container_item.widget()
-				if not container or not container.layout():
+				label = self.get_page_label(page_num)
+				if not label or label.tiled:
 					continue
-				
-				# Find the page label in the container
-				layout = container.layout()
-				for i in range(layout.count()):
-					widget = layout.itemAt(i).widget()
-					if isinstance(widget, QLabel) and not widget.pixmap():
-						# Only render if not already rendered
-						self.render_page(page_num)
-						break
+				if first_visible <= page_num < last_visible:
+					if label.preview:
+						self.refine_queue.append(page_num)
+				elif (not label.pixmap() or label.preview) and not self.is_tiled_size(label):
+					self.refine_queue.append(page_num)
+			if self.refine_queue and not self.refine_timer.isActive():
+				self.refine_timer.start()
 
 			# Cleanup far-off pages to save memory
-			cleanup_range = 5  # Pages to keep beyond visible range
-			for page_num in range(len(self.pdf_document)):
-				if (page_num < first_visible - cleanup_range or 
-					page_num > last_visible + cleanup_range):
-					if page_num in self.page_cache:
-						del self.page_cache[page_num]
+			cleanup_range = 5  # Pages to keep beyond the prefetch range
+			for page_num in list(self.page_cache):
+				if (page_num < first_prefetch - cleanup_range or 
+					page_num > last_prefetch + cleanup_range):
+					del self.page_cache[page_num]
 
 		except Exception as e:
 			import traceback
 			print(f"Render error: {str(e)}")
 			print(traceback.format_exc())
 			# Prevent rapid re-rendering on error
-			self.render_timer.stop()
+			self.refine_queue.clear()
+
+	def get_page_label(self, page_num):
+		"""Page label from the continuous view index"""
+		if 0 <= page_num < len(self.page_widgets):
+			return self.page_widgets[page_num][1]
+		return None
 
+	def page_to_pixmap(self, page, scale, clip=None):
+		"""
+		Rasterize a page (or the clip rectangle of it) at the given scale and convert it to a QPixmap.
+		Renders are always in light colors so caches survive theme toggles; see themed().
+		"""
+		with self.tracer.span('get_pixmap', page=page.number, scale=round(scale, 3)):
+			pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), clip=clip, alpha=False)
+		with self.tracer.span('qimage_conversion', width=pix.width, height=pix.height):
+			img = QImage(pix.samples, pix.width, pix.height,
+						pix.stride, QImage.Format_RGB888)
+			return QPixmap.fromImage(img)
+
+	def themed(self, pixmap, cache=True):
+		"""
+		The pixmap as displayed in the current theme. Dark twins are inverted on first use and,
+		unless `cache` is False, kept within MAX_DARK_PIXMAP_BYTES, least recently used first out.
+		"""
+		if not self.is_dark_mode:
+			return pixmap
+		key = pixmap.cacheKey()
+		twin = self.dark_pixmaps.get(key)
+		if twin is not None:
+			self.dark_pixmaps.move_to_end(key)
+			return twin
+		with self.tracer.span('invert_pixmap', width=pixmap.width(), height=pixmap.height()):
+			twin = invert_pixmap(pixmap)
+		if not cache:
+			return twin
+		self.dark_pixmaps[key] = twin
+		self.dark_pixmap_bytes += pixmap_bytes(twin)
+		while self.dark_pixmap_bytes > MAX_DARK_PIXMAP_BYTES and len(self.dark_pixmaps) > 1:
+			_, evicted = self.dark_pixmaps.popitem(last=False)
+			self.dark_pixmap_bytes -= pixmap_bytes(evicted)
+		return twin
+
+	def clear_dark_pixmaps(self):
+		self.dark_pixmaps.clear()
+		self.dark_pixmap_bytes = 0
+
+	def show_pixmap(self, label, pixmap, preview=False):
+		"""Display a rendered pixmap on a page label in the current theme"""
+		label.source_pixmap = pixmap
+		label.preview = preview
+		label.dark = self.is_dark_mode
+		# Previews are replaced within moments, so their twins are not kept
+		label.setPixmap(self.themed(pixmap, cache=not preview))
+
+	def is_tiled_size(self, label):
+		"""Whether the label is too large, in device pixels, to render as a single pixmap"""
+		target_size = label.size() * label.devicePixelRatioF()
+		return target_size.width() * target_size.height() > TILED_RENDER_MIN_PIXELS
+
+	def get_target_scale(self, page, label):
+		"""Scale at which the page fills the label exactly in device pixels"""
+		dpr = label.devicePixelRatioF()
+		page_rect = page.rect
+		return dpr * min(label.width() / page_rect.width,
+						 label.height() / page_rect.height)
+
+	@traced('render_page')
 	def render_page(self, page_num):
-		"""Render page with proper scaling"""
+		"""
+		Progressive render: show a fast low-resolution pass immediately and
+		queue a sharp render at the exact device-pixel size of the page label.
+		"""
 		if not self.pdf_document or page_num >= len(self.pdf_document):
 			return
 		
 		try:
-			if page_num in self.page_cache:
-				pixmap = self.page_cache[page_num]
-			else:
-				page = self.pdf_document[page_num]
-				zoom = 2.0 * self.zoom_level  # Increased resolution for better quality
-				mat = fitz.Matrix(zoom, zoom)
-				pix = page.get_pixmap(matrix=mat, alpha=False)
-				
-				img = QImage(pix.samples, pix.width, pix.height,
-							pix.stride, QImage.Format_RGB888)
-				
-				if self.is_dark_mode:
-					img.invertPixels()
-				
-				pixmap = QPixmap.fromImage(img)
-				
-				if len(self.page_cache) > self.max_cache_size:
-					self.page_cache.popitem(last=False)
-				self.page_cache[page_num] = pixmap
+			label = self.get_page_label(page_num)
+			if not label:
+				return
+			
+			dpr = label.devicePixelRatioF()
+			target_size = label.size() * dpr
+			
+			# Deep zoom: paint visible tiles instead of one huge pixmap
+			label.tiled = self.is_tiled_size(label)
+			if label.tiled:
+				label.tile_scale = round(self.get_target_scale(self.pdf_document[page_num], label), 4)
+				label.update()
+				return
+			
+			cached = self.page_cache.get(page_num)
+			if cached is not None and cached.size() == target_size:
+				self.show_pixmap(label, cached)
+				return
+			
+			page = self.pdf_document[page_num]
+			scale = self.get_target_scale(page, label)
+			pixmap = self.page_to_pixmap(page, scale * PREVIEW_RENDER_FRACTION)
+			with self.tracer.span('scale_preview'):
+				pixmap = pixmap.scaled(target_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+			pixmap.setDevicePixelRatio(dpr)
+			self.show_pixmap(label, pixmap, preview=True)
 			
-			# Update the label with scaled pixmap
-			if self.scroll_layout and self.scroll_layout.count() > page_num:
-				container = self.scroll_layout.itemAt(page_num).widget()
-				if container:
-					for i in range(container.layout().count()):
-						widget = container.layout().itemAt(i).widget()
-						if isinstance(widget, QLabel) and widget.objectName().startswith('page_label'):
-							scaled_pixmap = pixmap.scaled(widget.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-							widget.setPixmap(scaled_pixmap)
-							break
+			if page_num not in self.refine_queue:
+				self.refine_queue.append(page_num)
+			if not self.refine_timer.isActive():
+				self.refine_timer.start()
 							
 		except Exception as e:
 			print(f"Page rendering error: {e}")
+			self.tracer.mark('error', source='render_page', page=page_num, message=str(e))
+
+	@traced('refine_page')
+	def refine_page(self, page_num):
+		"""Render a page at exactly the label's device-pixel size, without rescaling"""
+		if not self.pdf_document or page_num >= len(self.pdf_document):
+			return
+		
+		label = self.get_page_label(page_num)
+		if not label or label.tiled or self.is_tiled_size(label):
+			return
+		
+		start = time.perf_counter()
+		page = self.pdf_document[page_num]
+		pixmap = self.page_to_pixmap(page, self.get_target_scale(page, label))
+		pixmap.setDevicePixelRatio(label.devicePixelRatioF())
+		self.prefetcher.record_render_time(time.perf_counter() - start)
+		
+		if len(self.page_cache) > self.max_cache_size:
+			self.page_cache.popitem(last=False)
+		self.page_cache[page_num] = pixmap
+		self.show_pixmap(label, pixmap)
+
+	def page_distance(self, page_num):
+		"""Distance in pixels from the viewport center to the center of a page"""
+		container = self.get_page_container(page_num)
+		if not container:
+			return float('inf')
+		viewport_center = (self.scroll_area.verticalScrollBar().value() +
+						   self.scroll_area.viewport().height() / 2)
+		return abs(container.y() + container.height() / 2 - viewport_center)
+
+	def process_refine_queue(self):
+		"""Render one queued page per timer tick, nearest to the viewport first"""
+		if not self.refine_queue:
+			self.refine_timer.stop()
+			return
+		
+		page_num = min(self.refine_queue, key=self.page_distance)
+		self.refine_queue.remove(page_num)
+		try:
+			self.refine_page(page_num)
+		except Exception as e:
+			print(f"Page refinement error: {e}")
+			self.tracer.mark('error', source='refine_page', page=page_num, message=str(e))
 
 	def update_page_indicator(self):
 		"""Update the page indicator with better multi-page detection"""
@@ -677,24 +1210,17 @@ class PDFPageDeleterApp(QMainWindow):
 			best_page = None
 			min_distance = float('inf')
 			
-			total_height = 0
-			for i in range(self.scroll_layout.count()):
-				if i not in visible_pages:
-					continue
-					
-				widget = self.scroll_layout.itemAt(i).widget()
+			for i in visible_pages:
+				widget = self.get_page_container(i)
 				if not widget:
 					continue
 					
-				widget_height = widget.height()
-				widget_center = total_height + (widget_height / 2)
+				widget_center = widget.y() + (widget.height() / 2)
 				distance = abs(viewport_center - widget_center)
 				
 				if distance < min_distance:
 					min_distance = distance
 					best_page = i
-					
-				total_height += widget_height
 			
 			return best_page
 		except Exception as e:
@@ -706,15 +1232,21 @@ class PDFPageDeleterApp(QMainWindow):
 		if not text or not self.pdf_document:
 			return
 			
-		self.search_results = []
+		self.search_results = self.find_text(text)
+		
+		if self.search_results:
+			self.navigate_search(True)
+
+	@traced('search_text')
+	def find_text(self, text):
+		"""Return (page_num, rect) for every occurrence of text in the document"""
+		results = []
 		for page_num in range(len(self.pdf_document)):
 			page = self.pdf_document[page_num]
 			instances = page.search_for(text)
 			if instances:
-				self.search_results.extend([(page_num, inst) for inst in instances])
-		
-		if self.search_results:
-			self.navigate_search(True)
+				results.extend([(page_num, inst) for inst in instances])
+		return results
 
 	def navigate_search(self, forward=True):
 		if not self.search_results:
@@ -727,45 +1259,126 @@ class PDFPageDeleterApp(QMainWindow):
 			
 		page_num, rect = self.search_results[self.current_search_index]
 		self.page_spinbox.setValue(page_num + 1)
+		self.scroll_to_page(page_num)
 		# Highlight the search result
 		self.highlight_search_result(page_num, rect)
 
 	def delete_page(self):
-		if not self.pdf_path:
+		if not self.pdf_document:
 			self.status_area.append("Please load a PDF first.")
 			return
 
 		page_number = self.page_spinbox.value()
+		self.delete_pages({page_number - 1}, f"Page {page_number}")
 
-		if not hasattr(self, 'pages_to_delete'):
-			self.pages_to_delete = set()
-
-		self.pages_to_delete.add(page_number)
-
-		with open(self.pdf_path, 'rb') as f:
-			reader = PdfReader(f)
-			self.modified_pdf = PdfWriter()
-
-			# Add all pages except the ones to be deleted
-			for i, page in enumerate(reader.pages):
-				if i + 1 not in self.pages_to_delete:
-					self.modified_pdf.add_page(page)
-
-		self.status_area.append(f"Page {page_number} marked for deletion.")
-		self.page_spinbox.setMaximum(len(self.modified_pdf.pages) if self.modified_pdf else 0)
+	def delete_pages(self, page_indices, description):
+		"""Apply a set of zero-based page deletions as one edit and update the view once"""
+		if not page_indices:
+			self.status_area.append(f"{description}: no matching pages.")
+			return
+		
+		newly_marked = self.pdf_document.mark_deleted_pages(page_indices)
+		if len(page_indices) == 1 and newly_marked:
+			self.status_area.append(f"{description} marked for deletion.")
+		else:
+			self.status_area.append(
+				f"{description}: {newly_marked} pages marked for deletion "
+				f"({len(page_indices) - newly_marked} already marked).")
+		# The spinbox holds original page numbers, so its range stays the original page count
+		self.page_spinbox.setMaximum(len(self.pdf_document))
 		self.update_preview()
 
-	def save_changes(self):
-		if not self.modified_pdf:
+	def bulk_delete_dialog(self):
+		"""Delete pages by range, every Nth, odd/even, text match or thumbnail selection"""
+		if not self.pdf_document:
+			self.status_area.append("Please load a PDF first.")
+			return
+		
+		operations = [
+			"Page ranges (e.g. 1-5, 8, 10-)",
+			"Every Nth page",
+			"Odd pages",
+			"Even pages",
+			"Pages containing text",
+			"Pages selected in thumbnails",
+		]
+		operation, ok = QInputDialog.getItem(self, "Delete Pages", "Delete:", operations, 0, False)
+		if not ok:
+			return
+		
+		page_count = len(self.pdf_document)
+		if operation == operations[0]:
+			text, ok = QInputDialog.getText(self, "Delete Pages", "Page ranges:")
+			if not ok:
+				return
+			try:
+				pages = parse_page_ranges(text, page_count)
+			except ValueError as e:
+				self.status_area.append(f"Invalid page ranges: {e}")
+				return
+			self.delete_pages(pages, f"Pages {text}")
+		elif operation == operations[1]:
+			n, ok = QInputDialog.getInt(self, "Delete Pages", "Delete every Nth page, N =", 2, 2, page_count)
+			if not ok:
+				return
+			first, ok = QInputDialog.getInt(self, "Delete Pages", "Starting at page:", n, 1, page_count)
+			if ok:
+				self.delete_pages(self.pdf_document.every_nth_page(n, first),
+								  f"Every {n}th page from page {first}")
+		elif operation == operations[2]:
+			self.delete_pages(self.pdf_document.every_nth_page(2, 1), "Odd pages")
+		elif operation == operations[3]:
+			self.delete_pages(self.pdf_document.every_nth_page(2, 2), "Even pages")
+		elif operation == operations[4]:
+			text, ok = QInputDialog.getText(self, "Delete Pages", "Delete pages containing:")
+			if ok and text:
+				self.delete_pages(self.pdf_document.pages_containing(text), f"Pages containing '{text}'")
+		else:
+			pages = {item.data(Qt.UserRole) for item in self.thumbnail_widget.selectedItems()}
+			self.delete_pages(pages, "Selected thumbnails")
+
+	def save_changes(self, mode=SAVE_FAST):
+		if not self.pdf_document or not self.pdf_document.is_modified:
 			self.status_area.append("No changes to save.")
 			return
+		if getattr(self, 'save_worker', None) and self.save_worker.isRunning():
+			self.status_area.append("A save is already in progress.")
+			return
 
 		new_pdf_path = self.pdf_path.replace('.pdf', '_modified.pdf')
-		with open(new_pdf_path, 'wb') as out:
-			self.modified_pdf.write(out)
-
+		self.save_worker = SaveWorker(self.pdf_path, self.pdf_document.kept_pages(),
+									  new_pdf_path, mode, len(self.pdf_document))
+		self.save_worker.progress.connect(self.on_save_progress)
+		self.save_worker.saved.connect(self.on_save_finished)
+		self.save_worker.failed.connect(self.on_save_failed)
+		
+		self.save_button.setEnabled(False)
+		self.save_progress.setValue(0)
+		self.save_progress.show()
+		self.status_area.append(f"Saving to {new_pdf_path}...")
+		self.save_worker.start()
+
+	def on_save_progress(self, percent, message):
+		self.save_progress.setValue(percent)
+		self.save_progress.setFormat(f"{message} %p%")
+
+	def on_save_finished(self, new_pdf_path):
+		self.save_button.setEnabled(True)
+		self.save_progress.hide()
 		self.status_area.append(f"Changes saved as {new_pdf_path}.")
+
+	def on_save_failed(self, error):
+		self.save_button.setEnabled(True)
+		self.save_progress.hide()
+		self.status_area.append(f"Error saving PDF: {error}")
+
+	def eventFilter(self, obj, event):
+		if obj is self.scroll_content and event.type() in (QEvent.Resize, QEvent.LayoutRequest):
+			self.page_tops = None
+		return super().eventFilter(obj, event)
+
 	def resizeEvent(self, event):
+		self.page_tops = None
 		self.update_preview()
 		super().resizeEvent(event)
 
@@ -788,16 +1401,13 @@ class PDFPageDeleterApp(QMainWindow):
 			QShortcut(QKeySequence(key), self).activated.connect(func)
 
 	def zoom_in(self):
-		self.zoom_level *= 1.2
-		self.update_preview()
+		self.adjust_zoom(1.2)
 
 	def zoom_out(self):
-		self.zoom_level /= 1.2
-		self.update_preview()
+		self.adjust_zoom(1 / 1.2)
 
 	def zoom_reset(self):
-		self.zoom_level = 1.0
-		self.update_preview()
+		self.adjust_zoom(1.0 / self.zoom_level)
 
 	def next_page(self):
 		if self.pdf_document and self.page_spinbox.value() < len(self.pdf_document):
@@ -831,12 +1441,24 @@ class PDFPageDeleterApp(QMainWindow):
 		self.is_dark_mode = not self.is_dark_mode
 		self.setup_theme()
 		
-		# Clear cache to force re-render with new colors
-		self.page_cache.clear()
-		
-		# Re-render current view
-		self.update_preview()
-		self.generate_thumbnails()  # Regenerate thumbnails with new theme
+		# Cached renders are kept in light colors, so nothing is re-rendered: visible
+		# pages swap to their (lazily inverted) twins and other pages follow when scrolled to
+		with self.tracer.span('retheme_pages'):
+			self.render_visible_pages()
+			for page_num in self.get_visible_pages():
+				label = self.get_page_label(page_num)
+				if label.tiled:
+					label.update()
+		with self.tracer.span('retheme_thumbnails'):
+			for i in range(self.thumbnail_widget.count()):
+				item = self.thumbnail_widget.item(i)
+				pixmap = item.data(THUMBNAIL_PIXMAP_ROLE)
+				if pixmap is not None:
+					item.setIcon(QIcon(self.thumbnail_icon_pixmap(pixmap)))
+
+	def thumbnail_icon_pixmap(self, pixmap):
+		"""Thumbnails are inverted directly; they would only crowd the dark twin cache"""
+		return invert_pixmap(pixmap) if self.is_dark_mode else pixmap
 
 	def update_preview(self):
 		"""Update the preview when page number changes"""
@@ -852,54 +1474,52 @@ class PDFPageDeleterApp(QMainWindow):
 			print(f"Preview update error: {e}")
 
 	def load_toc(self):
-		"""Load table of contents with proper hierarchy"""
-		self.toc_widget.clear()
+		"""Load the table of contents in the background; nodes are created as they are expanded"""
 		if not self.pdf_document:
+			self.set_toc_model(OutlineModel([], self.toc_widget))
 			return
 		
-		try:
-			toc = self.pdf_document.get_toc()
-			if not toc:
-				self.toc_widget.addTopLevelItem(QTreeWidgetItem(["No table of contents"]))
-				return
-			
-			# Create a dictionary to store parent items by level
-			level_parents = {-1: self.toc_widget}
-			prev_level = -1
-			
-			for item in toc:
-				level, title, page = item[0], item[1], item[2]
-				toc_item = QTreeWidgetItem([f"{title} (Page {page})"])
-				
-				# Find proper parent
-				parent_level = level - 1
-				while parent_level not in level_parents and parent_level > -1:
-					parent_level -= 1
-				parent = level_parents[parent_level]
-				
-				# Add item to tree
-				if isinstance(parent, QTreeWidget):
-					parent.addTopLevelItem(toc_item)
-				else:
-					parent.addChild(toc_item)
-				
-				# Store as potential parent for next items
-				level_parents[level] = toc_item
-				
-				# Clean up old levels
-				if level <= prev_level:
-					for l in list(level_parents.keys()):
-						if l > level:
-							del level_parents[l]
-				prev_level = level
-			
-			# Expand first level
+		self.set_toc_model(OutlineModel.placeholder("Loading table of contents...", self.toc_widget))
+		self.toc_generation += 1
+		# Parented to the window, so a loader still running when the next one starts stays alive
+		# until it finishes and is then released
+		toc_loader = TocLoader(self.pdf_path, self.toc_generation, self)
+		toc_loader.loaded.connect(self.on_toc_loaded)
+		toc_loader.failed.connect(self.on_toc_failed)
+		toc_loader.finished.connect(toc_loader.deleteLater)
+		toc_loader.start()
+
+	def on_toc_loaded(self, generation, outline, entry_count):
+		# Ignore results of loads superseded in the meantime
+		if generation != self.toc_generation:
+			return
+		self.set_outline(outline, entry_count)
+
+	def set_outline(self, outline, entry_count):
+		"""Show an outline of nested (title, page, children) tuples"""
+		if not outline:
+			self.set_toc_model(OutlineModel.placeholder("No table of contents", self.toc_widget))
+			return
+		
+		self.set_toc_model(OutlineModel(outline, self.toc_widget))
+		# Expand first level only when that stays cheap
+		if entry_count <= TOC_AUTO_EXPAND_LIMIT:
 			self.toc_widget.expandToDepth(0)
-			
-		except Exception as e:
-			print(f"TOC loading error: {e}")
-			self.toc_widget.addTopLevelItem(QTreeWidgetItem(["Error loading table of contents"]))
 
+	def on_toc_failed(self, generation, error):
+		if generation != self.toc_generation:
+			return
+		print(f"TOC loading error: {error}")
+		self.set_toc_model(OutlineModel.placeholder("Error loading table of contents", self.toc_widget))
+
+	def set_toc_model(self, model):
+		"""Swap the outline model and release the previous one"""
+		old_model = self.toc_widget.model()
+		self.toc_widget.setModel(model)
+		if old_model is not None:
+			old_model.deleteLater()
+
+	@traced('generate_thumbnails')
 	def generate_thumbnails(self):
 		"""Generate thumbnails for all pages"""
 		self.thumbnail_widget.clear()
@@ -910,42 +1530,31 @@ class PDFPageDeleterApp(QMainWindow):
 		for page_num in range(len(self.pdf_document)):
 			try:
 				page = self.pdf_document[page_num]
-				pix = page.get_pixmap(matrix=fitz.Matrix(0.2, 0.2))
-				img = QImage(pix.samples, pix.width, pix.height,
-							pix.stride, QImage.Format_RGB888)
-				
-				if self.is_dark_mode:
-					img.invertPixels()
-					
-				pixmap = QPixmap.fromImage(img)
+				pixmap = self.page_to_pixmap(page, 0.2)
 				
 				# Create item with thumbnail
 				item = QListWidgetItem()
-				item.setIcon(QIcon(pixmap))
+				item.setIcon(QIcon(self.thumbnail_icon_pixmap(pixmap)))
 				item.setData(Qt.UserRole, page_num)  # Store page number in item data
+				item.setData(THUMBNAIL_PIXMAP_ROLE, pixmap)  # Light render, re-themed on toggle
 				item.setText(f"Page {page_num + 1}")
 				self.thumbnail_widget.addItem(item)
 				
 			except Exception as e:
 				print(f"Thumbnail generation error for page {page_num}: {e}")
+				self.tracer.mark('error', source='thumbnail', page=page_num, message=str(e))
 
-	def navigate_to_section(self, item):
+	def navigate_to_section(self, index):
 		"""Navigate to section from table of contents"""
 		try:
-			# Extract page number from the text (Page X)
-			text = item.text(0)  # Get the full text from first column
-			page_str = text.split("(Page ")[-1].split(")")[0]
-			page = int(page_str)
+			# Page target is stored with the outline entry
+			page = index.data(Qt.UserRole)
+			if not page or page < 1:
+				return
 			
 			# Update spinbox
 			self.page_spinbox.setValue(page)
-			
-			# Find and scroll to the target container
-			for i in range(self.scroll_layout.count()):
-				container = self.scroll_layout.itemAt(i).widget()
-				if container and container.objectName() == f"page_container_{page-1}":
-					self.scroll_area.ensureWidgetVisible(container)
-					break
+			self.scroll_to_page(page - 1)
 					
 		except Exception as e:
 			print(f"Navigation error: {e}")
@@ -957,14 +1566,7 @@ class PDFPageDeleterApp(QMainWindow):
 			if page_num is not None:
 				# Update spinbox
 				self.page_spinbox.setValue(page_num + 1)
-				
-				# Find and scroll to the target container
-				for i in range(self.scroll_layout.count()):
-					container = self.scroll_layout.itemAt(i).widget()
-					if container and container.objectName() == f"page_container_{page_num}":
-						self.scroll_area.ensureWidgetVisible(container)
-						break
-						
+				self.scroll_to_page(page_num)
 				self.update_preview()
 		except Exception as e:
 			print(f"Navigation error: {e}")
@@ -973,6 +1575,7 @@ class PDFPageDeleterApp(QMainWindow):
 		"""Navigate to bookmarked page"""
 		page_num = item.data(Qt.UserRole)
 		self.page_spinbox.setValue(page_num + 1)
+		self.scroll_to_page(page_num)
 
 	def toggle_bookmark(self):
 		"""Toggle bookmark for current page"""
@@ -999,16 +1602,21 @@ class PDFPageDeleterApp(QMainWindow):
 
 	def highlight_search_result(self, page_num, rect):
 		"""Highlight search result in the preview"""
-		if page_num in self.page_cache:
+		label = self.get_page_label(page_num)
+		if page_num in self.page_cache and label:
 			# Create a copy of the cached page
 			pixmap = self.page_cache[page_num].copy()
+			# Search rects are in page coordinates; the cached pixmap is at the label's render scale
+			scale = self.get_target_scale(self.pdf_document[page_num], label) / pixmap.devicePixelRatio()
 			painter = QPainter(pixmap)
-			painter.setPen(QColor(255, 255, 0, 127))  # Semi-transparent yellow
-			painter.drawRect(rect.x0, rect.y0, rect.width, rect.height)
+			# Semi-transparent yellow as displayed; the dark theme inverts the page pixmap
+			painter.setPen(QColor(0, 0, 255, 127) if self.is_dark_mode else QColor(255, 255, 0, 127))
+			painter.drawRect(QRectF(rect.x0 * scale, rect.y0 * scale,
+									rect.width * scale, rect.height * scale))
 			painter.end()
 			
 			# Update the display
-			self.scroll_layout.itemAt(page_num).widget().setPixmap(pixmap)
+			self.show_pixmap(label, pixmap)
 
 	def add_to_recent_files(self, file_path):
 		"""Add file to recent files list"""
@@ -1046,8 +1654,15 @@ class PDFPageDeleterApp(QMainWindow):
 	def open_recent_file(self, file_path):
 		"""Open a file from recent files list"""
 		if os.path.exists(file_path):
+			if self.pdf_document:
+				self.pdf_document.close()
 			self.pdf_path = file_path
-			self.pdf_document = fitz.open(file_path)
+			self.pdf_document = PDFDocument(file_path)
+			self.page_cache.clear()
+			self.clear_dark_pixmaps()
+			self.tile_renderer.clear()
+			self.zoom_level = self.fit_width_zoom()
+			self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
 			self.load_toc()
 			self.generate_thumbnails()
 			self.setup_continuous_view()
@@ -1100,9 +1715,14 @@ class PDFPageDeleterApp(QMainWindow):
 		# Save action
 		save_action = QAction('Save', self)
 		save_action.setShortcut('Ctrl+S')
-		save_action.triggered.connect(self.save_changes)
+		save_action.triggered.connect(lambda: self.save_changes(SAVE_FAST))
 		file_menu.addAction(save_action)
 		
+		# Incremental save: append the deletions to a copy of the original file
+		save_incremental_action = QAction('Save Incrementally', self)
+		save_incremental_action.triggered.connect(lambda: self.save_changes(SAVE_INCREMENTAL))
+		file_menu.addAction(save_incremental_action)
+		
 		file_menu.addSeparator()
 		
 		# Exit action
@@ -1125,9 +1745,51 @@ class PDFPageDeleterApp(QMainWindow):
 		zoom_out_action.triggered.connect(lambda: self.adjust_zoom(0.8))
 		view_menu.addAction(zoom_out_action)
 		
+		view_menu.addSeparator()
+		
+		# Performance instrumentation
+		perf_overlay_action = QAction('Performance Overlay', self)
+		perf_overlay_action.setShortcut('Ctrl+Shift+P')
+		perf_overlay_action.setCheckable(True)
+		perf_overlay_action.toggled.connect(self.toggle_perf_overlay)
+		view_menu.addAction(perf_overlay_action)
+		
+		export_trace_action = QAction('Export Performance Trace...', self)
+		export_trace_action.triggered.connect(self.export_perf_trace)
+		view_menu.addAction(export_trace_action)
+		
 		# Update recent files menu
 		self.update_recent_files_menu()
 
+	def toggle_perf_overlay(self, checked):
+		"""Show or hide the timing overlay over the preview"""
+		self.perf_overlay.setVisible(checked)
+		if checked:
+			self.update_perf_overlay()
+			self.perf_overlay_timer.start(500)
+		else:
+			self.perf_overlay_timer.stop()
+
+	def update_perf_overlay(self):
+		text = self.tracer.summary() or "No timings recorded yet"
+		self.perf_overlay.setText(text)
+		self.perf_overlay.adjustSize()
+		# Keep the overlay in the top-right corner of the preview
+		x = self.scroll_area.width() - self.perf_overlay.width() - 20
+		self.perf_overlay.move(max(0, x), 10)
+		self.perf_overlay.raise_()
+
+	def export_perf_trace(self):
+		"""Save recorded timings as a Chrome trace JSON file"""
+		file_name, _ = QFileDialog.getSaveFileName(
+			self, "Export Performance Trace",
+			os.path.join(self.last_directory, 'pdf_page_deleter_trace.json'),
+			"Trace files (*.json)"
+		)
+		if file_name:
+			self.tracer.dump_chrome_trace(file_name)
+			self.status_area.append(f"Performance trace saved as {file_name}.")
+
 	def goto_page_dialog(self):
 		"""Quick page navigation dialog"""
 		if not self.pdf_document:
@@ -1152,18 +1814,18 @@ class PDFPageDeleterApp(QMainWindow):
 		self.load_button.clicked.connect(self.load_pdf)
 		self.page_spinbox.valueChanged.connect(self.update_preview)
 		self.delete_button.clicked.connect(self.delete_page)
-		self.save_button.clicked.connect(self.save_changes)
+		self.bulk_delete_button.clicked.connect(self.bulk_delete_dialog)
+		self.save_button.clicked.connect(lambda: self.save_changes())
 		self.dark_mode_button.clicked.connect(self.toggle_dark_mode)
 		self.bookmark_btn.clicked.connect(self.toggle_bookmark)
 		
 		# Dock widget connections
-		self.toc_widget.itemClicked.connect(self.navigate_to_section)
+		self.toc_widget.clicked.connect(self.navigate_to_section)
 		self.thumbnail_widget.itemClicked.connect(self.navigate_to_thumbnail)
 		self.bookmark_widget.itemClicked.connect(self.navigate_to_bookmark)
 		
-		# Scroll area connection
-		self.scroll_area.verticalScrollBar().valueChanged.connect(
-			lambda: self.render_timer.start(100))
+		# Scroll area connection: render visible pages right away and prefetch ahead
+		self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scroll)
 
 	def load_pdf(self):
 		"""Load a PDF file"""
@@ -1185,17 +1847,19 @@ class PDFPageDeleterApp(QMainWindow):
 					self.pdf_document.close()
 				
 				# Open new document
-				self.pdf_document = fitz.open(file_name)
+				self.pdf_document = PDFDocument(file_name)
 				self.pdf_path = file_name
-				self.deleted_pages = set()
-				self.modified_pdf = None
 				
 				# Clear cache
 				self.page_cache.clear()
+				self.clear_dark_pixmaps()
 				
 				# Update UI
 				self.page_spinbox.setMaximum(len(self.pdf_document))
 				self.page_spinbox.setValue(1)
+				self.zoom_level = self.fit_width_zoom()
+				self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
+				self.tile_renderer.clear()
 				
 				# Load document components
 				self.load_toc()
@@ -1216,37 +1880,41 @@ class PDFPageDeleterApp(QMainWindow):
 				self.pdf_document = None
 				self.pdf_path = None
 
+	@traced('setup_continuous_view')
 	def setup_continuous_view(self):
 		"""Setup continuous view with full content visibility"""
 		if not self.pdf_document:
 			return
 		
 		self.scroll_area.verticalScrollBar().blockSignals(True)
+		self.refine_queue.clear()
 		
-		# Clear existing layout
+		# Clear existing layout and page index
 		while self.scroll_layout.count():
 			item = self.scroll_layout.takeAt(0)
 			if item.widget():
 				item.widget().deleteLater()
+		self.page_widgets = []
+		self.page_tops = None
 		
 		# Calculate proper sizes based on viewport
 		viewport_width = self.scroll_area.viewport().width()
+		content_width = viewport_width
 		
 		# Create containers for each page
 		for page_num in range(len(self.pdf_document)):
 			page = self.pdf_document[page_num]
 			page_rect = page.rect
 			
-			# Calculate scale factor based on width while preserving aspect ratio
-			scale_factor = (viewport_width - 60) / page_rect.width
-			
-			# Calculate dimensions
-			page_width = int(page_rect.width * scale_factor)
-			page_height = int(page_rect.height * scale_factor)
+			# Page size follows the zoom level; pages wider than the viewport scroll horizontally
+			page_width = int(page_rect.width * self.zoom_level)
+			page_height = int(page_rect.height * self.zoom_level)
 			
 			# Create container with flexible height
 			container = QWidget()
-			container.setFixedWidth(viewport_width - 20)
+			container_width = max(viewport_width - 20, page_width + 20)
+			container.setFixedWidth(container_width)
+			content_width = max(content_width, container_width + 20)
 			
 			layout = QVBoxLayout(container)
 			layout.setSpacing(5)
@@ -1261,7 +1929,7 @@ class PDFPageDeleterApp(QMainWindow):
 			layout.addWidget(num_label)
 			
 			# Page content label with proper sizing
-			page_label = QLabel()
+			page_label = PageLabel(page_num, self.tile_renderer)
 			page_label.setAlignment(Qt.AlignCenter)
 			page_label.setFixedSize(page_width, page_height)  # Use fixed size instead of minimum/maximum
 			page_label.setObjectName(f"page_label_{page_num}")
@@ -1271,9 +1939,10 @@ class PDFPageDeleterApp(QMainWindow):
 			container.setMinimumHeight(page_height + 40)  # Add padding for page number
 			
 			self.scroll_layout.addWidget(container)
+			self.page_widgets.append((container, page_label))
 		
 		# Set content size
-		self.scroll_content.setFixedWidth(viewport_width)
+		self.scroll_content.setFixedWidth(content_width)
 		total_height = sum(self.scroll_layout.itemAt(i).widget().minimumHeight() + 10
 						  for i in range(self.scroll_layout.count()))
 		self.scroll_content.setMinimumHeight(total_height)
@@ -0,0 +1,225 @@
+'''
+PDF Page Deleter Benchmark - User Manual
+
+Description:
+-------------
+Headless, reproducible benchmark for the hot paths of `PDF_page_deleter.py`. It generates a
+synthetic PDF with a fixed random seed, then times the viewer operations against it. The PDF
+has thousands of pages in mixed sizes (Letter, A4, A3 and the odd A0 drawing), alternating
+text-heavy and image-heavy pages, and a nested outline. Qt runs on the offscreen platform, so
+no display is needed.
+
+Timed operations:
+  - open            Open the document through the shared PDFDocument backend
+  - load_toc        Read the outline and build the table of contents model
+  - thumbnails      Generate all thumbnails
+  - continuous_view Lay out the continuous page view
+  - search          Full-text search for a word that occurs on every text page
+  - render_<zoom>   Render a sample of pages at several zoom levels
+  - dark_mode_toggle Toggle the theme with the view and thumbnails populated (no page is re-rendered)
+  - delete_save     Mark every 10th page for deletion and save the result
+
+Usage:
+-------------
+    python PDF_page_deleter_benchmark.py
+    python PDF_page_deleter_benchmark.py --pages 5000 --output results.json
+    python PDF_page_deleter_benchmark.py --pages 500    # dark mode toggle cost on a 500-page document
+    python PDF_page_deleter_benchmark.py --save-baseline baseline.json
+    python PDF_page_deleter_benchmark.py --baseline baseline.json --threshold 0.2
+
+Each operation is run `--repeat` times and the median is recorded. With `--baseline`, any
+operation slower than the baseline by more than `--threshold` (a fraction) is reported as a
+regression, and the script exits with status 1.
+
+Dependencies:
+-------------
+Same as PDF_page_deleter.py: PyQt5 and PyMuPDF (fitz).
+'''
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import fitz
+from PyQt5.QtWidgets import QApplication
+
+from pdf_document import PDFDocument, load_outline
+from PDF_page_deleter import PDFPageDeleterApp
+
+PAGE_SIZES = ['letter', 'a4', 'a4', 'a3']
+LARGE_PAGE_SIZE = 'a0'
+SEARCH_WORD = 'benchmark'
+RENDER_ZOOMS = [0.5, 1.0, 2.0, 4.0]
+RENDER_SAMPLE_PAGES = 10
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor '
+		 'incididunt ut labore et dolore magna aliqua').split()
+
+
+def generate_pdf(path, page_count, seed=0):
+	"""Write a synthetic PDF with mixed page sizes, text-heavy and image-heavy pages and an outline"""
+	rng = random.Random(seed)
+	doc = fitz.open()
+	toc = []
+	# A small pool of noise images, so image pages are heavy to render without bloating generation time
+	images = [fitz.Pixmap(fitz.csRGB, 256, 256, rng.randbytes(256 * 256 * 3), False) for _ in range(8)]
+	for page_num in range(page_count):
+		size = LARGE_PAGE_SIZE if page_num % 250 == 249 else rng.choice(PAGE_SIZES)
+		page = doc.new_page(width=fitz.paper_size(size)[0], height=fitz.paper_size(size)[1])
+		if page_num % 2 == 0:
+			# Text-heavy page
+			lines = []
+			for _ in range(int(page.rect.height // 14) - 4):
+				lines.append(' '.join(rng.choice(WORDS) for _ in range(12)))
+			lines.insert(rng.randrange(len(lines)), SEARCH_WORD)
+			page.insert_text((36, 36), '\n'.join(lines), fontsize=10)
+		else:
+			# Image-heavy page: a few noise images spread over the page
+			for _ in range(3):
+				x = rng.uniform(0, page.rect.width - 200)
+				y = rng.uniform(0, page.rect.height - 200)
+				page.insert_image(fitz.Rect(x, y, x + 200, y + 200), pixmap=rng.choice(images))
+		if page_num % 20 == 0:
+			toc.append([1, f"Chapter {page_num // 20 + 1}", page_num + 1])
+		elif page_num % 5 == 0:
+			toc.append([2, f"Section {page_num + 1}", page_num + 1])
+	doc.set_toc(toc)
+	doc.save(path, garbage=3, deflate=True)
+	doc.close()
+
+
+def time_call(func, repeat):
+	"""Median wall time of `repeat` calls to func, in seconds"""
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		func()
+		timings.append(time.perf_counter() - start)
+	return statistics.median(timings)
+
+
+def run_benchmarks(pdf_path, repeat):
+	app = QApplication.instance() or QApplication(sys.argv)
+	window = PDFPageDeleterApp()
+	window.resize(1200, 800)
+	window.show()
+	app.processEvents()
+	results = {}
+
+	def open_document():
+		if window.pdf_document:
+			window.pdf_document.close()
+		window.pdf_document = PDFDocument(pdf_path)
+		window.pdf_path = pdf_path
+
+	results['open'] = time_call(open_document, repeat)
+	window.zoom_level = window.fit_width_zoom()
+
+	results['load_toc'] = time_call(lambda: window.set_outline(*load_outline(pdf_path)), repeat)
+	results['thumbnails'] = time_call(window.generate_thumbnails, repeat)
+	results['continuous_view'] = time_call(window.setup_continuous_view, repeat)
+	app.processEvents()
+	results['search'] = time_call(lambda: window.find_text(SEARCH_WORD), repeat)
+
+	page_count = len(window.pdf_document)
+	step = max(1, page_count // RENDER_SAMPLE_PAGES)
+	sample = range(0, page_count, step)
+	for zoom in RENDER_ZOOMS:
+		def render_sample():
+			for page_num in sample:
+				window.page_to_pixmap(window.pdf_document[page_num], zoom)
+		results[f'render_{zoom}'] = time_call(render_sample, repeat)
+
+	# Populate the visible pages first, so the toggle has rendered pages to re-theme
+	window.render_visible_pages()
+	while window.refine_queue:
+		window.process_refine_queue()
+	app.processEvents()
+	renders_before = window.tracer.stats.get('get_pixmap', (0,))[0]
+	results['dark_mode_toggle'] = time_call(window.toggle_dark_mode, repeat)
+	app.processEvents()
+	toggle_renders = window.tracer.stats.get('get_pixmap', (0,))[0] - renders_before
+	if toggle_renders:
+		print(f"WARNING: dark mode toggle triggered {toggle_renders} page renders")
+
+	def delete_and_save():
+		window.pdf_document.deleted_pages.clear()
+		for page_num in range(0, page_count, 10):
+			window.pdf_document.mark_deleted(page_num)
+		with tempfile.TemporaryDirectory() as folder:
+			window.pdf_document.save(os.path.join(folder, 'benchmark_modified.pdf'))
+
+	results['delete_save'] = time_call(delete_and_save, repeat)
+
+	window.pdf_document.close()
+	window.deleteLater()
+	return results
+
+
+def compare_with_baseline(results, baseline, threshold):
+	"""Return a list of (name, baseline, current) for operations that got slower than allowed"""
+	regressions = []
+	for name, current in results.items():
+		previous = baseline.get(name)
+		if previous and current > previous * (1 + threshold):
+			regressions.append((name, previous, current))
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark PDF_page_deleter hot paths')
+	parser.add_argument('--pages', type=int, default=2000, help='pages in the synthetic PDF')
+	parser.add_argument('--repeat', type=int, default=3, help='runs per operation (median is kept)')
+	parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic PDF')
+	parser.add_argument('--pdf', help='benchmark an existing PDF instead of a synthetic one')
+	parser.add_argument('--output', default='pdf_page_deleter_benchmark.json', help='results file')
+	parser.add_argument('--baseline', help='baseline results to compare against')
+	parser.add_argument('--save-baseline', help='also store the results as a new baseline')
+	parser.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown as a fraction')
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as folder:
+		pdf_path = args.pdf
+		if not pdf_path:
+			pdf_path = os.path.join(folder, 'synthetic.pdf')
+			print(f"Generating {args.pages}-page synthetic PDF...")
+			generate_pdf(pdf_path, args.pages, args.seed)
+		results = run_benchmarks(pdf_path, args.repeat)
+
+	report = {
+		'pages': args.pages if not args.pdf else None,
+		'pdf': args.pdf,
+		'seed': args.seed,
+		'repeat': args.repeat,
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'pymupdf': fitz.VersionBind,
+		'results': results,
+	}
+	for path in filter(None, [args.output, args.save_baseline]):
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump(report, f, indent=2)
+
+	for name, seconds in results.items():
+		print(f"{name:>16}: {seconds * 1000:9.1f} ms")
+
+	if args.baseline:
+		with open(args.baseline, encoding='utf-8') as f:
+			baseline = json.load(f)['results']
+		regressions = compare_with_baseline(results, baseline, args.threshold)
+		for name, previous, current in regressions:
+			print(f"REGRESSION {name}: {previous * 1000:.1f} ms -> {current * 1000:.1f} ms")
+		if regressions:
+			sys.exit(1)
+		print("No regressions against baseline.")
+
+
+if __name__ == '__main__':
+	main()
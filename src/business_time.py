@@ -0,0 +1,116 @@
+'''
+business_time.py
+
+Description:
+    Working-time differences for billing: only time on working days, inside working hours and
+    outside holidays counts. Used by the business time mode of `time_difference_calculator.py`
+    and by the batch engine in `time_difference_engine.py`.
+
+    Spans are never walked day by day. Working time is counted from a fixed origin with a closed
+    form: whole weeks times the working days per week, plus a per-weekday prefix sum for the rest
+    of the week, minus the holidays before the day, plus the worked part of the day itself.
+    Holidays are kept as a sorted array of day numbers, so "holidays before day d" is a single
+    binary search, and any span costs O(log h) for h holidays. The difference of two such counts
+    is the working time between them, computed for whole NumPy arrays at once.
+
+Usage:
+    from business_time import BusinessCalendar, load_holidays
+
+    calendar = BusinessCalendar(workdays='Mon-Fri', hours='09:00-17:00',
+                                holidays=load_holidays('holidays.txt'))
+    seconds = calendar.working_seconds(start, end)   # datetime64 scalars or arrays
+
+    Holiday files hold one ISO date (YYYY-MM-DD) per line; text after a '#' is ignored.
+    Working hours must start and end on the same day.
+
+Dependencies:
+    - NumPy
+'''
+
+import numpy as np
+
+WEEKDAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+# 1970-01-01, day 0, was a Thursday
+EPOCH_WEEKDAY = 3
+DEFAULT_WORKDAYS = 'Mon-Fri'
+DEFAULT_HOURS = '09:00-17:00'
+
+
+def parse_weekdays(text):
+    """Parse weekday lists such as "Mon-Fri" or "Mon,Wed,Sat-Sun" into a set of weekday numbers (Mon=0)"""
+    weekdays = set()
+    for part in text.replace(' ', '').lower().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            first = WEEKDAY_NAMES.index(first[:3])
+            last = WEEKDAY_NAMES.index(last[:3]) if last else first
+        except ValueError:
+            raise ValueError(f"Invalid weekday: {part}") from None
+        # Ranges may wrap around the week, e.g. Sat-Mon
+        weekdays.update((first + i) % 7 for i in range((last - first) % 7 + 1))
+    return weekdays
+
+
+def parse_hours(text):
+    """Parse working hours "HH:MM-HH:MM" into (start, end) seconds after midnight"""
+    try:
+        start, end = (sum(int(value) * factor for value, factor in zip(part.strip().split(':'), (3600, 60)))
+                      for part in text.split('-'))
+    except ValueError:
+        raise ValueError(f"Invalid working hours: {text}") from None
+    if not 0 <= start < end <= 86400:
+        raise ValueError(f"Working hours must start before they end on the same day: {text}")
+    return start, end
+
+
+def load_holidays(path):
+    """Read holidays, one ISO date per line, as a datetime64[D] array"""
+    dates = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                dates.append(line[:10])
+    return np.array(dates, dtype='datetime64[D]')
+
+
+class BusinessCalendar:
+    """Working days, daily working hours and holidays, answering working time between instants"""
+
+    def __init__(self, workdays=DEFAULT_WORKDAYS, hours=DEFAULT_HOURS, holidays=()):
+        weekdays = parse_weekdays(workdays) if isinstance(workdays, str) else set(workdays)
+        self.day_start, self.day_end = parse_hours(hours) if isinstance(hours, str) else hours
+        self.seconds_per_day = self.day_end - self.day_start
+        # Working flag per day of the week, indexed by days since epoch modulo 7
+        self.workday_mask = np.array([(EPOCH_WEEKDAY + i) % 7 in weekdays for i in range(7)], dtype=bool)
+        # Working days among the first k days of each week: the prefix sum of the mask
+        self.week_prefix = np.concatenate(([0], np.cumsum(self.workday_mask)))
+        self.workdays_per_week = int(self.week_prefix[-1])
+        # Only holidays on working weekdays remove working time
+        days = np.unique(np.asarray(holidays, dtype='datetime64[D]').astype(np.int64))
+        self.holidays = days[self.workday_mask[days % 7]]
+
+    def working_days_before(self, days):
+        """Number of working days from the origin up to (not including) each day number"""
+        weeks, weekday = np.divmod(days, 7)
+        return (weeks * self.workdays_per_week + self.week_prefix[weekday]
+                - np.searchsorted(self.holidays, days))
+
+    def is_working_day(self, days):
+        holiday = np.searchsorted(self.holidays, days, side='right') > np.searchsorted(self.holidays, days)
+        return self.workday_mask[days % 7] & ~holiday
+
+    def working_seconds_before(self, seconds):
+        """Working seconds from the origin up to each instant (int64 seconds since epoch)"""
+        days, time_of_day = np.divmod(seconds, 86400)
+        worked_today = np.clip(time_of_day - self.day_start, 0, self.seconds_per_day)
+        return (self.working_days_before(days) * self.seconds_per_day
+                + np.where(self.is_working_day(days), worked_today, 0))
+
+    def working_seconds(self, start, end):
+        """Signed working seconds from start to end (datetime64 scalars or arrays)"""
+        start = np.asarray(start, dtype='datetime64[s]').astype(np.int64)
+        end = np.asarray(end, dtype='datetime64[s]').astype(np.int64)
+        return self.working_seconds_before(end) - self.working_seconds_before(start)
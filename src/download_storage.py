@@ -0,0 +1,138 @@
+'''
+download_storage.py
+
+Description:
+	Disk-space-aware storage helpers for the downloader scripts. Before a batch starts, the
+	sizes of all files are probed with HEAD requests and compared against the free space of the
+	target folder, so a large batch cannot fill the disk partway through. Files are preallocated
+	with `posix_fallocate` (where the platform supports it) and streamed to disk in chunks;
+	a failed transfer removes its partial file instead of leaving a corrupt one behind.
+	Sizes are probed and files fetched with `Accept-Encoding: identity`, so the probed size is the
+	size written to disk. Where no space could be reserved, free space is checked for every chunk.
+
+Usage:
+	from download_storage import probe_sizes, plan_admission, download_to_file
+
+	sizes = probe_sizes(session, urls)
+	admitted, deferred = plan_admission(urls, sizes, save_folder)
+	for url in admitted:
+		download_to_file(session, url, path, sizes.get(url))
+
+Dependencies:
+	- requests (through http_session.py)
+'''
+
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from http_session import DEFAULT_TIMEOUT, POOL_MAXSIZE
+
+CHUNK_SIZE = 1024 * 1024
+# Space always left free on the target disk so the system does not run dry
+FREE_SPACE_RESERVE = 64 * 1024 * 1024
+# Sizes are probed and files streamed without transfer compression, so Content-Length is the size on disk
+IDENTITY_HEADERS = {'Accept-Encoding': 'identity'}
+
+
+class InsufficientSpaceError(OSError):
+	pass
+
+
+def probe_size(session, url):
+	"""Return the Content-Length of `url` from a HEAD request, or None if unknown"""
+	try:
+		response = session.head(url, allow_redirects=True, timeout=DEFAULT_TIMEOUT, headers=IDENTITY_HEADERS)
+		if response.ok:
+			length = response.headers.get('Content-Length')
+			if length and length.isdigit():
+				return int(length)
+	except Exception:
+		pass
+	return None
+
+
+def probe_sizes(session, urls, max_workers=POOL_MAXSIZE):
+	"""Probe all `urls` concurrently over the pooled session"""
+	urls = list(dict.fromkeys(urls))
+	if not urls:
+		return {}
+	with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+		return dict(zip(urls, executor.map(lambda url: probe_size(session, url), urls)))
+
+
+def free_space(folder):
+	return shutil.disk_usage(folder).free
+
+
+def plan_admission(urls, sizes, folder, reserve=FREE_SPACE_RESERVE):
+	"""
+	Split `urls` into (admitted, deferred) so the admitted files fit in the free
+	space of `folder`. Files of unknown size are admitted and checked while streaming.
+	Duplicate URLs are planned once, so their size is not counted twice.
+	"""
+	budget = free_space(folder) - reserve
+	admitted, deferred = [], []
+	for url in dict.fromkeys(urls):
+		size = sizes.get(url) or 0
+		if size <= budget:
+			admitted.append(url)
+			budget -= size
+		else:
+			deferred.append(url)
+	return admitted, deferred
+
+
+def preallocate(f, size):
+	"""Reserve `size` bytes for the open file `f` to reduce fragmentation. Returns whether space was reserved."""
+	if not size or not hasattr(os, 'posix_fallocate'):
+		return False
+	try:
+		os.posix_fallocate(f.fileno(), 0, size)
+	except OSError as e:
+		if e.errno == errno.ENOSPC:
+			raise InsufficientSpaceError(errno.ENOSPC, f"Not enough space to preallocate {size} bytes") from e
+		# Filesystems without fallocate support just fall back to plain writes
+		return False
+	return True
+
+
+def download_to_file(session, url, path, expected_size=None, reserve=FREE_SPACE_RESERVE):
+	"""
+	Stream `url` into `path`, preallocating `expected_size` bytes when known.
+	The partial file is removed if the transfer fails. Returns the number of bytes written.
+	"""
+	folder = os.path.dirname(os.path.abspath(path))
+	written = 0
+	created = False
+	try:
+		with session.get(url, stream=True, timeout=DEFAULT_TIMEOUT, headers=IDENTITY_HEADERS) as response:
+			response.raise_for_status()
+			if response.headers.get('Content-Encoding', 'identity') != 'identity':
+				# The server compressed anyway: bytes on disk are unknown until decoded
+				expected_size = None
+			elif expected_size is None:
+				length = response.headers.get('Content-Length')
+				if length and length.isdigit():
+					expected_size = int(length)
+			with open(path, 'wb') as f:
+				created = True
+				reserved = preallocate(f, expected_size)
+				for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+					if not chunk:
+						continue
+					if not reserved or written + len(chunk) > expected_size:
+						# No space reserved up front, so keep an eye on the disk while streaming
+						if free_space(folder) - len(chunk) < reserve:
+							raise InsufficientSpaceError(errno.ENOSPC, f"Disk full while downloading {url}")
+					f.write(chunk)
+					written += len(chunk)
+				# Trim preallocated space if the body was shorter than announced
+				if expected_size and written != expected_size:
+					f.truncate(written)
+	except BaseException:
+		if created and os.path.exists(path):
+			os.remove(path)
+		raise
+	return written
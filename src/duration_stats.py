@@ -0,0 +1,305 @@
+'''
+duration_stats.py
+
+Description:
+    Streaming statistics of time differences for SLA reporting over logs far larger than memory.
+    Each row's start/end timestamps are parsed with the batch engine of
+    `time_difference_engine.py` (ISO 8601, or a compiled Qt 'Date Format'), and the durations are
+    folded into a `DurationStats` summary. The summary holds the count, mean, min, max, a fixed
+    histogram and a quantile sketch, so memory stays constant whatever the size of the log.
+
+    The sketch keeps logarithmically spaced buckets (as in DDSketch). Every reported percentile is
+    within `relative_accuracy` (1% by default) of the exact value. Summaries of separate chunks
+    merge by adding bucket counts, so a file is split into line-aligned byte ranges that are
+    memory-mapped and summarized in parallel across cores, then merged.
+
+Usage:
+    python duration_stats.py jobs.csv --start started_at --end finished_at
+    python duration_stats.py jobs.log --start 0 --end 1 --delimiter '\t' --format "dd.MM.yyyy HH:mm:ss"
+    python duration_stats.py jobs.csv --workers 1      # line by line in this process
+    python duration_stats.py jobs.csv --json sla.json
+
+    from duration_stats import file_duration_stats
+
+    stats = file_duration_stats('jobs.csv', 'started_at', 'finished_at')
+    print(stats.quantile(0.99), stats.summary())
+
+Dependencies:
+    - NumPy (through time_difference_engine.py)
+'''
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from time_difference_engine import CHUNK_ROWS, column_index, parse_zoned, read_chunks
+
+RELATIVE_ACCURACY = 0.01
+# Durations up to about 300 years fit in the sketch; longer ones land in the last bucket
+MAX_SKETCH_SECONDS = 1e10
+CHUNK_BYTES = 64 * 1024 * 1024
+# Workers decode their chunk this much at a time, so peak memory does not grow with the chunk
+BLOCK_BYTES = 1024 * 1024
+REPORTED_QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+# Histogram bucket edges in seconds: 1 s, 10 s, 1 min, 5 min, 15 min, 1 h, 6 h, 1 day, 1 week
+HISTOGRAM_EDGES = (1, 10, 60, 300, 900, 3600, 6 * 3600, 86400, 7 * 86400)
+
+
+class DurationStats:
+    """Constant-size, mergeable summary of durations in seconds"""
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, histogram_edges=HISTOGRAM_EDGES):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.bucket_count = math.ceil(math.log(MAX_SKETCH_SECONDS, self.gamma)) + 1
+        self.histogram_edges = np.asarray(histogram_edges, dtype=np.float64)
+        self.count = 0
+        self.invalid = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        # Sketch buckets for positive and negative durations (by magnitude), plus exact zeros
+        self.positive = np.zeros(self.bucket_count, dtype=np.int64)
+        self.negative = np.zeros(self.bucket_count, dtype=np.int64)
+        self.zeros = 0
+        self.histogram = np.zeros(len(self.histogram_edges) + 1, dtype=np.int64)
+
+    def _bucket_index(self, magnitudes):
+        index = np.ceil(np.log(magnitudes) / math.log(self.gamma)).astype(np.int64)
+        return np.clip(index, 0, self.bucket_count - 1)
+
+    def _bucket_value(self, index):
+        # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, durations, invalid=0):
+        """Fold an array of durations in seconds into the summary"""
+        durations = np.asarray(durations, dtype=np.float64)
+        self.invalid += invalid
+        if not len(durations):
+            return
+        self.count += len(durations)
+        self.total += float(durations.sum())
+        self.minimum = min(self.minimum, float(durations.min()))
+        self.maximum = max(self.maximum, float(durations.max()))
+        positive = durations[durations > 0]
+        negative = -durations[durations < 0]
+        self.zeros += len(durations) - len(positive) - len(negative)
+        if len(positive):
+            self.positive += np.bincount(self._bucket_index(positive), minlength=self.bucket_count)
+        if len(negative):
+            self.negative += np.bincount(self._bucket_index(negative), minlength=self.bucket_count)
+        self.histogram += np.bincount(np.searchsorted(self.histogram_edges, durations, side='right'),
+                                      minlength=len(self.histogram))
+
+    def merge(self, other):
+        """Add the counts of another summary built with the same settings"""
+        if (other.relative_accuracy != self.relative_accuracy or
+                not np.array_equal(other.histogram_edges, self.histogram_edges)):
+            raise ValueError("Cannot merge summaries with different accuracy or histogram edges")
+        self.count += other.count
+        self.invalid += other.invalid
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.positive += other.positive
+        self.negative += other.negative
+        self.zeros += other.zeros
+        self.histogram += other.histogram
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q):
+        """Duration at quantile q (0..1), within relative_accuracy of the exact value"""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        # Walk the buckets in increasing order of duration: largest negatives, zeros, positives
+        negative_counts = np.cumsum(self.negative[::-1])
+        if rank < negative_counts[-1]:
+            index = self.bucket_count - 1 - int(np.searchsorted(negative_counts, rank, side='right'))
+            value = -self._bucket_value(index)
+        elif rank < negative_counts[-1] + self.zeros:
+            value = 0.0
+        else:
+            positive_counts = np.cumsum(self.positive)
+            index = int(np.searchsorted(positive_counts, rank - negative_counts[-1] - self.zeros, side='right'))
+            value = self._bucket_value(index)
+        # The extremes are known exactly
+        return min(max(value, self.minimum), self.maximum)
+
+    def summary(self):
+        """Plain dict of the statistics, ready for printing or JSON"""
+        labels = [f"< {format_duration(self.histogram_edges[0])}"]
+        labels += [f"{format_duration(low)} - {format_duration(high)}"
+                   for low, high in zip(self.histogram_edges, self.histogram_edges[1:])]
+        labels.append(f">= {format_duration(self.histogram_edges[-1])}")
+        return {
+            'count': self.count,
+            'invalid': self.invalid,
+            'mean': self.mean,
+            'min': self.minimum if self.count else math.nan,
+            'max': self.maximum if self.count else math.nan,
+            'quantiles': {f'p{q * 100:g}': self.quantile(q) for q in REPORTED_QUANTILES},
+            'histogram': dict(zip(labels, self.histogram.tolist())),
+        }
+
+
+def format_duration(seconds):
+    """Compact human-readable duration, e.g. 90 -> '1m 30s'"""
+    if math.isnan(seconds):
+        return '-'
+    sign = '-' if seconds < 0 else ''
+    remaining = round(abs(seconds))
+    parts = []
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        value, remaining = divmod(remaining, size)
+        if value:
+            parts.append(f"{value}{unit}")
+    if remaining or not parts:
+        parts.append(f"{remaining}s")
+    return sign + ' '.join(parts)
+
+
+def durations_of(starts, ends, date_format=None, start_zone=None, end_zone=None):
+    """Durations in seconds of the rows whose timestamps both parse, and the number that did not"""
+    start, end = parse_zoned(starts, ends, date_format, start_zone, end_zone)
+    valid = ~(np.isnat(start) | np.isnat(end))
+    return (end[valid] - start[valid]).astype(np.int64), int(len(valid) - valid.sum())
+
+
+def line_aligned_ranges(path, data_start, chunk_bytes=CHUNK_BYTES):
+    """Split the file from `data_start` into (start, end) byte ranges that end on line boundaries"""
+    size = os.path.getsize(path)
+    if size <= data_start:
+        return []
+    ranges = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = data_start
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_bytes, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def range_lines(data, start, end, block_bytes=BLOCK_BYTES):
+    """Decoded lines of data[start:end], read in line-aligned blocks of about `block_bytes`"""
+    while start < end:
+        stop = data.find(b'\n', min(start + block_bytes, end) - 1, end)
+        stop = end if stop == -1 else stop + 1
+        yield from data[start:stop].decode('utf-8', errors='replace').splitlines()
+        start = stop
+
+
+def range_stats(path, byte_range, start_index, end_index, date_format, delimiter,
+                start_zone=None, end_zone=None, chunk_rows=CHUNK_ROWS):
+    """Process entry point: summarize the rows in one byte range of a memory-mapped file"""
+    stats = DurationStats()
+    width = max(start_index, end_index)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        rows = csv.reader(range_lines(data, *byte_range), delimiter=delimiter)
+        while True:
+            batch = list(itertools.islice(rows, chunk_rows))
+            if not batch:
+                break
+            starts, ends = [], []
+            for row in batch:
+                if len(row) > width:
+                    starts.append(row[start_index].strip())
+                    ends.append(row[end_index].strip())
+            stats.add(*durations_of(starts, ends, date_format, start_zone, end_zone))
+    return stats
+
+
+def file_duration_stats(path, start_column, end_column, date_format=None, delimiter=',',
+                        workers=None, chunk_bytes=CHUNK_BYTES, progress=None, start_zone=None, end_zone=None):
+    """
+    Summarize the durations of every row of a delimited file with a header row.
+    With workers=1 the file is read line by line in this process; otherwise line-aligned
+    chunks are memory-mapped and summarized in `workers` processes (default: all cores).
+    `start_zone` and `end_zone` name the time zones of the two columns (None: naive times).
+    `progress`, if given, is called with the fraction of the file done.
+    """
+    report = progress or (lambda fraction: None)
+    stats = DurationStats()
+    if workers == 1:
+        for starts, ends in read_chunks(path, start_column, end_column, delimiter=delimiter):
+            stats.add(*durations_of(starts, ends, date_format, start_zone, end_zone))
+        report(1.0)
+        return stats
+
+    with open(path, newline='', encoding='utf-8') as f:
+        header_line = f.readline()
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    start_index = column_index(header, start_column)
+    end_index = column_index(header, end_column)
+    data_start = len(header_line.encode('utf-8'))
+
+    ranges = line_aligned_ranges(path, data_start, chunk_bytes)
+    total_bytes = max(sum(end - start for start, end in ranges), 1)
+    done_bytes = 0
+    # Spawned, not forked: this runs from the calculator's QThread, and forking a threaded Qt process is unsafe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(range_stats, path, byte_range, start_index, end_index,
+                                   date_format, delimiter, start_zone, end_zone): byte_range for byte_range in ranges}
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            start, end = futures[future]
+            done_bytes += end - start
+            report(done_bytes / total_bytes)
+    return stats
+
+
+def print_summary(summary):
+    print(f"Durations: {summary['count']:,} rows ({summary['invalid']:,} skipped, unparseable)")
+    for name in ('mean', 'min', 'max'):
+        print(f"{name:>8}: {format_duration(summary[name])}")
+    for name, value in summary['quantiles'].items():
+        print(f"{name:>8}: {format_duration(value)}")
+    print("Histogram:")
+    width = max(summary['histogram'].values(), default=0) or 1
+    for label, count in summary['histogram'].items():
+        print(f"{label:>20} {count:>12,} {'#' * round(40 * count / width)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming duration statistics for start/end columns of a log')
+    parser.add_argument('input', help='CSV or delimited log file with a header row')
+    parser.add_argument('--start', default='start', help='start column name or zero-based index')
+    parser.add_argument('--end', default='end', help='end column name or zero-based index')
+    parser.add_argument('--format', help='Qt date format of the timestamps (default: ISO 8601)')
+    parser.add_argument('--start-zone', help='time zone of the start column, e.g. Europe/Berlin (default: naive)')
+    parser.add_argument('--end-zone', help='time zone of the end column (default: naive)')
+    parser.add_argument('--delimiter', default=',', help=r"field delimiter, e.g. ';' or '\t'")
+    parser.add_argument('--workers', type=int, help='worker processes (default: all cores, 1: no workers)')
+    parser.add_argument('--chunk-mb', type=int, default=CHUNK_BYTES // (1024 * 1024), help='chunk size per worker task')
+    parser.add_argument('--json', help='also write the statistics to this JSON file')
+    args = parser.parse_args()
+
+    delimiter = args.delimiter.encode().decode('unicode_escape')
+    stats = file_duration_stats(args.input, args.start, args.end, args.format, delimiter,
+                                args.workers, args.chunk_mb * 1024 * 1024,
+                                start_zone=args.start_zone, end_zone=args.end_zone)
+    summary = stats.summary()
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+'''
+http_session.py
+
+Description:
+	Shared HTTP transport for the downloader scripts (`hyperlink_files_downloader.py` and
+	`PDF_hyperlink_files_downloader.py`). Instead of calling the module-level `requests.get`,
+	which opens a fresh TCP+TLS connection for every file, the scripts fetch files through one
+	pooled `requests.Session`. Connections to the same host are kept alive and reused, which
+	cuts the handshake cost on large same-host batches.
+
+Usage:
+	from http_session import get_session
+
+	session = get_session()
+	response = session.get(url, timeout=DEFAULT_TIMEOUT)
+
+	- `get_session()` returns a process-wide session, created on first use.
+	- `create_session()` builds a new, independently configured session.
+	- `DNSCache` keeps resolved host addresses for `ttl` seconds so new connections to the same
+	  host skip the DNS lookup. It is scoped to the session's adapter; `socket.getaddrinfo` and
+	  other libraries are left alone. `get_session()` enables it by default.
+
+Dependencies:
+	- requests
+'''
+
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Pool tuning: number of distinct hosts kept in the pool and connections kept per host
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+MAX_RETRIES = 3
+DEFAULT_TIMEOUT = (10, 60)  # (connect, read) seconds
+DNS_CACHE_TTL = 300
+DNS_CACHE_MAXSIZE = 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class DNSCache:
+	"""Resolved addresses per (host, port), kept for `ttl` seconds"""
+	def __init__(self, ttl=DNS_CACHE_TTL, maxsize=DNS_CACHE_MAXSIZE):
+		self.ttl = ttl
+		self.maxsize = maxsize
+		self.entries = {}
+		self.lock = threading.Lock()
+
+	def resolve(self, host, port):
+		"""Return a cached address for `host`, or None to leave the lookup to urllib3"""
+		key = (host, port)
+		now = time.monotonic()
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry and entry[0] > now:
+				return entry[1]
+		try:
+			infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+		except OSError:
+			return None
+		if not infos:
+			return None
+		address = infos[0][4][0]
+		with self.lock:
+			if len(self.entries) >= self.maxsize:
+				self.entries = {k: v for k, v in self.entries.items() if v[0] > now}
+				if len(self.entries) >= self.maxsize:
+					self.entries.clear()
+			self.entries[key] = (now + self.ttl, address)
+		return address
+
+	def discard(self, host, port):
+		"""Forget `host`, e.g. after its cached address refused a connection"""
+		with self.lock:
+			self.entries.pop((host, port), None)
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+
+
+class _CachedResolverMixin:
+	"""Connects to the address from the adapter's DNS cache; TLS still verifies the original host name"""
+	dns_cache = None
+
+	def _new_conn(self):
+		host = self._dns_host
+		address = self.dns_cache.resolve(host, self.port)
+		if address is None:
+			return super()._new_conn()
+		self._dns_host = address
+		try:
+			return super()._new_conn()
+		except Exception:
+			# The address may be stale; resolve again on the next attempt
+			self.dns_cache.discard(host, self.port)
+			raise
+		finally:
+			self._dns_host = host
+
+
+def _cached_pool_class(pool_class, dns_cache):
+	connection_class = type(f'Cached{pool_class.ConnectionCls.__name__}',
+							(_CachedResolverMixin, pool_class.ConnectionCls),
+							{'dns_cache': dns_cache})
+	return type(f'Cached{pool_class.__name__}', (pool_class,), {'ConnectionCls': connection_class})
+
+
+class DNSCachingAdapter(HTTPAdapter):
+	"""HTTPAdapter whose connection pools resolve hosts through their own DNSCache"""
+	def __init__(self, *args, dns_cache=None, **kwargs):
+		self.dns_cache = dns_cache or DNSCache()
+		super().__init__(*args, **kwargs)
+
+	def init_poolmanager(self, *args, **kwargs):
+		super().init_poolmanager(*args, **kwargs)
+		self.poolmanager.pool_classes_by_scheme = {
+			'http': _cached_pool_class(HTTPConnectionPool, self.dns_cache),
+			'https': _cached_pool_class(HTTPSConnectionPool, self.dns_cache),
+		}
+
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+				   max_retries=MAX_RETRIES, decompress=True, dns_cache=None):
+	"""
+	Create a keep-alive session with a tuned connection pool.
+
+	With `decompress=False` the server is asked for the identity encoding, so
+	files are written exactly as served instead of being inflated on the fly.
+	A `DNSCache` passed as `dns_cache` is used by this session's connections only.
+	"""
+	session = requests.Session()
+	retries = Retry(total=max_retries, backoff_factor=0.5,
+					status_forcelist=(429, 500, 502, 503, 504),
+					allowed_methods=frozenset(['HEAD', 'GET']))
+	if dns_cache is None:
+		adapter = HTTPAdapter(pool_connections=pool_connections,
+							  pool_maxsize=pool_maxsize,
+							  max_retries=retries)
+	else:
+		adapter = DNSCachingAdapter(pool_connections=pool_connections,
+									pool_maxsize=pool_maxsize,
+									max_retries=retries,
+									dns_cache=dns_cache)
+	session.mount('http://', adapter)
+	session.mount('https://', adapter)
+	session.headers['Connection'] = 'keep-alive'
+	session.headers['Accept-Encoding'] = 'gzip, deflate' if decompress else 'identity'
+	return session
+
+
+def get_session(dns_cache=True):
+	"""Return the shared session, creating it on first use"""
+	global _session
+	with _session_lock:
+		if _session is None:
+			_session = create_session(dns_cache=DNSCache() if dns_cache else None)
+		return _session
+
+
+def close_session():
+	"""Close the shared session and release pooled connections"""
+	global _session
+	with _session_lock:
+		if _session is not None:
+			_session.close()
+			_session = None
@@ -10,12 +10,15 @@ Usage:
 	3. Enter the target URL in the provided text box.
 	4. Optionally, specify the desired file type (e.g., '.txt', '.jpg'). Default is '.pdf'.
 	5. Click the "Download" button to start downloading the files.
-	6. Download progress will be shown in the text area below the button.
+	6. Download progress will be shown in the text area below the button. Files that do not fit
+	   in the free space of the save directory are listed and skipped before any download starts.
 
 Dependencies:
 	- PyQt5 or PyQt6
 	- requests
 	- beautifulsoup4
+	- http_session.py (shared pooled HTTP session, shipped alongside this script)
+	- download_storage.py (free-space checks and preallocation, shipped alongside this script)
 
 To install dependencies:
 	pip install pyqt5 requests beautifulsoup4
@@ -25,10 +28,12 @@ To install dependencies:
 
 import sys
 import os
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+from http_session import get_session, DEFAULT_TIMEOUT
+from download_storage import InsufficientSpaceError, download_to_file, plan_admission, probe_sizes
+
 # Import handling for PyQt5 or PyQt6
 try:
 	from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QLineEdit, QTextEdit, QFileDialog, QLabel
@@ -53,14 +58,33 @@ class FileDownloader(QThread):
 
 	def run(self):
 		try:
-			response = requests.get(self.url)
+			session = get_session()
+			response = session.get(self.url, timeout=DEFAULT_TIMEOUT)
 			soup = BeautifulSoup(response.text, 'html.parser')
 			links = [a['href'] for a in soup.find_all('a', href=True) if a['href'].endswith(f'.{self.file_extension}')]
-			for link in links:
-				filename = os.path.join(self.save_folder, os.path.basename(link))
-				with open(filename, 'wb') as f:
-					f.write(requests.get(urljoin(self.url, link)).content)
-				self.update_signal.emit(f"Downloaded: {filename}")
+			# Pages often link the same file more than once; download each URL a single time
+			urls = list(dict.fromkeys(urljoin(self.url, link) for link in links))
+
+			# Make sure the whole batch fits on disk before writing anything
+			sizes = probe_sizes(session, urls)
+			admitted, deferred = plan_admission(urls, sizes, self.save_folder)
+			total = sum(sizes.get(url) or 0 for url in admitted)
+			self.update_signal.emit(f"Queued {len(admitted)} files ({total / 1024 / 1024:.1f} MB known size).")
+			if deferred:
+				self.update_signal.emit(f"Not enough free space for {len(deferred)} files, skipping:")
+				for url in deferred:
+					self.update_signal.emit(f"  {url}")
+
+			for url in admitted:
+				filename = os.path.join(self.save_folder, os.path.basename(url))
+				try:
+					download_to_file(session, url, filename, sizes.get(url))
+					self.update_signal.emit(f"Downloaded: {filename}")
+				except InsufficientSpaceError as e:
+					self.update_signal.emit(f"Stopped: {e.strerror}")
+					break
+				except Exception as e:
+					self.update_signal.emit(f"Failed: {url} ({e})")
 		except Exception as e:
 			self.update_signal.emit(str(e))
 
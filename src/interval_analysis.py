@@ -0,0 +1,329 @@
+'''
+interval_analysis.py
+
+Description:
+    Coverage and overlap of many start/end intervals, e.g. job runs from a log: the total time
+    covered by at least one interval (the union), the gaps between covered stretches, the time
+    during which runs overlap, and the maximum number of runs active at once. Timestamps are
+    parsed with the batch engine of `time_difference_engine.py`, like the 'Batch' tab of
+    `time_difference_calculator.py`. Intervals are half-open, [start, end): a run ending at the
+    instant the next one starts does not overlap it. Reversed rows are read as [end, start), as
+    the differences treat them.
+
+    The union comes from a sort-and-sweep merge: intervals sorted by start, with the running
+    maximum of their ends marking where a new covered stretch begins. Concurrency comes from a
+    sweep over the start (+1) and end (-1) events. Both are single NumPy passes after one sort,
+    O(n log n) for n intervals.
+
+    `IntervalIndex` is a static interval tree for point and overlap queries: intervals sorted by
+    start, over an implicit binary tree holding the latest end below each node. Listing the k
+    intervals that overlap a query costs O(log n + k log n) and counting them O(log n), for whole
+    arrays of queries at once.
+
+    The input is read in chunks, and the merged stretches, the gaps and the per-row overlap
+    counts are written to CSV in chunks, so only the parsed timestamps (16 bytes per interval)
+    are kept in memory.
+
+Usage:
+    python interval_analysis.py jobs.csv --start started_at --end finished_at
+    python interval_analysis.py jobs.csv --union union.csv --gaps gaps.csv --rows overlaps.csv
+    python interval_analysis.py jobs.log --start 0 --end 1 --delimiter '\t' --json intervals.json
+
+    from interval_analysis import IntervalIndex, file_intervals, interval_summary
+
+    starts, ends, invalid = file_intervals('jobs.csv', 'started_at', 'finished_at')
+    summary = interval_summary(starts, ends)
+    index = IntervalIndex(starts, ends)
+    running = index.overlapping(np.datetime64('2024-05-01T12:00:00'))   # row numbers
+
+Dependencies:
+    - NumPy (through time_difference_engine.py)
+'''
+
+import argparse
+import csv
+import json
+
+import numpy as np
+
+from duration_stats import format_duration
+from time_difference_engine import CHUNK_ROWS, DATETIME_DTYPE, parse_zoned, read_chunks
+
+UNION_FIELDS = ('start', 'end', 'seconds', 'intervals')
+GAP_FIELDS = ('start', 'end', 'seconds')
+ROW_FIELDS = ('start', 'end', 'seconds', 'overlapping')
+# Below every real end, for tree nodes past the last interval
+NO_END = np.iinfo(np.int64).min
+
+
+def as_seconds(values):
+    """datetime64 (any unit) or integer seconds as an int64 array of seconds since epoch"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype(DATETIME_DTYPE)
+    return values.astype(np.int64)
+
+
+def parse_intervals(starts, ends, date_format=None, start_zone=None, end_zone=None):
+    """Parse start/end strings into ordered int64 second bounds; returns (starts, ends, valid)"""
+    start, end = parse_zoned(starts, ends, date_format, start_zone, end_zone)
+    valid = ~(np.isnat(start) | np.isnat(end))
+    start = start.astype(np.int64)
+    end = end.astype(np.int64)
+    return np.minimum(start, end), np.maximum(start, end), valid
+
+
+def file_intervals(path, start_column, end_column, date_format=None, delimiter=',',
+                   chunk_rows=CHUNK_ROWS, progress=None, start_zone=None, end_zone=None):
+    """
+    Read the intervals of a delimited file as int64 seconds since epoch (UTC if a zone is given).
+    Rows whose timestamps do not parse are skipped. Returns (starts, ends, invalid).
+    """
+    start_chunks, end_chunks = [], []
+    rows = invalid = 0
+    for starts, ends in read_chunks(path, start_column, end_column, chunk_rows, delimiter):
+        start, end, valid = parse_intervals(starts, ends, date_format, start_zone, end_zone)
+        start_chunks.append(start[valid])
+        end_chunks.append(end[valid])
+        rows += len(starts)
+        invalid += int(len(valid) - valid.sum())
+        if progress:
+            progress(rows)
+    if not start_chunks:
+        return np.empty(0, np.int64), np.empty(0, np.int64), 0
+    return np.concatenate(start_chunks), np.concatenate(end_chunks), invalid
+
+
+def merge_intervals(starts, ends):
+    """
+    Sort-and-sweep union of the intervals. Returns the covered stretches as (starts, ends, counts),
+    sorted and disjoint, with the number of intervals merged into each. Touching intervals merge.
+    Empty intervals [s, s) cover nothing and are left out, so they never split a gap.
+    """
+    starts, ends = as_seconds(starts), as_seconds(ends)
+    covering = ends > starts
+    starts, ends = starts[covering], ends[covering]
+    if not len(starts):
+        return starts, ends, np.empty(0, np.int64)
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    # Latest end among the intervals so far; a start beyond it opens a new stretch
+    reach = np.maximum.accumulate(ends[order])
+    opens = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+    closes = np.append(opens[1:] - 1, len(starts) - 1)
+    return starts[opens], reach[closes], np.diff(np.append(opens, len(starts)))
+
+
+def concurrency_levels(starts, ends):
+    """
+    Sweep over the start/end events. Returns (times, levels): from times[i] until times[i + 1],
+    levels[i] intervals are active. Ends sort before starts at the same instant.
+    """
+    starts, ends = as_seconds(starts), as_seconds(ends)
+    if not len(starts):
+        return starts, starts
+    times = np.concatenate((starts, ends))
+    deltas = np.concatenate((np.ones(len(starts), np.int64), np.full(len(ends), -1, np.int64)))
+    order = np.lexsort((deltas, times))
+    times = times[order]
+    levels = np.cumsum(deltas[order])
+    # Keep only the last event of each instant, so zero-length steps never count
+    last = np.append(times[1:] != times[:-1], True)
+    return times[last], levels[last]
+
+
+def interval_summary(starts, ends, invalid=0):
+    """Union, gaps, overlap and peak concurrency of the intervals, as a JSON-friendly dict"""
+    starts, ends = as_seconds(starts), as_seconds(ends)
+    union_starts, union_ends, _ = merge_intervals(starts, ends)
+    gaps = union_starts[1:] - union_ends[:-1]
+    times, levels = concurrency_levels(starts, ends)
+    steps = np.diff(times)
+    summary = {
+        'intervals': len(starts),
+        'invalid': invalid,
+        'total_seconds': int((ends - starts).sum()),
+        'union_seconds': int((union_ends - union_starts).sum()),
+        'overlap_seconds': int(steps[levels[:-1] >= 2].sum()),
+        'stretches': len(union_starts),
+        'first_start': None,
+        'last_end': None,
+        'gaps': len(gaps),
+        'gap_seconds': int(gaps.sum()),
+        'longest_gap': None,
+        'max_concurrency': 0,
+        'max_concurrency_at': None,
+    }
+    if len(union_starts):
+        summary['first_start'] = format_times(union_starts[:1])[0]
+        summary['last_end'] = format_times(union_ends[-1:])[0]
+    if len(gaps):
+        longest = int(np.argmax(gaps))
+        summary['longest_gap'] = {'start': format_times(union_ends[longest:longest + 1])[0],
+                                  'end': format_times(union_starts[longest + 1:longest + 2])[0],
+                                  'seconds': int(gaps[longest])}
+    if len(levels):
+        peak = int(np.argmax(levels))
+        summary['max_concurrency'] = int(levels[peak])
+        summary['max_concurrency_at'] = format_times(times[peak:peak + 1])[0]
+    return summary
+
+
+def format_times(seconds):
+    return np.datetime_as_string(np.asarray(seconds, dtype=np.int64).astype(DATETIME_DTYPE)).tolist()
+
+
+class IntervalIndex:
+    """
+    Static interval tree over half-open intervals [start, end) for point and overlap queries.
+    Empty intervals [s, s) contain no instant, so they never overlap anything and are left out.
+    """
+
+    def __init__(self, starts, ends):
+        starts, ends = as_seconds(starts), as_seconds(ends)
+        rows = np.flatnonzero(ends > starts)
+        # Input row numbers of the indexed intervals, in order of their starts
+        self.order = rows[np.argsort(starts[rows], kind='stable')]
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.sorted_ends = np.sort(self.ends)
+        # Implicit binary tree over the sorted intervals: leaves at size + i, node k above 2k and 2k + 1,
+        # each holding the latest end below it
+        self.size = 1 << max(len(self.starts) - 1, 0).bit_length()
+        self.max_end = np.full(2 * self.size, NO_END, np.int64)
+        self.max_end[self.size:self.size + len(self.starts)] = self.ends
+        level = self.size
+        while level > 1:
+            self.max_end[level // 2:level] = np.maximum(self.max_end[level:2 * level:2], self.max_end[level + 1:2 * level:2])
+            level //= 2
+
+    def __len__(self):
+        return len(self.starts)
+
+    def count(self, start, end=None):
+        """
+        Number of intervals overlapping [start, end), or containing the instant `start` if no end is
+        given or the range is empty. Scalars or arrays of queries; O(log n) each.
+        """
+        start = as_seconds(start)
+        end = start + 1 if end is None else np.maximum(as_seconds(end), start + 1)
+        # Every interval ending by `start` also starts before `end`
+        return np.searchsorted(self.starts, end) - np.searchsorted(self.sorted_ends, start, side='right')
+
+    def overlapping(self, start, end=None):
+        """Input row numbers of the intervals overlapping [start, end), or containing the instant `start`"""
+        start = int(as_seconds(start))
+        end = start + 1 if end is None else max(int(as_seconds(end)), start + 1)
+        # Candidates start before the query ends; of those, descend only into subtrees ending after it starts
+        limit = int(np.searchsorted(self.starts, end))
+        hits = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or self.max_end[node] <= start:
+                continue
+            if node >= self.size:
+                hits.append(low)
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return np.sort(self.order[hits])
+
+
+def write_csv(path, fields, columns, chunk_rows=CHUNK_ROWS):
+    """Stream equally long columns to a CSV file, formatting datetime columns one chunk at a time"""
+    with open(path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        for offset in range(0, len(columns[0]), chunk_rows):
+            chunk = [column[offset:offset + chunk_rows] for column in columns]
+            chunk[:2] = (format_times(column) for column in chunk[:2])
+            writer.writerows(zip(*(column if isinstance(column, list) else column.tolist() for column in chunk)))
+
+
+def write_row_overlaps(index, input_path, output_path, start_column, end_column, date_format=None,
+                       delimiter=',', chunk_rows=CHUNK_ROWS, start_zone=None, end_zone=None):
+    """Stream each input row with the number of other intervals it overlaps (blank if it does not parse)"""
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(ROW_FIELDS)
+        for starts, ends in read_chunks(input_path, start_column, end_column, chunk_rows, delimiter):
+            start, end, valid = parse_intervals(starts, ends, date_format, start_zone, end_zone)
+            # Minus the interval itself; an empty one is not indexed and counts the intervals active at its instant
+            others = index.count(start, end) - (end > start)
+            seconds = end - start
+            writer.writerows(
+                (row_start, row_end, row_seconds, row_others) if row_valid else (row_start, row_end, '', '')
+                for row_start, row_end, row_seconds, row_others, row_valid
+                in zip(starts, ends, seconds.tolist(), others.tolist(), valid.tolist()))
+
+
+def analyze_file(input_path, start_column, end_column, date_format=None, delimiter=',',
+                 chunk_rows=CHUNK_ROWS, progress=None, start_zone=None, end_zone=None,
+                 union_path=None, gaps_path=None, rows_path=None):
+    """
+    Interval summary of a delimited file (see interval_summary). Optionally streams the merged
+    stretches to `union_path`, the gaps between them to `gaps_path` and every row with its
+    overlap count to `rows_path`. `progress`, if given, is called with the rows read so far.
+    """
+    starts, ends, invalid = file_intervals(input_path, start_column, end_column, date_format, delimiter,
+                                           chunk_rows, progress, start_zone, end_zone)
+    summary = interval_summary(starts, ends, invalid)
+    if union_path or gaps_path:
+        union_starts, union_ends, counts = merge_intervals(starts, ends)
+        if union_path:
+            write_csv(union_path, UNION_FIELDS, [union_starts, union_ends, union_ends - union_starts, counts],
+                      chunk_rows)
+        if gaps_path:
+            write_csv(gaps_path, GAP_FIELDS, [union_ends[:-1], union_starts[1:], union_starts[1:] - union_ends[:-1]],
+                      chunk_rows)
+    if rows_path:
+        write_row_overlaps(IntervalIndex(starts, ends), input_path, rows_path, start_column, end_column,
+                           date_format, delimiter, chunk_rows, start_zone, end_zone)
+    return summary
+
+
+def print_summary(summary):
+    print(f"Intervals: {summary['intervals']:,} ({summary['invalid']:,} skipped, unparseable)")
+    if not summary['intervals']:
+        return
+    print(f"   Span: {summary['first_start']} to {summary['last_end']}")
+    print(f"  Total: {format_duration(summary['total_seconds'])} (sum of all intervals)")
+    print(f"Covered: {format_duration(summary['union_seconds'])} in {summary['stretches']:,} stretches")
+    print(f"Overlap: {format_duration(summary['overlap_seconds'])} with two or more intervals active")
+    print(f"   Gaps: {summary['gaps']:,}, {format_duration(summary['gap_seconds'])} in total")
+    if summary['longest_gap']:
+        gap = summary['longest_gap']
+        print(f"Longest: {format_duration(gap['seconds'])} from {gap['start']} to {gap['end']}")
+    print(f"   Peak: {summary['max_concurrency']:,} intervals active at {summary['max_concurrency_at']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Union, gaps and overlap of start/end intervals in a log')
+    parser.add_argument('input', help='CSV or delimited log file with a header row')
+    parser.add_argument('--start', default='start', help='start column name or zero-based index')
+    parser.add_argument('--end', default='end', help='end column name or zero-based index')
+    parser.add_argument('--format', help='Qt date format of the timestamps (default: ISO 8601)')
+    parser.add_argument('--start-zone', help='time zone of the start column, e.g. Europe/Berlin (default: naive)')
+    parser.add_argument('--end-zone', help='time zone of the end column (default: naive)')
+    parser.add_argument('--delimiter', default=',', help=r"field delimiter, e.g. ';' or '\t'")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows read and written per chunk')
+    parser.add_argument('--union', help='write the merged covered stretches to this CSV file')
+    parser.add_argument('--gaps', help='write the gaps between covered stretches to this CSV file')
+    parser.add_argument('--rows', help='write every row with the number of intervals it overlaps to this CSV file')
+    parser.add_argument('--json', help='also write the summary to this JSON file')
+    args = parser.parse_args()
+
+    delimiter = args.delimiter.encode().decode('unicode_escape')
+    summary = analyze_file(args.input, args.start, args.end, args.format, delimiter, args.chunk_rows,
+                           start_zone=args.start_zone, end_zone=args.end_zone,
+                           union_path=args.union, gaps_path=args.gaps, rows_path=args.rows)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+'''
+pdf_document.py
+
+Description:
+	Shared document backend for `PDF_page_deleter.py`. One PyMuPDF document serves preview,
+	search, thumbnails and save, so a file is never opened twice. Pages marked for deletion are
+	tracked here as a set of page indices. The original document stays untouched until the
+	result is written out.
+
+	Large files are opened by path and not read into a Python `bytes` object. MuPDF then reads
+	pages from disk on demand, and the operating system page cache backs those reads. Peak RSS
+	stays close to the pages actually in use, not the size of the file.
+
+Usage:
+	from pdf_document import PDFDocument
+
+	document = PDFDocument('scan.pdf')
+	page = document[0]             # fitz.Page, as with fitz.open()
+	document.mark_deleted(3)       # zero-based page index
+	document.save('scan_modified.pdf')                    # compact rewrite
+	document.save('scan_modified.pdf', SAVE_INCREMENTAL)  # append to a copy of the original
+
+	Save modes:
+	- SAVE_FAST: keep only the selected pages, then write with garbage collection and stream
+	  compression. Objects orphaned by the deleted pages are dropped and duplicates are merged.
+	- SAVE_INCREMENTAL: copy the original file and append an update section that removes the
+	  deleted pages. This is the quickest way to drop a few pages from a very large file, but the
+	  output keeps the original objects. Falls back to SAVE_FAST when the PDF cannot be
+	  updated incrementally (for example a repaired or encrypted file).
+
+	`save_pages()` only needs plain arguments, so it can run in a worker process and keep the
+	GUI responsive while a 1 GB file is written.
+
+	`load_outline()` likewise returns plain nested tuples, so huge outlines can be read in a
+	worker process as well.
+
+Dependencies:
+	- PyMuPDF (fitz)
+'''
+
+import os
+import shutil
+
+import fitz
+
+SAVE_FAST = 'fast'
+SAVE_INCREMENTAL = 'incremental'
+PART_SUFFIX = '.part'
+
+
+class PDFDocument:
+	"""A fitz document plus the set of pages marked for deletion"""
+
+	def __init__(self, path):
+		self.path = path
+		self.doc = fitz.open(path)
+		self.deleted_pages = set()
+
+	def __getattr__(self, name):
+		# Anything not handled here (get_toc, load_page, ...) goes to the fitz document
+		if name == 'doc':
+			raise AttributeError(name)
+		return getattr(self.doc, name)
+
+	def __len__(self):
+		return len(self.doc)
+
+	def __getitem__(self, page_index):
+		return self.doc[page_index]
+
+	def __bool__(self):
+		return not self.doc.is_closed
+
+	@property
+	def is_modified(self):
+		return bool(self.deleted_pages)
+
+	@property
+	def remaining_page_count(self):
+		return len(self.doc) - len(self.deleted_pages)
+
+	def mark_deleted(self, page_index):
+		if 0 <= page_index < len(self.doc):
+			self.deleted_pages.add(page_index)
+
+	def mark_deleted_pages(self, page_indices):
+		"""Mark many pages in one edit; returns the number of pages newly marked"""
+		page_count = len(self.doc)
+		new_pages = {i for i in page_indices if 0 <= i < page_count} - self.deleted_pages
+		self.deleted_pages |= new_pages
+		return len(new_pages)
+
+	def every_nth_page(self, n, first=1):
+		"""Zero-based indices of pages first, first + n, first + 2n, ... (first is one-based)"""
+		return set(range(first - 1, len(self.doc), n))
+
+	def pages_containing(self, text):
+		"""Zero-based indices of pages whose text contains `text`, ignoring case"""
+		needle = text.lower()
+		return {i for i in range(len(self.doc)) if needle in self.doc[i].get_text().lower()}
+
+	def kept_pages(self):
+		return [i for i in range(len(self.doc)) if i not in self.deleted_pages]
+
+	def save(self, out_path, mode=SAVE_FAST):
+		"""Write the kept pages to `out_path`, leaving the open document unchanged"""
+		save_pages(self.path, self.kept_pages(), out_path, mode)
+
+	def close(self):
+		if not self.doc.is_closed:
+			self.doc.close()
+
+
+def save_pages(source_path, kept_pages, out_path, mode=SAVE_FAST, progress=None):
+	"""
+	Write the pages `kept_pages` of `source_path` to `out_path`.
+
+	The output is written to a temporary file next to `out_path` and moved into place
+	when complete, so an interrupted save never leaves a truncated PDF behind.
+	`progress`, if given, is called with (percent, message) between stages.
+	"""
+	report = progress or (lambda percent, message: None)
+	part_path = out_path + PART_SUFFIX
+	try:
+		if mode == SAVE_INCREMENTAL:
+			report(5, "Copying original file...")
+			shutil.copyfile(source_path, part_path)
+			doc = fitz.open(part_path)
+			if not doc.can_save_incrementally():
+				doc.close()
+				os.remove(part_path)
+				mode = SAVE_FAST
+		if mode == SAVE_FAST:
+			report(5, "Opening document...")
+			doc = fitz.open(source_path)
+		try:
+			report(20, "Removing deleted pages...")
+			if len(kept_pages) != len(doc):
+				doc.select(kept_pages)
+			report(40, "Writing output...")
+			if mode == SAVE_INCREMENTAL:
+				doc.saveIncr()
+			else:
+				doc.save(part_path, garbage=3, deflate=True)
+		finally:
+			doc.close()
+		os.replace(part_path, out_path)
+		report(100, "Saved.")
+	except BaseException:
+		if os.path.exists(part_path):
+			os.remove(part_path)
+		raise
+
+
+def save_pages_in_worker(source_path, kept_pages, out_path, mode, messages):
+	"""Process entry point for save_pages; progress and errors are reported through the `messages` queue"""
+	try:
+		save_pages(source_path, kept_pages, out_path, mode,
+				   progress=lambda percent, message: messages.put(('progress', percent, message)))
+	except Exception as e:
+		messages.put(('error', 0, str(e)))
+
+
+def parse_page_ranges(text, page_count):
+	"""
+	Parse one-based page ranges such as "1-5, 8, 10-" into zero-based indices.
+	An open end runs to the last page. Raises ValueError on malformed input.
+	"""
+	pages = set()
+	for part in text.replace(';', ',').split(','):
+		part = part.strip()
+		if not part:
+			continue
+		if '-' in part:
+			start, _, end = part.partition('-')
+			start = int(start) if start.strip() else 1
+			end = int(end) if end.strip() else page_count
+		else:
+			start = end = int(part)
+		if start < 1 or end < start:
+			raise ValueError(f"Invalid page range: {part}")
+		pages.update(range(start - 1, min(end, page_count)))
+	return pages
+
+
+def build_outline_tree(toc):
+	"""
+	Turn a flat get_toc() list of [level, title, page] into nested (title, page, children)
+	tuples. Entries that skip a level are attached to the nearest shallower entry.
+	"""
+	root = []
+	stack = [(0, root)]
+	for level, title, page in toc:
+		while len(stack) > 1 and stack[-1][0] >= level:
+			stack.pop()
+		children = []
+		stack[-1][1].append((title, page, children))
+		stack.append((level, children))
+	return root
+
+
+def load_outline(path):
+	"""Read the outline of `path` as nested tuples; only plain data, so it can run in a worker process"""
+	with fitz.open(path) as doc:
+		toc = doc.get_toc(simple=True)
+	return build_outline_tree(toc), len(toc)
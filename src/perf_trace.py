@@ -0,0 +1,129 @@
+'''
+perf_trace.py
+
+Description:
+	Lightweight timing instrumentation for the GUI scripts. Timed sections are kept in a bounded
+	in-memory buffer together with per-name statistics (count, total, mean and max). The buffer
+	can be written out as a Chrome trace JSON file; open it in chrome://tracing or
+	https://ui.perfetto.dev to find stalls on customer documents.
+
+Usage:
+	from perf_trace import PerfTracer, traced
+
+	tracer = PerfTracer()
+	with tracer.span('get_pixmap', page=3):
+		...
+	tracer.mark('error', message='page 3 failed')
+	print(tracer.summary())
+	tracer.dump_chrome_trace('trace.json')
+
+	class Viewer:
+		@traced('render_page')
+		def render_page(self, page_num):  # uses self.tracer
+			...
+
+Dependencies:
+	- None (standard library only)
+'''
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+MAX_TRACE_EVENTS = 100_000
+
+
+class PerfTracer:
+	"""Records timed spans and instant events for later inspection"""
+
+	def __init__(self, max_events=MAX_TRACE_EVENTS):
+		self.enabled = True
+		self.events = deque(maxlen=max_events)
+		self.stats = {}
+		self.origin = time.perf_counter()
+		self.lock = threading.Lock()
+
+	def _now_us(self):
+		return (time.perf_counter() - self.origin) * 1e6
+
+	def record(self, name, start_us, duration_us, args=None):
+		with self.lock:
+			self.events.append({
+				'name': name, 'ph': 'X', 'ts': start_us, 'dur': duration_us,
+				'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args or {},
+			})
+			count, total, longest = self.stats.get(name, (0, 0.0, 0.0))
+			self.stats[name] = (count + 1, total + duration_us, max(longest, duration_us))
+
+	def span(self, name, **args):
+		return _Span(self, name, args)
+
+	def mark(self, name, **args):
+		"""Record an instant event, e.g. an error, at the current time"""
+		if not self.enabled:
+			return
+		with self.lock:
+			self.events.append({
+				'name': name, 'ph': 'i', 's': 't', 'ts': self._now_us(),
+				'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args,
+			})
+
+	def reset(self):
+		with self.lock:
+			self.events.clear()
+			self.stats.clear()
+
+	def summary(self):
+		"""One line per traced name, slowest total first"""
+		with self.lock:
+			stats = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+		lines = []
+		for name, (count, total, longest) in stats:
+			lines.append(f"{name}: {count} calls, mean {total / count / 1000:.1f} ms, "
+						 f"max {longest / 1000:.1f} ms, total {total / 1000:.0f} ms")
+		return '\n'.join(lines)
+
+	def dump_chrome_trace(self, path):
+		"""Write the recorded events in the Chrome trace event format"""
+		with self.lock:
+			events = list(self.events)
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+class _Span:
+	__slots__ = ('tracer', 'name', 'args', 'start')
+
+	def __init__(self, tracer, name, args):
+		self.tracer = tracer
+		self.name = name
+		self.args = args
+
+	def __enter__(self):
+		self.start = self.tracer._now_us() if self.tracer.enabled else None
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		if self.start is None:
+			return False
+		if exc_type is not None:
+			self.args['error'] = repr(exc)
+		self.tracer.record(self.name, self.start, self.tracer._now_us() - self.start, self.args)
+		return False
+
+
+def traced(name):
+	"""Decorator timing a method with the `tracer` attribute of its instance"""
+	def decorator(method):
+		@functools.wraps(method)
+		def wrapper(self, *args, **kwargs):
+			tracer = getattr(self, 'tracer', None)
+			if tracer is None or not tracer.enabled:
+				return method(self, *args, **kwargs)
+			with tracer.span(name):
+				return method(self, *args, **kwargs)
+		return wrapper
+	return decorator
@@ -0,0 +1,205 @@
+'''
+session_history.py
+
+Description:
+	Persistent history of study and relax phases for the Study & Relax Task Manager, so study time
+	can be analysed over months. Every phase that ends (completed, stopped or skipped) is appended
+	to a SQLite database with its planned and actual start and end times, as reported by the
+	'end' events of `session_scheduler.SessionScheduler`. Both the GUI and the scheduling daemon
+	record to it.
+
+	The database runs in WAL mode, so charts and reports read while a recorder writes. Rows are
+	never updated. In the same transaction as each phase, its planned and actual seconds are
+	added to a per-day, per-phase totals table (split at local midnight), so daily and weekly
+	reports read at most one row per day and phase through the table's primary key, however
+	long the history grows.
+
+Usage:
+	python session_history.py                  # study and relax time per day, last 14 days
+	python session_history.py --weeks 12       # per week (starting Monday), last 12 weeks
+	python session_history.py --phases 20      # the 20 most recent phases
+
+	from session_history import SessionHistory
+
+	history = SessionHistory()                 # ~/.study_relax_history.sqlite3
+	scheduler.listeners.append(history.on_event)
+	rows = history.daily_totals(date(2024, 5, 1), date(2024, 5, 31))
+
+Dependencies:
+	- None (standard library only)
+'''
+
+import argparse
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser('~'), '.study_relax_history.sqlite3')
+PHASE_NAMES = ('study', 'relax')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS phases (
+	id INTEGER PRIMARY KEY,
+	run_start REAL NOT NULL,
+	session INTEGER NOT NULL,
+	phase TEXT NOT NULL,
+	outcome TEXT NOT NULL,
+	planned_start REAL NOT NULL,
+	planned_end REAL NOT NULL,
+	actual_start REAL,
+	actual_end REAL
+);
+CREATE INDEX IF NOT EXISTS phases_by_start ON phases (planned_start);
+CREATE TABLE IF NOT EXISTS daily_totals (
+	day TEXT NOT NULL,
+	phase TEXT NOT NULL,
+	planned_seconds REAL NOT NULL DEFAULT 0,
+	actual_seconds REAL NOT NULL DEFAULT 0,
+	phases INTEGER NOT NULL DEFAULT 0,
+	PRIMARY KEY (day, phase)
+) WITHOUT ROWID;
+'''
+
+ADD_TO_DAY = '''
+INSERT INTO daily_totals (day, phase, planned_seconds, actual_seconds, phases) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (day, phase) DO UPDATE SET
+	planned_seconds = planned_seconds + excluded.planned_seconds,
+	actual_seconds = actual_seconds + excluded.actual_seconds,
+	phases = phases + excluded.phases
+'''
+
+# Monday of the week of each day: SQLite's %w counts from Sunday = 0
+WEEKLY_TOTALS = '''
+SELECT date(day, '-' || ((strftime('%w', day) + 6) % 7) || ' days') AS week, phase,
+	SUM(planned_seconds), SUM(actual_seconds), SUM(phases)
+FROM daily_totals WHERE day BETWEEN ? AND ?
+GROUP BY week, phase ORDER BY week, phase
+'''
+
+
+def split_by_day(start, end):
+	"""Yield (local date, seconds) for the parts of [start, end) (epoch seconds) on each local day"""
+	while start < end:
+		day = datetime.fromtimestamp(start).date()
+		midnight = datetime.combine(day + timedelta(days=1), time()).timestamp()
+		yield day, min(end, midnight) - start
+		start = midnight
+
+
+class SessionHistory:
+	"""Append-only log of study/relax phases with pre-aggregated daily totals"""
+
+	def __init__(self, path=DEFAULT_HISTORY_PATH):
+		self.path = path
+		self.connection = sqlite3.connect(path)
+		self.connection.execute('PRAGMA journal_mode=WAL')
+		# With WAL, NORMAL only risks the last commits on power loss, never corruption
+		self.connection.execute('PRAGMA synchronous=NORMAL')
+		self.connection.executescript(SCHEMA)
+
+	def close(self):
+		self.connection.close()
+
+	def on_event(self, event):
+		"""SessionScheduler listener: records every phase that ends"""
+		if event['event'] != 'end':
+			return
+		try:
+			self.record_phase(**event['record'])
+		except sqlite3.Error as e:
+			# A lost record must not stop the schedule
+			print(f"Could not record the phase in {self.path}: {e}")
+
+	def record_phase(self, run_start, session, phase, outcome, planned_start, planned_end,
+					 actual_start=None, actual_end=None):
+		"""Append one phase and add its time to the daily totals; times are epoch seconds"""
+		totals = {}
+		for day, seconds in split_by_day(planned_start, planned_end):
+			totals.setdefault(day, [0.0, 0.0])[0] += seconds
+		# Phases that ended unobserved count as planned
+		started = planned_start if actual_start is None else actual_start
+		ended = planned_end if actual_end is None else actual_end
+		for day, seconds in split_by_day(started, ended):
+			totals.setdefault(day, [0.0, 0.0])[1] += seconds
+		first_day = datetime.fromtimestamp(started).date()
+		with self.connection:
+			self.connection.execute(
+				'INSERT INTO phases (run_start, session, phase, outcome, planned_start, planned_end, actual_start, actual_end) '
+				'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+				(run_start, session, phase, outcome, planned_start, planned_end, actual_start, actual_end))
+			self.connection.executemany(ADD_TO_DAY, [
+				(day.isoformat(), phase, planned, actual, int(day == first_day))
+				for day, (planned, actual) in totals.items()])
+
+	def daily_totals(self, first_day, last_day):
+		"""(day, phase, planned seconds, actual seconds, phases) rows for the days in [first_day, last_day]"""
+		return self.connection.execute(
+			'SELECT day, phase, planned_seconds, actual_seconds, phases FROM daily_totals '
+			'WHERE day BETWEEN ? AND ? ORDER BY day, phase',
+			(first_day.isoformat(), last_day.isoformat())).fetchall()
+
+	def weekly_totals(self, first_day, last_day):
+		"""Like daily_totals, one row per week (its Monday) and phase, from the daily rows"""
+		return self.connection.execute(WEEKLY_TOTALS, (first_day.isoformat(), last_day.isoformat())).fetchall()
+
+	def recent_phases(self, limit=20):
+		"""The most recent phases, newest first, as (phase, outcome, planned start, planned end, actual start, actual end)"""
+		return self.connection.execute(
+			'SELECT phase, outcome, planned_start, planned_end, actual_start, actual_end FROM phases '
+			'ORDER BY planned_start DESC LIMIT ?', (limit,)).fetchall()
+
+
+def period_totals(history, weeks=False, count=14, today=None):
+	"""
+	Actual study and relax seconds for the last `count` days (or weeks), oldest first, as
+	[(period start, {'study': seconds, 'relax': seconds})], including empty periods.
+	"""
+	today = today or date.today()
+	if weeks:
+		last = today - timedelta(days=today.weekday())
+		periods = [last - timedelta(weeks=i) for i in reversed(range(count))]
+		rows = history.weekly_totals(periods[0], today)
+	else:
+		periods = [today - timedelta(days=i) for i in reversed(range(count))]
+		rows = history.daily_totals(periods[0], today)
+	totals = {period.isoformat(): dict.fromkeys(PHASE_NAMES, 0.0) for period in periods}
+	for period, phase, _, actual_seconds, _ in rows:
+		if period in totals and phase in PHASE_NAMES:
+			totals[period][phase] = actual_seconds
+	return [(period, totals[period.isoformat()]) for period in periods]
+
+
+def format_hours(seconds):
+	hours, minutes = divmod(round(seconds / 60), 60)
+	return f"{hours}h {minutes:02d}m"
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Study and relax time from the session history')
+	parser.add_argument('--database', default=DEFAULT_HISTORY_PATH, help='history database file')
+	parser.add_argument('--days', type=int, default=14, help='days to show')
+	parser.add_argument('--weeks', type=int, help='show this many weeks instead of days')
+	parser.add_argument('--phases', type=int, help='list this many recent phases instead')
+	args = parser.parse_args()
+
+	history = SessionHistory(args.database)
+	try:
+		if args.phases:
+			for phase, outcome, planned_start, planned_end, actual_start, actual_end in history.recent_phases(args.phases):
+				started = datetime.fromtimestamp(actual_start or planned_start)
+				ended = datetime.fromtimestamp(actual_end or planned_end)
+				print(f"{started:%Y-%m-%d %H:%M:%S} - {ended:%H:%M:%S}  {phase:<5}  {outcome:<9}  "
+					  f"planned {format_hours(planned_end - planned_start)}")
+			return
+		totals = period_totals(history, weeks=bool(args.weeks), count=args.weeks or args.days)
+		width = max((max(phases.values()) for _, phases in totals), default=0) or 1
+		for period, phases in totals:
+			bar = '#' * round(40 * phases['study'] / width)
+			print(f"{period.isoformat()}  study {format_hours(phases['study']):>8}  "
+				  f"relax {format_hours(phases['relax']):>8}  {bar}")
+	finally:
+		history.close()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,638 @@
+'''
+session_scheduler.py
+
+Description:
+	Qt-free core of the Study & Relax Task Manager: the list of (study, relax) sessions, the
+	phase state machine and monotonic phase deadlines. `study_relax_task_manager.py` drives it
+	from the GUI; run on its own, it is a small background daemon that keeps the schedule
+	without Qt or a window, with clients connecting over a local socket. When the daemon is
+	running, the GUI attaches to it through `SchedulerClient` instead of keeping a timer of its
+	own, so there is only ever one schedule and one writer to the history database.
+
+	The daemon waits on its sockets and on a heap-based timer queue: one select() call with the
+	time until the earliest deadline as its timeout, so it wakes up only for commands and phase
+	changes. Deadlines use a monotonic clock that counts time spent suspended (CLOCK_BOOTTIME
+	on Linux), and waits are capped so a phase that ended during a suspend is noticed soon
+	after resume. Clients speak newline-delimited JSON over a Unix domain socket (a localhost
+	TCP port where those are unavailable). Ended phases are recorded to the same history
+	database as the GUI (see session_history.py).
+
+Usage:
+	python session_scheduler.py serve &                  # start the daemon
+	python session_scheduler.py serve --alarm-command "paplay alarm.wav"
+	python session_scheduler.py serve --no-history        # do not record phases
+	python session_scheduler.py add 00:25:00 00:05:00    # study and relax time of a session
+	python session_scheduler.py start
+	python session_scheduler.py watch                    # live countdown in the terminal
+	python session_scheduler.py status | stop | clear | shutdown
+
+	from session_scheduler import SessionScheduler
+
+	scheduler = SessionScheduler()
+	scheduler.listeners.append(print)      # called with each event dict
+	scheduler.add_session('00:25:00', '00:05:00')
+	scheduler.start()
+	scheduler.advance()                    # after the deadline: moves on to the next phase
+
+	client = SchedulerClient()             # the daemon's scheduler, same interface (OSError if none)
+	client.listeners.append(print)
+	client.receive()                       # whenever client.fileno() is readable
+
+Dependencies:
+	- None (standard library only)
+'''
+
+import argparse
+import getpass
+import heapq
+import itertools
+import json
+import os
+import selectors
+import shlex
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from session_history import DEFAULT_HISTORY_PATH, SessionHistory
+
+DEFAULT_PORT = 47219
+# Longest single wait, so deadlines passed during a suspend are caught soon after resume
+MAX_WAIT_SECONDS = 30.0
+MAX_LINE_BYTES = 64 * 1024
+
+
+def session_clock():
+	"""Monotonic seconds for phase deadlines, counting time spent suspended where the platform allows"""
+	if hasattr(time, 'CLOCK_BOOTTIME'):
+		# Linux: CLOCK_MONOTONIC stops while suspended, CLOCK_BOOTTIME does not
+		return time.clock_gettime(time.CLOCK_BOOTTIME)
+	return time.monotonic()
+
+
+def parse_duration(text):
+	"""Seconds in an "HH:MM:SS" duration"""
+	try:
+		hours, minutes, seconds = (int(part) for part in text.split(':'))
+	except ValueError:
+		raise ValueError(f"Invalid duration, expected HH:MM:SS: {text}") from None
+	if min(hours, minutes, seconds) < 0 or minutes > 59 or seconds > 59:
+		raise ValueError(f"Invalid duration, expected HH:MM:SS: {text}")
+	return hours * 3600 + minutes * 60 + seconds
+
+
+def format_duration(seconds):
+	"""Seconds as "HH:MM:SS" """
+	minutes, seconds = divmod(int(seconds), 60)
+	hours, minutes = divmod(minutes, 60)
+	return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class TimerQueue:
+	"""Heap of one-shot timers, the earliest due at the top; cancelled entries are dropped lazily"""
+
+	def __init__(self, clock=session_clock):
+		self.clock = clock
+		self.heap = []
+		self.sequence = itertools.count()
+
+	def call_at(self, due, callback):
+		"""Run callback() once the clock reaches `due`; returns a handle for cancel()"""
+		entry = [due, next(self.sequence), callback]
+		heapq.heappush(self.heap, entry)
+		return entry
+
+	def cancel(self, entry):
+		entry[2] = None
+
+	def next_timeout(self):
+		"""Seconds until the earliest live timer is due (0 if overdue), or None if there is none"""
+		while self.heap and self.heap[0][2] is None:
+			heapq.heappop(self.heap)
+		if not self.heap:
+			return None
+		return max(0.0, self.heap[0][0] - self.clock())
+
+	def run_due(self):
+		now = self.clock()
+		while self.heap and self.heap[0][0] <= now:
+			_, _, callback = heapq.heappop(self.heap)
+			if callback is not None:
+				callback()
+
+
+class SessionScheduler:
+	"""
+	Study/relax sessions and the phase state machine. Each phase ends at a deadline on `clock`,
+	following on from the previous deadline so that delays never add up. Listeners are called
+	with an event dict on every change: 'start' (first phase), 'phase' (a later phase began),
+	'done' (all sessions completed), 'stop' and 'sessions' (the list changed). Before a phase is
+	left, an 'end' event carries its planned and actual times (wall clock, epoch seconds) as
+	'record'; phases that ended unobserved have no actual times.
+	"""
+
+	def __init__(self, clock=session_clock):
+		self.clock = clock
+		self.sessions = []
+		self.current_session_index = -1
+		self.is_study_time = True
+		# Clock time at which the current phase ends, None while not running
+		self.deadline = None
+		# Clock time at which the current phase was announced, and wall time at which the run started
+		self.phase_started = None
+		self.run_started = None
+		# Epoch seconds minus clock time, taken once per phase so recorded times stay consistent
+		self.wall_offset = 0.0
+		self.listeners = []
+
+	@property
+	def running(self):
+		return self.deadline is not None
+
+	def wall_time(self, clock_time):
+		"""A time on `clock` as epoch seconds, using the offset taken when the phase began"""
+		return clock_time + self.wall_offset
+
+	def begin_phase(self, now):
+		self.phase_started = now
+		self.wall_offset = time.time() - now
+
+	def end_phase(self, outcome, actual_end=None):
+		"""Report the current phase as ended: 'completed', 'stopped' or 'skipped' (never announced)"""
+		duration = self.phase_seconds()
+		planned_start = self.wall_time(self.deadline - duration)
+		announced = outcome != 'skipped'
+		self.notify('end', record={
+			'run_start': self.run_started,
+			'session': self.current_session_index,
+			'phase': 'study' if self.is_study_time else 'relax',
+			'outcome': outcome,
+			'planned_start': planned_start,
+			# Exactly the planned duration later
+			'planned_end': planned_start + duration,
+			'actual_start': self.wall_time(self.phase_started) if announced else None,
+			'actual_end': self.wall_time(actual_end) if announced else None,
+		})
+
+	def notify(self, event, **fields):
+		message = dict(fields, event=event, **self.status())
+		for listener in self.listeners:
+			listener(message)
+
+	def add_session(self, study_time, relax_time):
+		"""Append a session of "HH:MM:SS" study and relax times"""
+		parse_duration(study_time)
+		parse_duration(relax_time)
+		self.sessions.append((study_time, relax_time))
+		self.notify('sessions')
+
+	def clear_sessions(self):
+		# Stop first: ending the running phase still needs its session
+		self.stop()
+		self.sessions.clear()
+		self.notify('sessions')
+
+	def phase_seconds(self):
+		"""Duration of the current study or relax phase in seconds"""
+		study_time, relax_time = self.sessions[self.current_session_index]
+		return parse_duration(study_time if self.is_study_time else relax_time)
+
+	def start(self):
+		if not self.sessions:
+			raise ValueError('Please add at least one session.')
+		if self.running:
+			# Restarted mid-run: the interrupted phase is still recorded
+			self.end_phase('stopped', self.clock())
+		self.current_session_index = 0
+		self.is_study_time = True
+		self.begin_phase(self.clock())
+		self.run_started = self.wall_time(self.phase_started)
+		self.deadline = self.phase_started + self.phase_seconds()
+		self.notify('start')
+		# A first phase of zero length ends at once
+		self.advance()
+
+	def stop(self):
+		was_running = self.running
+		if was_running:
+			self.end_phase('stopped', self.clock())
+		self.deadline = None
+		self.current_session_index = -1
+		self.is_study_time = True
+		if was_running:
+			self.notify('stop')
+
+	def remaining(self):
+		"""Seconds left in the current phase, or 0 when not running"""
+		return max(0.0, self.deadline - self.clock()) if self.running else 0.0
+
+	def advance(self):
+		"""Move past every phase whose deadline has passed; phases that ended unobserved are skipped"""
+		now = self.clock()
+		if not self.running or self.deadline > now:
+			return
+		outcome = 'completed'
+		while True:
+			self.end_phase(outcome, now)
+			outcome = 'skipped'
+			self.is_study_time = not self.is_study_time
+			if self.is_study_time:  # End of relax time
+				self.current_session_index += 1
+			if self.current_session_index >= len(self.sessions):
+				self.deadline = None
+				self.current_session_index = -1
+				self.is_study_time = True
+				self.notify('done')
+				return
+			self.deadline += self.phase_seconds()
+			if self.deadline > now:
+				break
+		self.begin_phase(now)
+		self.notify('phase')
+
+	def status(self):
+		return {
+			'sessions': [list(session) for session in self.sessions],
+			'running': self.running,
+			'session': self.current_session_index,
+			'phase': 'study' if self.is_study_time else 'relax',
+			'remaining': self.remaining(),
+		}
+
+
+def default_address():
+	"""Unix socket path in the user's runtime directory, or a localhost TCP port"""
+	if not hasattr(socket, 'AF_UNIX'):
+		return ('127.0.0.1', DEFAULT_PORT)
+	folder = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+	return os.path.join(folder, f'study_relax_{getpass.getuser()}.sock')
+
+
+def connect(address):
+	family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+	sock = socket.socket(family, socket.SOCK_STREAM)
+	try:
+		sock.connect(address)
+	except OSError:
+		sock.close()
+		raise
+	return sock
+
+
+class SchedulerDaemon:
+	"""Serves a SessionScheduler to local clients; one JSON request per line, one JSON reply per line"""
+
+	def __init__(self, address=None, alarm_command=None, history_path=DEFAULT_HISTORY_PATH):
+		self.address = address or default_address()
+		self.alarm_command = alarm_command
+		self.scheduler = SessionScheduler()
+		self.scheduler.listeners.append(self.on_event)
+		self.history = SessionHistory(history_path) if history_path else None
+		if self.history:
+			self.scheduler.listeners.append(self.history.on_event)
+		self.timers = TimerQueue(self.scheduler.clock)
+		self.deadline_timer = None
+		self.selector = selectors.DefaultSelector()
+		# Connected client sockets and their unfinished input
+		self.buffers = {}
+		self.watchers = set()
+		self.serving = False
+
+	def listen(self):
+		if isinstance(self.address, tuple):
+			server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			server.bind(self.address)
+		else:
+			if os.path.exists(self.address):
+				try:
+					connect(self.address).close()
+				except OSError:
+					os.unlink(self.address)  # Left behind by a daemon that did not exit cleanly
+				else:
+					raise RuntimeError(f"A scheduler is already running at {self.address}")
+			server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+			server.bind(self.address)
+			os.chmod(self.address, 0o600)
+		server.listen()
+		server.setblocking(False)
+		self.selector.register(server, selectors.EVENT_READ)
+		return server
+
+	def serve_forever(self):
+		server = self.listen()
+		self.serving = True
+		try:
+			while self.serving:
+				timeout = self.timers.next_timeout()
+				if timeout is not None:
+					timeout = min(timeout, MAX_WAIT_SECONDS)
+				for key, _ in self.selector.select(timeout):
+					if key.fileobj is server:
+						self.accept(server)
+					else:
+						self.receive(key.fileobj)
+				self.timers.run_due()
+		finally:
+			for client in list(self.buffers):
+				self.disconnect(client)
+			self.selector.close()
+			server.close()
+			if not isinstance(self.address, tuple) and os.path.exists(self.address):
+				os.unlink(self.address)
+			if self.history:
+				self.history.close()
+
+	def accept(self, server):
+		client, _ = server.accept()
+		client.setblocking(False)
+		self.buffers[client] = b''
+		self.selector.register(client, selectors.EVENT_READ)
+
+	def disconnect(self, client):
+		if client not in self.buffers:
+			return  # Already dropped, e.g. by a failed send while its lines were handled
+		self.selector.unregister(client)
+		self.buffers.pop(client)
+		self.watchers.discard(client)
+		client.close()
+
+	def receive(self, client):
+		try:
+			data = client.recv(4096)
+		except OSError:
+			data = b''
+		if not data:
+			self.disconnect(client)
+			return
+		buffer = self.buffers[client] + data
+		*lines, self.buffers[client] = buffer.split(b'\n')
+		if len(self.buffers[client]) > MAX_LINE_BYTES:
+			self.disconnect(client)
+			return
+		for line in lines:
+			if client not in self.buffers:
+				break  # Dropped by a failed send
+			if line.strip():
+				self.send(client, self.handle(client, line))
+
+	def send(self, client, message):
+		try:
+			# Replies and events are small; a client too slow to take them is dropped
+			client.sendall(json.dumps(message).encode() + b'\n')
+		except OSError:
+			self.disconnect(client)
+
+	def handle(self, client, line):
+		try:
+			request = json.loads(line)
+			command = request.get('command')
+			if command == 'add':
+				self.scheduler.add_session(request['study'], request['relax'])
+			elif command == 'clear':
+				self.scheduler.clear_sessions()
+			elif command == 'start':
+				self.scheduler.start()
+			elif command == 'stop':
+				self.scheduler.stop()
+			elif command == 'watch':
+				self.watchers.add(client)
+			elif command == 'shutdown':
+				self.serving = False
+			elif command != 'status':
+				raise ValueError(f"Unknown command: {command}")
+		except (ValueError, KeyError, TypeError, AttributeError) as e:
+			return {'ok': False, 'error': str(e)}
+		return dict(self.scheduler.status(), ok=True)
+
+	def on_event(self, event):
+		if event['event'] == 'end':
+			# Followed by the event for the phase that comes next
+			for client in list(self.watchers):
+				self.send(client, event)
+			return
+		# Wake up at the new deadline, if any
+		if self.deadline_timer is not None:
+			self.timers.cancel(self.deadline_timer)
+			self.deadline_timer = None
+		if self.scheduler.running:
+			self.deadline_timer = self.timers.call_at(self.scheduler.deadline, self.scheduler.advance)
+		if event['event'] in ('phase', 'done') and self.alarm_command:
+			try:
+				subprocess.Popen(shlex.split(self.alarm_command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+			except OSError as e:
+				print(f"Alarm command failed: {e}", file=sys.stderr)
+		for client in list(self.watchers):
+			self.send(client, event)
+
+
+def request(address, message):
+	"""Send one request to the daemon and return its reply"""
+	with connect(address) as sock:
+		sock.sendall(json.dumps(message).encode() + b'\n')
+		with sock.makefile('rb') as reader:
+			reply = reader.readline()
+	if not reply:
+		raise ConnectionError('The scheduler closed the connection')
+	return json.loads(reply)
+
+
+class SchedulerClient:
+	"""
+	A scheduler running in the daemon, with the interface of SessionScheduler, so a window can
+	attach to it instead of keeping its own timer. Raises OSError if no daemon is listening.
+	Events arrive on a watch connection: call receive() whenever fileno() is readable.
+	"""
+
+	def __init__(self, address=None, clock=time.monotonic):
+		self.address = address or default_address()
+		self.clock = clock
+		self.listeners = []
+		self.sock = connect(self.address)
+		self.buffer = b''
+		try:
+			self.sock.sendall(b'{"command": "watch"}\n')
+			while b'\n' not in self.buffer:
+				data = self.sock.recv(4096)
+				if not data:
+					raise ConnectionError('The scheduler closed the connection')
+				self.buffer += data
+		except OSError:
+			self.sock.close()
+			raise
+		line, self.buffer = self.buffer.split(b'\n', 1)
+		self.update(json.loads(line))
+		self.sock.setblocking(False)
+
+	def update(self, status):
+		self.state = status
+		self.received = self.clock()
+
+	def fileno(self):
+		return self.sock.fileno()
+
+	def receive(self):
+		"""Handle the events received so far; returns False once the daemon has gone away"""
+		try:
+			data = self.sock.recv(4096)
+		except BlockingIOError:
+			return True
+		except OSError:
+			data = b''
+		if not data:
+			self.close()
+			return False
+		*lines, self.buffer = (self.buffer + data).split(b'\n')
+		for line in lines:
+			if not line.strip():
+				continue
+			message = json.loads(line)
+			self.update(message)
+			for listener in self.listeners:
+				listener(message)
+		return True
+
+	def close(self):
+		self.sock.close()
+		self.update(dict(self.state, running=False, session=-1, phase='study', remaining=0.0))
+
+	def command(self, message):
+		reply = request(self.address, message)
+		if not reply['ok']:
+			raise ValueError(reply['error'])
+		self.update(reply)
+
+	@property
+	def sessions(self):
+		return [tuple(session) for session in self.state['sessions']]
+
+	@property
+	def running(self):
+		return self.state['running']
+
+	@property
+	def current_session_index(self):
+		return self.state['session']
+
+	@property
+	def is_study_time(self):
+		return self.state['phase'] == 'study'
+
+	def add_session(self, study_time, relax_time):
+		self.command({'command': 'add', 'study': study_time, 'relax': relax_time})
+
+	def clear_sessions(self):
+		self.command({'command': 'clear'})
+
+	def start(self):
+		self.command({'command': 'start'})
+
+	def stop(self):
+		self.command({'command': 'stop'})
+
+	def remaining(self):
+		"""Seconds left in the current phase, counted locally from the last status received"""
+		if not self.running:
+			return 0.0
+		return max(0.0, self.state['remaining'] - (self.clock() - self.received))
+
+	def advance(self):
+		"""Nothing to do: the daemon moves on by itself and its events arrive through receive()"""
+
+	def status(self):
+		return dict(self.state, remaining=self.remaining())
+
+
+def describe(status):
+	if not status['running']:
+		return f"Not running, {len(status['sessions'])} session(s) planned"
+	phase = 'Study' if status['phase'] == 'study' else 'Relax'
+	return (f"Session {status['session'] + 1}/{len(status['sessions'])}: {phase} "
+			f"{format_duration(-(-status['remaining'] // 1))} left")
+
+
+def watch(address):
+	"""Print a live countdown, counted locally from the daemon's events, ringing the bell on phase changes"""
+	sock = connect(address)
+	sock.sendall(b'{"command": "watch"}\n')
+	selector = selectors.DefaultSelector()
+	selector.register(sock, selectors.EVENT_READ)
+	# Lines are split here rather than through a buffered reader, so that every complete line
+	# received is handled before waiting again: an 'end' event arrives together with the next 'phase'
+	buffer = b''
+	status, received = None, None
+	try:
+		while True:
+			if status is not None:
+				left = max(0.0, status['remaining'] - (time.monotonic() - received))
+				print(f"\r{describe(dict(status, remaining=left))}\033[K", end='', flush=True)
+				# Wake up when the shown second changes, or for the next event
+				timeout = left % 1 or 1 if status['running'] else None
+			else:
+				timeout = None
+			if not selector.select(timeout):
+				continue
+			data = sock.recv(4096)
+			if not data:
+				print("\nThe scheduler has shut down.")
+				return
+			*lines, buffer = (buffer + data).split(b'\n')
+			for line in lines:
+				if not line.strip():
+					continue
+				status, received = json.loads(line), time.monotonic()
+				if status.get('event') in ('phase', 'done'):
+					print('\a', end='')
+				if status.get('event') == 'done':
+					print("\rAll sessions completed!\033[K")
+	except KeyboardInterrupt:
+		print()
+	finally:
+		selector.close()
+		sock.close()
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Study & Relax scheduling daemon and client')
+	parser.add_argument('--socket', help='Unix socket path (or TCP port) of the daemon')
+	commands = parser.add_subparsers(dest='command', required=True)
+	serve_parser = commands.add_parser('serve', help='run the scheduling daemon')
+	serve_parser.add_argument('--alarm-command', help='command run at every phase change, e.g. "paplay alarm.wav"')
+	serve_parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help='history database the phases are recorded to')
+	serve_parser.add_argument('--no-history', action='store_true', help='do not record phases')
+	add_parser = commands.add_parser('add', help='add a session')
+	add_parser.add_argument('study', help='study time, HH:MM:SS')
+	add_parser.add_argument('relax', help='relax time, HH:MM:SS')
+	for name, description in (('start', 'start the sessions'), ('stop', 'stop the sessions'),
+							  ('clear', 'remove all sessions'), ('status', 'show the current phase'),
+							  ('watch', 'show a live countdown'), ('shutdown', 'stop the daemon')):
+		commands.add_parser(name, help=description)
+	args = parser.parse_args()
+
+	address = default_address()
+	if args.socket:
+		address = ('127.0.0.1', int(args.socket)) if args.socket.isdigit() else args.socket
+
+	try:
+		if args.command == 'serve':
+			SchedulerDaemon(address, args.alarm_command, None if args.no_history else args.history).serve_forever()
+		elif args.command == 'watch':
+			watch(address)
+		else:
+			message = {'command': args.command}
+			if args.command == 'add':
+				message.update(study=args.study, relax=args.relax)
+			reply = request(address, message)
+			if not reply['ok']:
+				sys.exit(reply['error'])
+			if args.command != 'shutdown':
+				print(describe(reply))
+	except (OSError, RuntimeError, sqlite3.Error) as e:
+		sys.exit(f"Scheduler: {e}")
+
+
+if __name__ == '__main__':
+	main()
@@ -38,25 +38,120 @@ Usage:
    - The current countdown time is displayed below the 'Start' button.
    - When transitioning between study and relaxation times, the selected alarm sound will play, and a notification 
    will appear to inform you.
+   - The countdown is measured against the end time of each phase rather than counted down tick by tick, so it
+   does not drift when the computer is busy or a dialog is open, and keeps counting while the system sleeps.
+   Phases that ended in the meantime are skipped.
 
 7. **End of Sessions**:
    - Once all sessions are complete, a notification will inform you that all sessions have finished.
 
+8. **History**:
+   - Every study and relax phase is saved, with its planned and actual times, to .study_relax_history.sqlite3
+   in your home folder.
+   - Click 'History' to see your study and relax time per day or per week as a bar chart. Run
+   `python session_history.py` for the same figures in a terminal.
+
+9. **Running Without the Window**:
+   - The schedule itself lives in session_scheduler.py, which needs neither PyQt5 nor a window. Run
+   `python session_scheduler.py serve` to keep it in a small background daemon, and manage it from a terminal:
+   `python session_scheduler.py add 00:25:00 00:05:00`, `start`, `watch`, `status` or `stop`.
+   - While the daemon is running, this window attaches to it over the same local socket: sessions added here
+   go to the daemon, and the countdown, alarms and history all follow the daemon's schedule. Without a
+   daemon, the window keeps the schedule itself. If the daemon shuts down, its sessions are kept in the
+   window and can be started from there.
+
 Dependencies:
 -------------
 Ensure you have the following Python packages installed:
 - PyQt5: For the graphical user interface.
 - PyQt5.QtMultimedia: For playing the alarm sound.
+- session_scheduler.py and session_history.py, shipped alongside this script (standard library only).
 '''
 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QMessageBox, QWidget, QTimeEdit, QFileDialog, QSizePolicy
-from PyQt5.QtCore import QTimer, QTime, QUrl, Qt, QFile, QIODevice
+from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QListWidget, QMessageBox, QWidget, QTimeEdit, QFileDialog, QSizePolicy, QDialog, QComboBox
+from PyQt5.QtCore import QTimer, QTime, QUrl, Qt, QFile, QIODevice, QSocketNotifier
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QPainter, QColor
 
 
+import math
+import sqlite3
 import tempfile
 import alarm_sound
+from session_history import SessionHistory, format_hours, period_totals
+from session_scheduler import SchedulerClient, SessionScheduler
+
+# Countdown updates land this long after the shown second changes, as coarse timers may fire early
+COARSE_TICK_MARGIN_MS = 50
+PHASE_COLORS = {'study': QColor(52, 120, 200), 'relax': QColor(120, 190, 110)}
+# (label, weeks, number of periods) for the history chart
+HISTORY_RANGES = [('Last 14 days', False, 14), ('Last 30 days', False, 30), ('Last 12 weeks', True, 12), ('Last 52 weeks', True, 52)]
+
+
+class HistoryChart(QWidget):
+	"""Bar chart of actual study and relax time per period"""
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.totals = []
+		self.setMinimumSize(480, 240)
+
+	def set_totals(self, totals):
+		self.totals = totals
+		self.update()
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+		painter.fillRect(self.rect(), self.palette().base())
+		if not self.totals:
+			return
+		margin, label_height = 10, 20
+		chart_height = self.height() - 2 * margin - 2 * label_height
+		slot = (self.width() - 2 * margin) / len(self.totals)
+		peak = max(max(phases.values()) for _, phases in self.totals) or 1
+		painter.setPen(self.palette().text().color())
+		painter.drawText(margin, margin + label_height - 5, f"max {format_hours(peak)}")
+		bottom = margin + label_height + chart_height
+		# Label every period if they fit, else about every sixth
+		label_every = 1 if slot >= 40 else max(1, round(40 / slot))
+		for index, (period, phases) in enumerate(self.totals):
+			left = margin + index * slot
+			for offset, phase in enumerate(('study', 'relax')):
+				height = round(chart_height * phases[phase] / peak)
+				painter.fillRect(int(left + slot * (0.1 + 0.4 * offset)), bottom - height, max(1, int(slot * 0.4)), height, PHASE_COLORS[phase])
+			if index % label_every == 0:
+				painter.drawText(int(left), bottom + label_height - 5, period.strftime('%m-%d'))
+
+
+class HistoryDialog(QDialog):
+	"""Study and relax time per day or week, read from the pre-aggregated history totals"""
+
+	def __init__(self, history, parent=None):
+		super().__init__(parent)
+		self.history = history
+		self.setWindowTitle('Study & Relax History')
+
+		self.range_input = QComboBox(self)
+		self.range_input.addItems([label for label, _, _ in HISTORY_RANGES])
+		self.range_input.currentIndexChanged.connect(self.refresh)
+		self.chart = HistoryChart(self)
+		self.summary_label = QLabel('', self)
+
+		layout = QVBoxLayout()
+		layout.addWidget(self.range_input)
+		layout.addWidget(self.chart)
+		layout.addWidget(self.summary_label)
+		self.setLayout(layout)
+		self.refresh()
+
+	def refresh(self):
+		_, weeks, count = HISTORY_RANGES[self.range_input.currentIndex()]
+		totals = period_totals(self.history, weeks=weeks, count=count)
+		self.chart.set_totals(totals)
+		study = sum(phases['study'] for _, phases in totals)
+		relax = sum(phases['relax'] for _, phases in totals)
+		self.summary_label.setText(f"Study: {format_hours(study)} (blue)   Relax: {format_hours(relax)} (green)")
+
 
 class TaskManagerApp(QMainWindow):
 	def __init__(self):
@@ -91,6 +186,8 @@ class TaskManagerApp(QMainWindow):
 		  # Add button to select alarm sound
 		self.select_alarm_button = QPushButton('Select Alarm Sound', self)
 		self.select_alarm_button.clicked.connect(self.select_alarm_sound)
+		self.history_button = QPushButton('History', self)
+		self.history_button.clicked.connect(self.show_history)
 
 		self.study_time_label = QLabel('Study Time:')
 		self.relax_time_label = QLabel('Relax Time:')
@@ -111,6 +208,7 @@ class TaskManagerApp(QMainWindow):
 		main_layout.addWidget(self.stop_button)
 		main_layout.addWidget(self.current_time_label)
 		main_layout.addWidget(self.select_alarm_button)
+		main_layout.addWidget(self.history_button)
 		  # Add the stop button to the main layout
 		# main_layout = self.centralWidget().layout()
 
@@ -118,12 +216,22 @@ class TaskManagerApp(QMainWindow):
 		central_widget.setLayout(main_layout)
 		self.setCentralWidget(central_widget)
 
-		# Attributes for handling sessions
-		self.sessions = []
-		self.current_session_index = -1
-		self.is_study_time = True
+		# Phases are recorded as they end; the app still works if the history cannot be opened
+		try:
+			self.history = SessionHistory()
+		except sqlite3.Error as e:
+			print(f"Session history unavailable: {e}")
+			self.history = None
+		# Single-shot, re-armed for whenever the shown countdown changes next
 		self.timer = QTimer(self)
+		self.timer.setSingleShot(True)
 		self.timer.timeout.connect(self.update_time)
+		# Sessions, phases and their deadlines; the widgets only show its state
+		self.daemon_notifier = None
+		try:
+			self.use_scheduler(SchedulerClient())
+		except (OSError, ValueError):
+			self.use_scheduler(SessionScheduler())
 
 		# Set up media player for alarm sound
 		self.temp_alarm_file = self.extract_resource_to_temp(":/alarm.wav")
@@ -143,6 +251,7 @@ class TaskManagerApp(QMainWindow):
 		self.stop_button.setSizePolicy(size_policy)
 		self.current_time_label.setSizePolicy(size_policy)
 		self.select_alarm_button.setSizePolicy(size_policy)
+		self.history_button.setSizePolicy(size_policy)
   
 	def extract_resource_to_temp(self, resource_path):
 		# Create a QFile object for the resource
@@ -185,7 +294,7 @@ class TaskManagerApp(QMainWindow):
 			widget.setFont(dynamic_font)
 
 		# Adjust font for buttons
-		for btn in [self.add_session_button, self.clear_sessions_button, self.start_button, self.stop_button, self.select_alarm_button]:
+		for btn in [self.add_session_button, self.clear_sessions_button, self.start_button, self.stop_button, self.select_alarm_button, self.history_button]:
 			btn.setFont(dynamic_font)
 
 		# Adjust font for QListWidget items
@@ -198,39 +307,83 @@ class TaskManagerApp(QMainWindow):
 			label.setFont(QFont(self.font().family(), int(self.height() * 0.025)))
 
 
+	def use_scheduler(self, scheduler):
+		"""Show and drive `scheduler`: the daemon's through a SchedulerClient, or one kept in this window"""
+		self.scheduler = scheduler
+		scheduler.listeners.append(self.on_scheduler_event)
+		if isinstance(scheduler, SchedulerClient):
+			# The daemon records the history itself; its events are read as they arrive
+			self.daemon_notifier = QSocketNotifier(scheduler.fileno(), QSocketNotifier.Read, self)
+			self.daemon_notifier.activated.connect(self.on_daemon_readable)
+		elif self.history is not None:
+			scheduler.listeners.append(self.history.on_event)
+		self.show_sessions()
+		self.update_time()
+
+	def on_daemon_readable(self):
+		if self.scheduler.receive():
+			self.update_time()
+			return
+		# The daemon shut down: keep its sessions in this window
+		self.daemon_notifier.setEnabled(False)
+		self.daemon_notifier.deleteLater()
+		self.daemon_notifier = None
+		sessions = self.scheduler.sessions
+		self.use_scheduler(SessionScheduler())
+		for study_time, relax_time in sessions:
+			self.scheduler.add_session(study_time, relax_time)
+		self.current_time_label.setText('00:00:00')
+		self.show_non_blocking_message('Scheduler', 'The scheduler daemon has shut down. Its sessions are kept here; press Start to run them.')
+
+	def show_sessions(self):
+		self.session_list.clear()
+		for study_time, relax_time in self.scheduler.sessions:
+			self.session_list.addItem(f"Study: {study_time} | Relax: {relax_time}")
+
 	def add_session(self):
 		study_time = self.study_time_input.time().toString()
 		relax_time = self.relax_time_input.time().toString()
-		self.sessions.append((study_time, relax_time))
-		self.session_list.addItem(f"Study: {study_time} | Relax: {relax_time}")
-  
+		try:
+			self.scheduler.add_session(study_time, relax_time)
+		except (ValueError, OSError) as e:
+			QMessageBox.warning(self, 'Warning', str(e))
+
 	def clear_sessions(self):
-		self.sessions.clear()
-		self.session_list.clear()
-		self.current_session_index = -1
-		self.is_study_time = True
+		try:
+			self.scheduler.clear_sessions()
+		except (ValueError, OSError) as e:
+			QMessageBox.warning(self, 'Warning', str(e))
+			return
 		self.stop_sessions()
 
 	def start_sessions(self):
-		if not self.sessions:
-			QMessageBox.warning(self, 'Warning', 'Please add at least one session.')
+		try:
+			self.scheduler.start()
+		except (ValueError, OSError) as e:
+			QMessageBox.warning(self, 'Warning', str(e))
 			return
-		self.current_session_index = 0
-		self.is_study_time = True  # Ensure we start with study time
-		self.start_next_session(play_sound=False)
+		self.update_time()
+
+	def on_scheduler_event(self, event):
+		if event['event'] == 'sessions':
+			self.show_sessions()
+		elif event['event'] == 'start':
+			self.start_next_session(play_sound=False)
+		elif event['event'] == 'phase':
+			self.start_next_session()
+		elif event['event'] == 'done':
+			self.current_time_label.setText('00:00:00')
+			self.media_player.play()
+			self.show_non_blocking_message('Done', 'All sessions completed!')
 
 	def start_next_session(self, play_sound=True):
 		if play_sound:  # Only play sound if the flag is set
 			self.media_player.play()
-		if self.is_study_time:
-			self.current_time = QTime.fromString(self.sessions[self.current_session_index][0])
+		if self.scheduler.is_study_time:
 			self.show_non_blocking_message('Start Studying', 'Time to study!')
 		else:
-			self.current_time = QTime.fromString(self.sessions[self.current_session_index][1])
 			self.show_non_blocking_message('Relax', 'Time to relax!')
 
-		self.timer.start(1000)
-
 	def show_non_blocking_message(self, title, message):
 		msg = QMessageBox(self)
 		msg.setWindowTitle(title)
@@ -240,29 +393,46 @@ class TaskManagerApp(QMainWindow):
 		msg.show()
 
 	def update_time(self):
-		self.current_time = self.current_time.addSecs(-1)
+		"""Move on to the next phase if its deadline has passed, show the time left and schedule the next update"""
+		self.scheduler.advance()
+		if not self.scheduler.running:
+			return
+		remaining = self.scheduler.remaining()
+		# Whole seconds left, rounded up: 00:00:01 is shown until the phase is over
+		shown = math.ceil(remaining)
+		self.current_time = QTime(0, 0).addSecs(shown)
 		self.current_time_label.setText(self.current_time.toString())
 
-		if self.current_time == QTime(0, 0):
-			self.timer.stop()
-			self.is_study_time = not self.is_study_time
-			if self.is_study_time:  # If it's the end of relax time
-				self.current_session_index += 1
-			if self.current_session_index >= len(self.sessions):
-				self.media_player.play()
-				self.show_non_blocking_message('Done', 'All sessions completed!')
-				return
-			self.start_next_session()
+		if shown == 0:
+			# Deadline reached, and the daemon's next phase event not received yet
+			self.timer.setTimerType(Qt.CoarseTimer)
+			self.timer.start(COARSE_TICK_MARGIN_MS)
+		elif shown <= 1:
+			# The final wakeup, at the deadline itself
+			self.timer.setTimerType(Qt.PreciseTimer)
+			self.timer.start(math.ceil(remaining * 1000))
+		else:
+			# Until the shown second changes; a coarse timer lets the system batch the wakeups
+			self.timer.setTimerType(Qt.CoarseTimer)
+			self.timer.start(math.ceil((remaining - (shown - 1)) * 1000) + COARSE_TICK_MARGIN_MS)
 
 	def stop_sessions(self):
 		"""Stop the timer and reset the sessions."""
 		self.timer.stop()
+		try:
+			self.scheduler.stop()
+		except (ValueError, OSError) as e:
+			QMessageBox.warning(self, 'Warning', str(e))
 		self.current_time_label.setText('00:00:00')
-		self.current_session_index = -1
-		self.is_study_time = True
 		QMessageBox.information(self, 'Stopped', 'Sessions have been stopped.')
 
    
+	def show_history(self):
+		if self.history is None:
+			QMessageBox.warning(self, 'Warning', 'The session history could not be opened.')
+			return
+		HistoryDialog(self.history, self).exec_()
+
 	def select_alarm_sound(self):
 		options = QFileDialog.Options()
 		file_name, _ = QFileDialog.getOpenFileName(self, "Select Alarm Sound", "", "Audio Files (*.mp3 *.wav);;All Files (*)", options=options)
@@ -0,0 +1,198 @@
+'''
+Time Difference Benchmark - User Manual
+
+Description:
+-------------
+Compares the vectorized batch engine of `time_difference_engine.py` against a plain Python loop
+that computes the same calendar breakdown one row at a time. Start/end pairs are generated with a
+fixed random seed.
+
+Before timing, the calendar breakdown is checked against `dateutil.relativedelta` on random
+pairs biased towards month ends, leap days and short spans (skipped if dateutil is missing).
+
+Timed operations:
+  - python_loop      Parse and break down every pair in a Python loop
+  - vectorized       compute_differences() on the same strings
+  - process_file     End to end: read a CSV, compute, stream the results to disk
+
+Usage:
+-------------
+    python time_difference_benchmark.py
+    python time_difference_benchmark.py --rows 5000000 --output results.json
+    python time_difference_benchmark.py --check-pairs 1000000   # more thorough relativedelta check
+
+Dependencies:
+-------------
+Same as time_difference_engine.py: NumPy. python-dateutil for the relativedelta check.
+'''
+
+import argparse
+import calendar
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from time_difference_engine import BREAKDOWN_FIELDS, breakdown, compute_differences, process_file
+
+EPOCH = datetime(2015, 1, 1)
+MAX_DURATION_SECONDS = 3 * 365 * 86400
+# Starting points where month clipping and leap years matter
+EDGE_DATES = [datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2023, 2, 28), datetime(2000, 2, 29),
+              datetime(1900, 2, 28), datetime(2024, 3, 31, 23, 59, 59), datetime(2023, 12, 31)]
+
+
+def generate_pairs(count, seed=0):
+    """Random ISO start/end strings with durations from seconds up to a few years"""
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for _ in range(count):
+        start = EPOCH + timedelta(seconds=rng.randrange(10 * 365 * 86400))
+        end = start + timedelta(seconds=int(MAX_DURATION_SECONDS ** rng.random()))
+        starts.append(start.strftime('%Y-%m-%d %H:%M:%S'))
+        ends.append(end.strftime('%Y-%m-%d %H:%M:%S'))
+    return starts, ends
+
+
+def add_months(moment, months):
+    """moment moved forward by whole months, clipping the day to the target month's length"""
+    year, month = divmod(moment.year * 12 + moment.month - 1 + months, 12)
+    day = min(moment.day, calendar.monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+def python_loop(starts, ends):
+    """Reference implementation: the calendar breakdown, one pair at a time"""
+    results = []
+    for start, end in zip(starts, ends):
+        start, end = sorted((datetime.fromisoformat(start), datetime.fromisoformat(end)))
+        months = (end.year - start.year) * 12 + end.month - start.month
+        anchor = add_months(start, months)
+        if anchor > end:
+            months -= 1
+            anchor = add_months(start, months)
+        delta = end - anchor
+        years, months = divmod(months, 12)
+        hours, remaining = divmod(delta.seconds, 3600)
+        minutes, seconds = divmod(remaining, 60)
+        results.append((years, months, delta.days, hours, minutes, seconds))
+    return results
+
+
+def check_against_relativedelta(count, seed=0):
+    """Compare breakdown() with dateutil.relativedelta on random pairs; returns the mismatches"""
+    from dateutil.relativedelta import relativedelta
+
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            start = rng.choice(EDGE_DATES) + timedelta(seconds=rng.randrange(-3 * 86400, 3 * 86400))
+        else:
+            start = datetime(1, 1, 1) + timedelta(seconds=rng.randrange(9000 * 365 * 86400))
+        if rng.random() < 0.2:
+            end = start + relativedelta(months=rng.randrange(120), seconds=rng.randrange(-60, 60))
+        else:
+            end = start + timedelta(seconds=int(1e10 ** rng.random()))
+        starts.append(start)
+        ends.append(min(end, datetime(9999, 12, 31)))
+
+    parts = breakdown(np.array(starts, dtype='datetime64[s]'), np.array(ends, dtype='datetime64[s]'))
+    computed = zip(*(parts[field].tolist() for field in BREAKDOWN_FIELDS))
+    mismatches = []
+    for start, end, result in zip(starts, ends, computed):
+        start, end = sorted((start, end))
+        expected = relativedelta(end, start)
+        expected = tuple(getattr(expected, field) for field in BREAKDOWN_FIELDS)
+        if result != expected:
+            mismatches.append((start, end, expected, result))
+    return mismatches
+
+
+def time_call(func, repeat):
+    """Median wall time of `repeat` calls to func, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_benchmarks(starts, ends, repeat):
+    # Both implementations must agree before their timings mean anything
+    _, parts, _ = compute_differences(starts[:10_000], ends[:10_000])
+    vectorized = list(zip(*(parts[field].tolist() for field in BREAKDOWN_FIELDS)))
+    if vectorized != python_loop(starts[:10_000], ends[:10_000]):
+        raise AssertionError("Vectorized results differ from the Python loop")
+
+    results = {
+        'python_loop': time_call(lambda: python_loop(starts, ends), repeat),
+        'vectorized': time_call(lambda: compute_differences(starts, ends), repeat),
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        input_path = os.path.join(folder, 'pairs.csv')
+        with open(input_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['start', 'end'])
+            writer.writerows(zip(starts, ends))
+        output_path = os.path.join(folder, 'durations.csv')
+        results['process_file'] = time_call(
+            lambda: process_file(input_path, output_path, 'start', 'end'), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the batch time difference engine')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='start/end pairs to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per operation (median is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated pairs')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--check-pairs', type=int, default=100_000,
+                        help='random pairs checked against dateutil.relativedelta (0 to skip)')
+    args = parser.parse_args()
+
+    if args.check_pairs:
+        try:
+            mismatches = check_against_relativedelta(args.check_pairs, args.seed)
+        except ImportError:
+            print("python-dateutil not installed, skipping the relativedelta check.")
+        else:
+            for start, end, expected, result in mismatches[:10]:
+                print(f"MISMATCH {start} -> {end}: relativedelta {expected}, breakdown {result}")
+            if mismatches:
+                sys.exit(1)
+            print(f"Calendar breakdown matches relativedelta on {args.check_pairs:,} random pairs.")
+
+    print(f"Generating {args.rows} start/end pairs...")
+    starts, ends = generate_pairs(args.rows, args.seed)
+    results = run_benchmarks(starts, ends, args.repeat)
+
+    for name, seconds in results.items():
+        print(f"{name:>14}: {seconds * 1000:9.1f} ms  ({args.rows / seconds:12,.0f} rows/s)")
+    print(f"Vectorized speedup over the Python loop: {results['python_loop'] / results['vectorized']:.1f}x")
+
+    if args.output:
+        report = {
+            'rows': args.rows,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
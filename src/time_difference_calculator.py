@@ -16,7 +16,13 @@ Usage:
    - The application presents two date-time input fields.
    - Use these fields to select the desired date-times for comparison.
    - Alternatively, use the checkboxes labeled 'Now' to set the respective date-time to the current time. 
-     When 'Now' is selected for a date-time, it will update every second.
+     When 'Now' is selected for a date-time, it will update every second, on the second. Nothing is
+     updated while neither 'Now' box is checked or while the window is hidden or minimized.
+   - Next to each field, choose the time zone the date-time is in. 'Local time' is the system time zone.
+     Differences are real elapsed time: a span across a daylight saving change, or between two zones,
+     is computed from the actual UTC instants. Months and days are still counted on the first field's
+     wall clock, so 2024-01-31 00:00 to 2024-02-29 00:00 is 1 month in any zone; only the change of
+     UTC offset shows up in the hours. 'Now' shows the current time in the selected zone.
 
 3. Date Format:
    - Below the date-time input fields, there's an input field labeled 'Date Format'.
@@ -24,21 +30,142 @@ Usage:
    - You can modify this format as needed. For example, to only display the date, you could use "yyyy-MM-dd".
    - After changing the format in the input field, click the 'Apply Format' button to update the date-time displays.
 
-4. Calculate Difference:
+4. Business Time:
+   - Tick 'Business Time' to also count only working time between the two date-times, e.g. for billing.
+   - 'Days' lists the working days (e.g. "Mon-Fri" or "Mon-Thu,Sat"), 'Hours' the daily working hours
+     (e.g. "09:00-17:00"), and 'Holidays' an optional text file with one date (YYYY-MM-DD) per line.
+   - Working time follows the wall clock of each field. It is shown in hours, and in working days of
+     the configured length.
+
+5. Calculate Difference:
    - Press the "Calculate Difference" button located below the date-time input fields.
    - The application will compute and display the difference between the two times in terms of years, 
      months, days, hours, minutes, and seconds.
 
+6. Batch:
+   - The 'Batch' tab computes differences for every row of a CSV or delimited log file, e.g. job logs
+     with millions of start/end pairs.
+   - Choose the input file and the output CSV, and enter the start and end columns (header name or
+     zero-based index) and, if the timestamps carry no offset of their own, their time zones.
+     Timestamps are read in the format of the 'Date Format' field; ISO 8601 timestamps are parsed fastest.
+   - Tick 'Business time column' to add the working seconds of each row, using the business time
+     settings of the 'Difference' tab.
+   - Press 'Run Batch'. The file is processed in chunks in the background, and the results are written
+     to the output file as they are computed.
+   - The same engine can be run without the GUI: python time_difference_engine.py --help
+   - 'Statistics' summarizes the durations of the input file instead (count, mean, percentiles and a
+     histogram) without writing an output file. Large logs are split into chunks and processed on all
+     cores in constant memory; see duration_stats.py, which also runs on its own.
+   - 'Intervals' treats the rows as intervals, e.g. job runs, and reports the total time covered by at
+     least one of them, the gaps in between, the time during which they overlap and the most running at
+     once. interval_analysis.py, run on its own, also writes the merged stretches, the gaps and the
+     overlaps of every row to CSV files.
+
 Note:
 -----
-- The application uses a simple heuristic to determine months and years from days (30 days to a month, 365 days to a year). 
-  This means the calculated months and years might not always match calendar months and years, but it provides a general idea.
+- Years and months are calendar exact: leap years and month lengths are taken into account. Whole months are
+  counted first, landing on the last day of a shorter month: 2024-01-31 to 2024-02-29 is 1 month, and
+  2024-01-31 to 2024-03-01 is 1 month and 1 day.
+- The calculations come from time_difference_engine.py, shipped alongside this script, which requires NumPy.
 
 """
 
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo, available_timezones
+
+import numpy as np
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-                             QLineEdit, QWidget, QDateTimeEdit, QCheckBox)
-from PyQt5.QtCore import QTimer, QDateTime
+                             QLineEdit, QWidget, QDateTimeEdit, QCheckBox, QTabWidget, QFileDialog,
+                             QFormLayout, QComboBox)
+from PyQt5.QtCore import QTimer, QDateTime, QThread, pyqtSignal, Qt, QEvent
+
+from duration_stats import file_duration_stats, format_duration
+from interval_analysis import analyze_file
+from business_time import DEFAULT_HOURS, DEFAULT_WORKDAYS, BusinessCalendar, load_holidays
+from time_difference_engine import breakdown, process_file, to_utc
+
+# 'Now' ticks land this long after each wall-clock second, so the new second is always shown
+NOW_TICK_MARGIN_MS = 5
+
+
+class BatchWorker(QThread):
+    """Runs the batch engine off the UI thread"""
+    progress = pyqtSignal(int)
+    finished_batch = pyqtSignal(int, float)
+    failed = pyqtSignal(str)
+
+    def __init__(self, input_path, output_path, start_column, end_column, date_format, start_zone, end_zone,
+                 business):
+        super().__init__()
+        self.input_path = input_path
+        self.output_path = output_path
+        self.start_column = start_column
+        self.end_column = end_column
+        self.date_format = date_format
+        self.start_zone = start_zone
+        self.end_zone = end_zone
+        self.business = business
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            rows = process_file(self.input_path, self.output_path, self.start_column, self.end_column,
+                                self.date_format, progress=self.progress.emit,
+                                start_zone=self.start_zone, end_zone=self.end_zone, business=self.business)
+            self.finished_batch.emit(rows, time.perf_counter() - start)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class StatsWorker(QThread):
+    """Runs the streaming duration statistics off the UI thread"""
+    progress = pyqtSignal(float)
+    finished_stats = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, input_path, start_column, end_column, date_format, start_zone, end_zone):
+        super().__init__()
+        self.input_path = input_path
+        self.start_column = start_column
+        self.end_column = end_column
+        self.date_format = date_format
+        self.start_zone = start_zone
+        self.end_zone = end_zone
+
+    def run(self):
+        try:
+            stats = file_duration_stats(self.input_path, self.start_column, self.end_column,
+                                        self.date_format, progress=self.progress.emit,
+                                        start_zone=self.start_zone, end_zone=self.end_zone)
+            self.finished_stats.emit(stats.summary())
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class IntervalWorker(QThread):
+    """Runs the interval union/overlap analysis off the UI thread"""
+    progress = pyqtSignal(int)
+    finished_intervals = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, input_path, start_column, end_column, date_format, start_zone, end_zone):
+        super().__init__()
+        self.input_path = input_path
+        self.start_column = start_column
+        self.end_column = end_column
+        self.date_format = date_format
+        self.start_zone = start_zone
+        self.end_zone = end_zone
+
+    def run(self):
+        try:
+            summary = analyze_file(self.input_path, self.start_column, self.end_column, self.date_format,
+                                   progress=self.progress.emit, start_zone=self.start_zone, end_zone=self.end_zone)
+            self.finished_intervals.emit(summary)
+        except Exception as e:
+            self.failed.emit(str(e))
+
 
 class TimeDifferenceCalculator(QMainWindow):
     def __init__(self):
@@ -47,48 +174,86 @@ class TimeDifferenceCalculator(QMainWindow):
 
     def init_ui(self):
         self.setWindowTitle('Time Difference Calculator')
+        self.zone_names = sorted(available_timezones())
 
         # Create widgets
         self.datetime1_input = QDateTimeEdit(self)
         self.datetime1_input.setDateTime(QDateTime.currentDateTime())
         self.datetime1_now_checkbox = QCheckBox("Now", self)
         self.datetime1_now_checkbox.toggled.connect(self.toggle_now_datetime1)
+        self.datetime1_zone = self.create_zone_combo('Local time')
+        self.datetime1_zone.currentIndexChanged.connect(self.on_zone_changed)
 
         self.datetime2_input = QDateTimeEdit(self)
         self.datetime2_input.setDateTime(QDateTime.currentDateTime())
         self.datetime2_now_checkbox = QCheckBox("Now", self)
         self.datetime2_now_checkbox.toggled.connect(self.toggle_now_datetime2)
+        self.datetime2_zone = self.create_zone_combo('Local time')
+        self.datetime2_zone.currentIndexChanged.connect(self.on_zone_changed)
 
         self.calculate_button = QPushButton('Calculate Difference', self)
         self.calculate_button.clicked.connect(self.calculate_difference)
 
         self.result_label = QLabel('', self)
 
+        self.business_checkbox = QCheckBox('Business Time', self)
+        self.business_checkbox.toggled.connect(self.calculate_difference)
+        self.business_days_input = QLineEdit(DEFAULT_WORKDAYS, self)
+        self.business_hours_input = QLineEdit(DEFAULT_HOURS, self)
+        self.holidays_input = QLineEdit(self)
+        self.holidays_input.setPlaceholderText('Holidays file (optional)')
+        holidays_button = QPushButton('Browse...', self)
+        holidays_button.clicked.connect(self.choose_holidays)
+        # Calendar built from the settings above, rebuilt only when they change
+        self.business_settings = None
+        self.business = None
+
         # Layouts
         datetime1_layout = QHBoxLayout()
         datetime1_layout.addWidget(QLabel('Date-Time 1:'))
         datetime1_layout.addWidget(self.datetime1_input)
+        datetime1_layout.addWidget(self.datetime1_zone)
         datetime1_layout.addWidget(self.datetime1_now_checkbox)
 
         datetime2_layout = QHBoxLayout()
         datetime2_layout.addWidget(QLabel('Date-Time 2:'))
         datetime2_layout.addWidget(self.datetime2_input)
+        datetime2_layout.addWidget(self.datetime2_zone)
         datetime2_layout.addWidget(self.datetime2_now_checkbox)
 
+        business_layout = QHBoxLayout()
+        business_layout.addWidget(self.business_checkbox)
+        business_layout.addWidget(QLabel('Days:'))
+        business_layout.addWidget(self.business_days_input)
+        business_layout.addWidget(QLabel('Hours:'))
+        business_layout.addWidget(self.business_hours_input)
+        business_layout.addWidget(self.holidays_input)
+        business_layout.addWidget(holidays_button)
+
         main_layout = QVBoxLayout()
         main_layout.addLayout(datetime1_layout)
         main_layout.addLayout(datetime2_layout)
+        main_layout.addLayout(business_layout)
         main_layout.addWidget(self.calculate_button)
         main_layout.addWidget(self.result_label)
 
-        central_widget = QWidget()
-        central_widget.setLayout(main_layout)
-        self.setCentralWidget(central_widget)
+        calculator_widget = QWidget()
+        calculator_widget.setLayout(main_layout)
 
-        # Timer to update every second
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_now)
-        self.timer.start(1000)
+        self.tabs = QTabWidget(self)
+        self.tabs.addTab(calculator_widget, 'Difference')
+        self.tabs.addTab(self.create_batch_tab(), 'Batch')
+        self.setCentralWidget(self.tabs)
+
+        # Single-shot timer, re-armed for the next second only while a 'Now' field is shown.
+        # A precise timer, since coarse ones may fire up to 5% early, before the second has changed.
+        self.now_timer = QTimer(self)
+        self.now_timer.setSingleShot(True)
+        self.now_timer.setTimerType(Qt.PreciseTimer)
+        self.now_timer.timeout.connect(self.on_now_tick)
+        # Last breakdown as (earlier, later, parts) and last business time as (inputs, text)
+        self.last_difference = None
+        self.last_business = None
         
                 # Add widget for date format selection
         self.date_format_input = QLineEdit(self)
@@ -102,45 +267,313 @@ class TimeDifferenceCalculator(QMainWindow):
         format_layout.addWidget(self.date_format_input)
         format_layout.addWidget(self.apply_format_button)
         
-        main_layout = self.centralWidget().layout()
         main_layout.insertLayout(2, format_layout)
 
+    def create_zone_combo(self, no_zone_text):
+        # The first entry stands for "no explicit zone" and maps to None
+        combo = QComboBox(self)
+        combo.addItem(no_zone_text)
+        combo.addItems(self.zone_names)
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.NoInsert)
+        return combo
+
+    def zone_of(self, combo):
+        name = combo.currentText()
+        return name if combo.currentIndex() > 0 and name in self.zone_names else None
+
+    def create_batch_tab(self):
+        self.batch_worker = None
+        self.stats_worker = None
+        self.interval_worker = None
+        self.batch_input = QLineEdit(self)
+        batch_input_button = QPushButton('Browse...', self)
+        batch_input_button.clicked.connect(self.choose_batch_input)
+        self.batch_output = QLineEdit(self)
+        batch_output_button = QPushButton('Browse...', self)
+        batch_output_button.clicked.connect(self.choose_batch_output)
+        self.batch_start_column = QLineEdit('start', self)
+        self.batch_end_column = QLineEdit('end', self)
+        self.batch_start_zone = self.create_zone_combo('No time zone')
+        self.batch_end_zone = self.create_zone_combo('No time zone')
+        self.batch_run_button = QPushButton('Run Batch', self)
+        self.batch_run_button.clicked.connect(self.run_batch)
+        self.batch_business_checkbox = QCheckBox('Business time column', self)
+        self.batch_stats_button = QPushButton('Statistics', self)
+        self.batch_stats_button.clicked.connect(self.run_stats)
+        self.batch_intervals_button = QPushButton('Intervals', self)
+        self.batch_intervals_button.clicked.connect(self.run_intervals)
+        self.batch_status_label = QLabel('', self)
+
+        input_layout = QHBoxLayout()
+        input_layout.addWidget(self.batch_input)
+        input_layout.addWidget(batch_input_button)
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(self.batch_output)
+        output_layout.addWidget(batch_output_button)
+
+        form_layout = QFormLayout()
+        form_layout.addRow('Input File:', input_layout)
+        form_layout.addRow('Output CSV:', output_layout)
+        form_layout.addRow('Start Column:', self.batch_start_column)
+        form_layout.addRow('End Column:', self.batch_end_column)
+        form_layout.addRow('Start Zone:', self.batch_start_zone)
+        form_layout.addRow('End Zone:', self.batch_end_zone)
+        form_layout.addRow('', self.batch_business_checkbox)
+
+        batch_layout = QVBoxLayout()
+        batch_layout.addLayout(form_layout)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.batch_run_button)
+        buttons_layout.addWidget(self.batch_stats_button)
+        buttons_layout.addWidget(self.batch_intervals_button)
+        batch_layout.addLayout(buttons_layout)
+        batch_layout.addWidget(self.batch_status_label)
+        batch_layout.addStretch()
+
+        batch_widget = QWidget()
+        batch_widget.setLayout(batch_layout)
+        return batch_widget
+
+    def choose_batch_input(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Open Timestamp File', '', 'CSV and Log Files (*.csv *.log *.txt);;All Files (*)')
+        if path:
+            self.batch_input.setText(path)
+            if not self.batch_output.text():
+                self.batch_output.setText(path.rsplit('.', 1)[0] + '_durations.csv')
+
+    def choose_batch_output(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Save Results', self.batch_output.text(), 'CSV Files (*.csv)')
+        if path:
+            self.batch_output.setText(path)
+
+    def run_batch(self):
+        if not self.batch_input.text() or not self.batch_output.text():
+            self.batch_status_label.setText('Choose an input file and an output file first.')
+            return
+        business = None
+        if self.batch_business_checkbox.isChecked():
+            try:
+                business = self.business_calendar()
+            except (OSError, ValueError) as e:
+                self.batch_status_label.setText(f'Business time settings: {e}')
+                return
+        self.batch_run_button.setEnabled(False)
+        self.batch_status_label.setText('Processing...')
+        self.batch_worker = BatchWorker(self.batch_input.text(), self.batch_output.text(),
+                                        self.batch_start_column.text(), self.batch_end_column.text(),
+                                        self.date_format_input.text(),
+                                        self.zone_of(self.batch_start_zone), self.zone_of(self.batch_end_zone),
+                                        business)
+        self.batch_worker.progress.connect(self.on_batch_progress)
+        self.batch_worker.finished_batch.connect(self.on_batch_finished)
+        self.batch_worker.failed.connect(self.on_batch_failed)
+        self.batch_worker.start()
+
+    def on_batch_progress(self, rows):
+        self.batch_status_label.setText(f'Processed {rows:,} rows...')
+
+    def on_batch_finished(self, rows, elapsed):
+        self.batch_run_button.setEnabled(True)
+        self.batch_status_label.setText(f'Done: {rows:,} rows in {elapsed:.1f} s, written to {self.batch_output.text()}')
+
+    def on_batch_failed(self, message):
+        self.batch_run_button.setEnabled(True)
+        self.batch_stats_button.setEnabled(True)
+        self.batch_intervals_button.setEnabled(True)
+        self.batch_status_label.setText(f'Batch failed: {message}')
+
+    def run_stats(self):
+        if not self.batch_input.text():
+            self.batch_status_label.setText('Choose an input file first.')
+            return
+        self.batch_stats_button.setEnabled(False)
+        self.batch_status_label.setText('Computing statistics...')
+        self.stats_worker = StatsWorker(self.batch_input.text(), self.batch_start_column.text(),
+                                        self.batch_end_column.text(), self.date_format_input.text(),
+                                        self.zone_of(self.batch_start_zone), self.zone_of(self.batch_end_zone))
+        self.stats_worker.progress.connect(self.on_stats_progress)
+        self.stats_worker.finished_stats.connect(self.on_stats_finished)
+        self.stats_worker.failed.connect(self.on_batch_failed)
+        self.stats_worker.start()
+
+    def on_stats_progress(self, fraction):
+        self.batch_status_label.setText(f'Computing statistics... {fraction:.0%}')
+
+    def on_stats_finished(self, summary):
+        self.batch_stats_button.setEnabled(True)
+        lines = [f"Rows: {summary['count']:,} ({summary['invalid']:,} skipped)"]
+        for name in ('mean', 'min', 'max'):
+            lines.append(f"{name.capitalize()}: {format_duration(summary[name])}")
+        lines.append(', '.join(f"{name}: {format_duration(value)}" for name, value in summary['quantiles'].items()))
+        lines += [f"{label}: {count:,}" for label, count in summary['histogram'].items()]
+        self.batch_status_label.setText('\n'.join(lines))
+
+    def run_intervals(self):
+        if not self.batch_input.text():
+            self.batch_status_label.setText('Choose an input file first.')
+            return
+        self.batch_intervals_button.setEnabled(False)
+        self.batch_status_label.setText('Analyzing intervals...')
+        self.interval_worker = IntervalWorker(self.batch_input.text(), self.batch_start_column.text(),
+                                              self.batch_end_column.text(), self.date_format_input.text(),
+                                              self.zone_of(self.batch_start_zone), self.zone_of(self.batch_end_zone))
+        self.interval_worker.progress.connect(self.on_intervals_progress)
+        self.interval_worker.finished_intervals.connect(self.on_intervals_finished)
+        self.interval_worker.failed.connect(self.on_batch_failed)
+        self.interval_worker.start()
+
+    def on_intervals_progress(self, rows):
+        self.batch_status_label.setText(f'Analyzing intervals... {rows:,} rows read')
+
+    def on_intervals_finished(self, summary):
+        self.batch_intervals_button.setEnabled(True)
+        lines = [f"Intervals: {summary['intervals']:,} ({summary['invalid']:,} skipped)"]
+        if summary['intervals']:
+            lines += [f"Span: {summary['first_start']} to {summary['last_end']}",
+                      f"Covered: {format_duration(summary['union_seconds'])} in {summary['stretches']:,} stretches",
+                      f"Overlap: {format_duration(summary['overlap_seconds'])}",
+                      f"Gaps: {summary['gaps']:,}, {format_duration(summary['gap_seconds'])} in total",
+                      f"Most active at once: {summary['max_concurrency']:,} at {summary['max_concurrency_at']}"]
+        self.batch_status_label.setText('\n'.join(lines))
+
+    def choose_holidays(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Open Holidays File', '', 'Text Files (*.txt *.csv);;All Files (*)')
+        if path:
+            self.holidays_input.setText(path)
+            self.calculate_difference()
+
+    def business_calendar(self):
+        # Rebuilt only when the settings change, so the 'Now' updates do not re-read the holidays file
+        settings = (self.business_days_input.text(), self.business_hours_input.text(), self.holidays_input.text())
+        if settings != self.business_settings:
+            workdays, hours, holidays_path = settings
+            holidays = load_holidays(holidays_path) if holidays_path else ()
+            self.business = BusinessCalendar(workdays, hours, holidays)
+            self.business_settings = settings
+        return self.business
+
+    def current_datetime(self, zone_combo):
+        # Current wall-clock time in the zone selected for a field
+        zone = self.zone_of(zone_combo)
+        if zone is None:
+            return QDateTime.currentDateTime()
+        return QDateTime(datetime.now(ZoneInfo(zone)).replace(tzinfo=None))
+
     def toggle_now_datetime1(self, checked):
         self.datetime1_input.setDisabled(checked)
         if checked:
-            self.datetime1_input.setDateTime(QDateTime.currentDateTime())
+            self.update_now()
+        self.schedule_now()
 
     def toggle_now_datetime2(self, checked):
         self.datetime2_input.setDisabled(checked)
         if checked:
-            self.datetime2_input.setDateTime(QDateTime.currentDateTime())
+            self.update_now()
+        self.schedule_now()
+
+    def schedule_now(self):
+        # Wake up just after the next wall-clock second, and only while a 'Now' field can be seen
+        now_checked = self.datetime1_now_checkbox.isChecked() or self.datetime2_now_checkbox.isChecked()
+        if now_checked and self.isVisible() and not self.isMinimized():
+            self.now_timer.start(1000 - QDateTime.currentMSecsSinceEpoch() % 1000 + NOW_TICK_MARGIN_MS)
+        else:
+            self.now_timer.stop()
+
+    def on_now_tick(self):
+        self.update_now()
+        self.schedule_now()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 'Now' fields went stale while hidden
+        self.update_now()
+        self.schedule_now()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.now_timer.stop()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if not self.isMinimized():
+                self.update_now()
+            self.schedule_now()
+
+    def on_zone_changed(self):
+        self.update_now()
 
     def update_now(self):
         # Update the input fields to "now" if the corresponding checkbox is checked
         if self.datetime1_now_checkbox.isChecked():
-            self.datetime1_input.setDateTime(QDateTime.currentDateTime())
+            self.datetime1_input.setDateTime(self.current_datetime(self.datetime1_zone))
         if self.datetime2_now_checkbox.isChecked():
-            self.datetime2_input.setDateTime(QDateTime.currentDateTime())
+            self.datetime2_input.setDateTime(self.current_datetime(self.datetime2_zone))
 
         # Recalculate difference
         self.calculate_difference()
 
+    def utc_instant(self, datetime_input, zone_combo):
+        # The field's wall-clock value, read in its zone, as a UTC datetime64
+        zone = self.zone_of(zone_combo)
+        if zone is None:
+            # Qt applies the system time zone, daylight saving included
+            return np.datetime64(datetime_input.dateTime().toSecsSinceEpoch(), 's')
+        return to_utc(np.datetime64(datetime_input.dateTime().toPyDateTime(), 's'), zone)
+
     def calculate_difference(self):
-        dt1 = self.datetime1_input.dateTime().toPyDateTime()
-        dt2 = self.datetime2_input.dateTime().toPyDateTime()
+        instant1 = self.utc_instant(self.datetime1_input, self.datetime1_zone)
+        instant2 = self.utc_instant(self.datetime2_input, self.datetime2_zone)
 
-        if dt1 > dt2:
-            dt1, dt2 = dt2, dt1
+        # Calendar parts on the first field's wall clock; the instants only give the elapsed time
+        wall1 = np.datetime64(self.datetime1_input.dateTime().toPyDateTime(), 's')
+        parts = self.difference_parts(wall1, wall1 + (instant2 - instant1))
+        years, months, days = parts['years'], parts['months'], parts['days']
+        hours, minutes, seconds = parts['hours'], parts['minutes'], parts['seconds']
 
-        delta = dt2 - dt1
+        result_str = f"Years: {years}, Months: {months}, Days: {days}, Hours: {hours}, Minutes: {minutes}, Seconds: {seconds}"
+        if self.business_checkbox.isChecked():
+            result_str += '\n' + self.business_difference()
+        if result_str != self.result_label.text():
+            self.result_label.setText(result_str)
 
-        years, days = divmod(delta.days, 365)
-        months, days = divmod(days, 30)
-        hours, remainder = divmod(delta.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
+    def difference_parts(self, wall1, wall2):
+        # Same calendar breakdown as batch mode, between the first field's wall-clock value and that
+        # value moved by the elapsed time (earlier one first).
+        # When only the later value moved forward and the seconds field does not wrap, as on most
+        # 'Now' ticks, no month, day, hour or minute can have changed: only the seconds are updated.
+        # A moving earlier value is always recomputed, since month-end clipping depends on its date.
+        earlier, later = sorted((int(wall1.astype(np.int64)), int(wall2.astype(np.int64))))
+        if self.last_difference is not None:
+            last_earlier, last_later, parts = self.last_difference
+            moved_later = later - last_later
+            if earlier == last_earlier and moved_later >= 0:
+                seconds = parts['seconds'] + moved_later
+                if seconds < 60:
+                    parts = dict(parts, seconds=seconds)
+                    self.last_difference = (earlier, later, parts)
+                    return parts
+        parts = {field: int(value) for field, value in breakdown(wall1, wall2).items()}
+        self.last_difference = (earlier, later, parts)
+        return parts
 
-        result_str = f"Years: {years}, Months: {months}, Days: {days}, Hours: {hours}, Minutes: {minutes}, Seconds: {seconds}"
-        self.result_label.setText(result_str)
+    def business_difference(self):
+        try:
+            business = self.business_calendar()
+        except (OSError, ValueError) as e:
+            return f"Business time: {e}"
+        # Working hours follow the wall clock of each field
+        dt1 = np.datetime64(self.datetime1_input.dateTime().toPyDateTime(), 's')
+        dt2 = np.datetime64(self.datetime2_input.dateTime().toPyDateTime(), 's')
+        inputs = (dt1, dt2, business)
+        if self.last_business is None or self.last_business[0] != inputs:
+            working = abs(int(business.working_seconds(dt1, dt2)))
+            hours, remainder = divmod(working, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            self.last_business = (inputs, f"Business time: {hours}h {minutes}m {seconds}s "
+                                          f"({working / business.seconds_per_day:.2f} working days)")
+        return self.last_business[1]
         
     def apply_date_format(self):
         date_format = self.date_format_input.text()
@@ -0,0 +1,474 @@
+'''
+time_difference_engine.py
+
+Description:
+    Qt-free batch engine behind the "Batch" tab of `time_difference_calculator.py`. Start and end
+    timestamps are read from a CSV or delimited log file in chunks and parsed into NumPy
+    `datetime64` arrays. Differences and their years/months/days/hours/minutes/seconds breakdown
+    are computed for a whole chunk at once, and the results are streamed to the output file chunk
+    by chunk, so millions of rows run in bounded memory.
+
+    The breakdown is calendar exact, as `dateutil.relativedelta` computes it: whole months are
+    counted first (landing on the same day of the month, or the month's last day if it is
+    shorter) and the remainder is split into days, hours, minutes and seconds. Leap years and
+    month lengths come from a table of month start days built once at import, so each pair
+    costs a few table lookups rather than date arithmetic.
+
+    Timestamps are naive wall-clock times unless a time zone is given for the start or end
+    column. Zoned timestamps are converted to UTC before subtracting, so spans across a DST change
+    or between zones come out as the real elapsed time. The calendar breakdown still follows the
+    wall clock: months and days are counted from the start's local date, and only the change of
+    UTC offset between the two timestamps is carried into the hours (2024-01-31 00:00 to
+    2024-02-29 00:00 in Europe/Berlin is 1 month, not 29 days between the UTC instants). Each zone's UTC offsets are probed from `zoneinfo` once into a transition
+    table (cached per zone), and whole arrays are converted with one binary search per value
+    instead of a zoneinfo call per timestamp.
+
+    With a `BusinessCalendar` (see business_time.py) an extra business_seconds column counts only
+    working time, following the wall clock of each timestamp.
+
+    Timestamps in ISO 8601 form ("2024-05-01 13:45:00", "2024-05-01T13:45") are parsed by NumPy
+    directly. Other layouts can be given as a Qt display format, the same syntax as the
+    calculator's 'Date Format' field (for example "dd.MM.yyyy HH:mm:ss"). Rows whose timestamps
+    cannot be parsed are written with empty result columns.
+
+Usage:
+    python time_difference_engine.py jobs.csv durations.csv --start started_at --end finished_at
+    python time_difference_engine.py jobs.log durations.csv --start 0 --end 1 --delimiter '\t'
+    python time_difference_engine.py jobs.csv durations.csv --format "dd.MM.yyyy HH:mm:ss"
+    python time_difference_engine.py jobs.csv durations.csv --start-zone Europe/Berlin --end-zone UTC
+    python time_difference_engine.py jobs.csv durations.csv --business --hours 08:00-16:30 --holidays holidays.txt
+
+    from time_difference_engine import compute_differences, process_file
+
+    total_seconds, parts, valid = compute_differences(starts, ends)
+    rows = process_file('jobs.csv', 'durations.csv', 'started_at', 'finished_at')
+
+    Columns are given by header name or zero-based index. The output has the columns
+    start, end, total_seconds, years, months, days, hours, minutes, seconds (and business_seconds).
+
+Dependencies:
+    - NumPy
+    - A time zone database for zoneinfo (built into Linux and macOS; `pip install tzdata` on Windows)
+'''
+
+import argparse
+import calendar
+import csv
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from business_time import DEFAULT_HOURS, DEFAULT_WORKDAYS, BusinessCalendar, load_holidays
+
+CHUNK_ROWS = 100_000
+DATETIME_UNIT = 's'
+DATETIME_DTYPE = f'datetime64[{DATETIME_UNIT}]'
+BREAKDOWN_FIELDS = ('years', 'months', 'days', 'hours', 'minutes', 'seconds')
+OUTPUT_FIELDS = ('start', 'end', 'total_seconds') + BREAKDOWN_FIELDS
+BUSINESS_FIELD = 'business_seconds'
+
+# Days since 1970-01-01 of the first day of each month, 0001-01 up to and including 10000-01
+FIRST_TABLE_MONTH = np.datetime64('0001-01', 'M')
+MONTH_START_DAYS = np.arange(FIRST_TABLE_MONTH, np.datetime64('9999-12', 'M') + 2).astype('datetime64[D]').astype(np.int64)
+MONTH_TABLE_OFFSET = FIRST_TABLE_MONTH.astype(np.int64)
+
+# Years probed for zone offset transitions; outside them the nearest known offset applies
+TRANSITION_YEARS = (1900, 2100)
+# Offsets are sampled once per probe step; changes in between are bisected to the second
+TRANSITION_PROBE_SECONDS = 86400
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Qt display formats NumPy can parse natively
+ISO_QT_FORMATS = {'yyyy-MM-dd HH:mm:ss', "yyyy-MM-dd'T'HH:mm:ss", 'yyyy-MM-dd HH:mm', 'yyyy-MM-dd'}
+# Qt format tokens as (token, field, regex), longest token first so "yyyy" wins over "yy"
+QT_FORMAT_TOKENS = [
+    ('yyyy', 'year', r'\d{4}'), ('yy', 'short_year', r'\d{2}'),
+    ('MMMM', 'month_name', r'[^\W\d_]+'), ('MMM', 'month_name', r'[^\W\d_]{3}'),
+    ('MM', 'month', r'\d{2}'), ('M', 'month', r'\d{1,2}'),
+    ('dddd', None, r'[^\W\d_]+'), ('ddd', None, r'[^\W\d_]{3}'), ('dd', 'day', r'\d{2}'), ('d', 'day', r'\d{1,2}'),
+    ('HH', 'hour', r'\d{2}'), ('H', 'hour', r'\d{1,2}'), ('hh', 'hour', r'\d{2}'), ('h', 'hour', r'\d{1,2}'),
+    ('mm', 'minute', r'\d{2}'), ('m', 'minute', r'\d{1,2}'), ('ss', 'second', r'\d{2}'), ('s', 'second', r'\d{1,2}'),
+    ('zzz', 'millisecond', r'\d{3}'), ('z', 'millisecond', r'\d{1,3}'),
+    ('AP', 'ampm', r'[AaPp][Mm]'), ('ap', 'ampm', r'[AaPp][Mm]'),
+]
+MONTH_NAMES = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTH_NAMES.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+
+
+FIXED_WIDTH_FIELDS = {'year', 'short_year', 'month', 'day', 'hour', 'minute', 'second', 'millisecond'}
+
+
+class CompiledFormat:
+    """
+    A Qt date-time display format, as typed into 'Date Format', compiled once for parsing many
+    timestamps. Formats made of fixed-width numeric fields (yyyy, MM, dd, HH, mm, ss, zzz and
+    literals) are parsed as a byte matrix with array arithmetic. Other formats are matched with a
+    regular expression, and the matched fields are still combined into datetime64 values per chunk
+    rather than through strptime for every timestamp.
+    """
+
+    def __init__(self, qt_format):
+        self.qt_format = qt_format
+        self.fields = []
+        pattern = []
+        # (offset, width, field) for fixed-width fields and (offset, byte) for literals
+        self.fixed_fields, self.fixed_literals = [], []
+        offset = 0
+        i = 0
+        while i < len(qt_format):
+            if qt_format[i] == "'":
+                # Quoted literal text; '' is a literal quote
+                end = qt_format.find("'", i + 1)
+                end = len(qt_format) if end == -1 else end
+                literal = qt_format[i + 1:end] or "'"
+                pattern.append(re.escape(literal))
+                offset = self._add_literal(literal, offset)
+                i = end + 1
+                continue
+            for token, field, regex in QT_FORMAT_TOKENS:
+                if qt_format.startswith(token, i):
+                    if field is None or field in self.fields:
+                        pattern.append(f'(?:{regex})')
+                        offset = None
+                    else:
+                        pattern.append(f'({regex})')
+                        self.fields.append(field)
+                        fixed = field in FIXED_WIDTH_FIELDS and regex.endswith('}') and ',' not in regex
+                        if offset is not None and fixed:
+                            self.fixed_fields.append((offset, len(token), field))
+                            offset += len(token)
+                        else:
+                            offset = None
+                    i += len(token)
+                    break
+            else:
+                pattern.append(re.escape(qt_format[i]))
+                offset = self._add_literal(qt_format[i], offset)
+                i += 1
+        self.regex = re.compile(''.join(pattern))
+        # Total width of a fixed-width format, None when some field has a variable width
+        self.width = offset
+
+    def _add_literal(self, text, offset):
+        if offset is None or not text.isascii():
+            return None
+        for char in text.encode('ascii'):
+            self.fixed_literals.append((offset, char))
+            offset += 1
+        return offset
+
+    def parse(self, values):
+        """Parse a sequence of strings into a datetime64 array; values that do not match become NaT"""
+        if self.width:
+            try:
+                fields, valid = self._fixed_width_fields(values)
+            except UnicodeEncodeError:
+                fields, valid = self._regex_fields(values)
+        else:
+            fields, valid = self._regex_fields(values)
+        return self._to_datetime64(fields, valid, len(values))
+
+    def _fixed_width_fields(self, values):
+        # One byte longer than the format, so longer values fail the length check
+        data = np.array(values, dtype=f'S{self.width + 1}')
+        valid = np.char.str_len(data) == self.width
+        matrix = data.view(np.uint8).reshape(len(values), self.width + 1).astype(np.int64)
+        for position, char in self.fixed_literals:
+            valid &= matrix[:, position] == char
+        fields = {}
+        for position, width, field in self.fixed_fields:
+            digits = matrix[:, position:position + width] - ord('0')
+            valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+            fields[field] = digits @ (10 ** np.arange(width - 1, -1, -1))
+        return fields, valid
+
+    def _regex_fields(self, values):
+        match = self.regex.fullmatch
+        default = ('0',) * len(self.fields)
+        matched = [match(value) for value in values]
+        valid = np.array([m is not None for m in matched], dtype=bool)
+        columns = dict(zip(self.fields, zip(*[m.groups() if m else default for m in matched])))
+        fields = {}
+        for field, column in columns.items():
+            if field == 'month_name':
+                fields['month'] = np.array([MONTH_NAMES.get(name.lower(), 0) for name in column], dtype=np.int64)
+            elif field == 'ampm':
+                fields['pm'] = np.array([text[0] in 'Pp' for text in column], dtype=bool)
+            else:
+                fields[field] = np.fromiter(map(int, column), dtype=np.int64, count=len(column))
+        return fields, valid
+
+    def _to_datetime64(self, fields, valid, count):
+        def field(name, missing):
+            return fields[name] if name in fields else np.full(count, missing, dtype=np.int64)
+
+        year = field('year', 1900)
+        if 'short_year' in fields:
+            # Two-digit years as strptime reads them: 69-99 -> 1969-1999, 00-68 -> 2000-2068
+            year = np.where(fields['short_year'] < 69, 2000, 1900) + fields['short_year']
+        month = field('month', 1)
+        day = field('day', 1)
+        hour = field('hour', 0)
+        if 'pm' in fields:
+            hour = hour % 12 + np.where(fields['pm'], 12, 0)
+        minute = field('minute', 0)
+        second = field('second', 0)
+
+        valid = valid & (year >= 1) & (year <= 9999) & (month >= 1) & (month <= 12)
+        month_index = np.where(valid, (year - 1) * 12 + month - 1, 0)
+        month_length = MONTH_START_DAYS[month_index + 1] - MONTH_START_DAYS[month_index]
+        valid &= (day >= 1) & (day <= month_length) & (hour < 24) & (minute < 60) & (second < 60)
+
+        seconds = (MONTH_START_DAYS[month_index] + day - 1) * 86400 + hour * 3600 + minute * 60 + second
+        parsed = seconds.astype(DATETIME_DTYPE)
+        parsed[~valid] = np.datetime64('NaT')
+        return parsed
+
+
+_compiled_formats = {}
+
+
+def compile_format(qt_format):
+    """Cached CompiledFormat for a Qt format string"""
+    compiled = _compiled_formats.get(qt_format)
+    if compiled is None:
+        compiled = _compiled_formats[qt_format] = CompiledFormat(qt_format)
+    return compiled
+
+
+def parse_timestamps(values, date_format=None):
+    """Parse a sequence of timestamp strings into a datetime64 array; unparseable values become NaT"""
+    if date_format is not None and date_format not in ISO_QT_FORMATS:
+        return compile_format(date_format).parse(values)
+    try:
+        return np.array(values, dtype=DATETIME_DTYPE)
+    except ValueError:
+        pass  # Some values are malformed; parse one by one so only those become NaT
+    parsed = np.empty(len(values), dtype=DATETIME_DTYPE)
+    for i, value in enumerate(values):
+        try:
+            parsed[i] = np.datetime64(value, DATETIME_UNIT)
+        except ValueError:
+            parsed[i] = np.datetime64('NaT')
+    return parsed
+
+
+def _month_index(days):
+    """Index into MONTH_START_DAYS of the month containing each day (days since 1970-01-01)"""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) - MONTH_TABLE_OFFSET
+
+
+def breakdown(start, end):
+    """
+    Exact calendar difference between datetime64 values (scalars or arrays), split into years,
+    months, days, hours, minutes and seconds. Matches dateutil.relativedelta(end, start) for
+    start <= end; where start is later, the two are swapped, as in the calculator.
+    """
+    start = np.asarray(start, dtype=DATETIME_DTYPE).astype(np.int64)
+    end = np.asarray(end, dtype=DATETIME_DTYPE).astype(np.int64)
+    start, end = np.minimum(start, end), np.maximum(start, end)
+    start_days, start_time = np.divmod(start, 86400)
+    start_month = _month_index(start_days)
+    day = start_days - MONTH_START_DAYS[start_month]
+    months = _month_index(end // 86400) - start_month
+
+    def landing(months):
+        # start moved forward by `months`, with the day clipped to the target month's length
+        target = start_month + months
+        month_length = MONTH_START_DAYS[target + 1] - MONTH_START_DAYS[target]
+        return (MONTH_START_DAYS[target] + np.minimum(day, month_length - 1)) * 86400 + start_time
+
+    anchor = landing(months)
+    # Moving by the calendar month count can overshoot end within its month; one month back never does
+    overshoot = anchor > end
+    months = months - overshoot
+    anchor = np.where(overshoot, landing(months), anchor)
+
+    days, remaining = np.divmod(end - anchor, 86400)
+    years, months = np.divmod(months, 12)
+    hours, remaining = np.divmod(remaining, 3600)
+    minutes, seconds = np.divmod(remaining, 60)
+    return dict(zip(BREAKDOWN_FIELDS, (years, months, days, hours, minutes, seconds)))
+
+
+@lru_cache(maxsize=None)
+def zone_transitions(zone_name):
+    """
+    UTC offset table of a zone as (transitions, offsets, local_keys) int64 arrays:
+    offsets[i] applies from UTC second transitions[i - 1] up to transitions[i]. A local wall
+    time uses offsets[i] once it reaches local_keys[i - 1], the later of the two wall-clock
+    readings at transition i - 1, which resolves ambiguous and skipped times like fold=0.
+    """
+    zone = ZoneInfo(zone_name)
+
+    def offset_at(seconds):
+        return int((UTC_EPOCH + timedelta(seconds=seconds)).astimezone(zone).utcoffset().total_seconds())
+
+    first = int((datetime(TRANSITION_YEARS[0], 1, 1, tzinfo=timezone.utc) - UTC_EPOCH).total_seconds())
+    last = int((datetime(TRANSITION_YEARS[1], 1, 1, tzinfo=timezone.utc) - UTC_EPOCH).total_seconds())
+    transitions, offsets = [], [offset_at(first)]
+    previous = first
+    for probe in range(first + TRANSITION_PROBE_SECONDS, last, TRANSITION_PROBE_SECONDS):
+        offset = offset_at(probe)
+        if offset != offsets[-1]:
+            low, high = previous, probe
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset_at(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            transitions.append(high)
+            offsets.append(offset)
+        previous = probe
+    transitions = np.array(transitions, dtype=np.int64)
+    offsets = np.array(offsets, dtype=np.int64)
+    return transitions, offsets, transitions + np.maximum(offsets[:-1], offsets[1:])
+
+
+def to_utc(local, zone_name):
+    """Convert wall-clock datetime64 values in `zone_name` to UTC datetime64 values"""
+    local = np.asarray(local, dtype=DATETIME_DTYPE)
+    _, offsets, local_keys = zone_transitions(zone_name)
+    seconds = local.astype(np.int64)
+    utc = (seconds - offsets[np.searchsorted(local_keys, seconds, side='right')]).astype(DATETIME_DTYPE)
+    return np.where(np.isnat(local), local, utc)
+
+
+def compute_differences(starts, ends, date_format=None, start_zone=None, end_zone=None, business=None):
+    """
+    Vectorized differences for one chunk of start/end strings.
+    Returns (total_seconds, parts, valid): signed seconds from start to end, the breakdown
+    arrays keyed by BREAKDOWN_FIELDS, and a mask of rows where both timestamps parsed.
+    With a zone for either side, total_seconds is the elapsed time between the UTC instants and the
+    breakdown is taken from the start's wall clock, corrected by the change of UTC offset.
+    With a BusinessCalendar, parts also holds the signed working seconds as BUSINESS_FIELD.
+    """
+    local_start = parse_timestamps(starts, date_format)
+    local_end = parse_timestamps(ends, date_format)
+    valid = ~(np.isnat(local_start) | np.isnat(local_end))
+    # Unparsed rows are computed as empty spans and blanked on output
+    epoch = np.datetime64(0, DATETIME_UNIT)
+    local_start = np.where(valid, local_start, epoch)
+    local_end = np.where(valid, local_end, epoch)
+    start = to_utc(local_start, start_zone) if start_zone else local_start
+    end = to_utc(local_end, end_zone) if end_zone else local_end
+    total_seconds = (end - start).astype(np.int64)
+    parts = breakdown(local_start, local_start + (end - start))
+    if business is not None:
+        # Working hours follow the wall clock of each timestamp
+        parts[BUSINESS_FIELD] = business.working_seconds(local_start, local_end)
+    return total_seconds, parts, valid
+
+
+def parse_zoned(starts, ends, date_format=None, start_zone=None, end_zone=None):
+    """Parse start/end strings; with a zone for either side, both are returned as UTC (naive sides count as UTC)"""
+    start = parse_timestamps(starts, date_format)
+    end = parse_timestamps(ends, date_format)
+    if start_zone:
+        start = to_utc(start, start_zone)
+    if end_zone:
+        end = to_utc(end, end_zone)
+    return start, end
+
+
+def column_index(header, column):
+    if column in header:
+        return header.index(column)
+    if str(column).isdigit():
+        return int(column)
+    raise ValueError(f"Column not found: {column}")
+
+
+def read_chunks(path, start_column, end_column, chunk_rows=CHUNK_ROWS, delimiter=','):
+    """Yield (starts, ends) lists of at most `chunk_rows` values from a delimited file with a header row"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        start_index = column_index(header, start_column)
+        end_index = column_index(header, end_column)
+        width = max(start_index, end_index)
+        starts, ends = [], []
+        for row in reader:
+            if len(row) <= width:
+                continue  # Blank or truncated line
+            starts.append(row[start_index].strip())
+            ends.append(row[end_index].strip())
+            if len(starts) >= chunk_rows:
+                yield starts, ends
+                starts, ends = [], []
+        if starts:
+            yield starts, ends
+
+
+def result_rows(starts, ends, total_seconds, parts, valid):
+    """Output rows for one chunk; rows with unparseable timestamps keep only their input columns"""
+    fields = BREAKDOWN_FIELDS + ((BUSINESS_FIELD,) if BUSINESS_FIELD in parts else ())
+    columns = [total_seconds.tolist()] + [parts[field].tolist() for field in fields]
+    rows = zip(starts, ends, *columns)
+    if valid.all():
+        return rows
+    return (row if ok else row[:2] for row, ok in zip(rows, valid.tolist()))
+
+
+def process_file(input_path, output_path, start_column, end_column, date_format=None,
+                 chunk_rows=CHUNK_ROWS, delimiter=',', progress=None, start_zone=None, end_zone=None,
+                 business=None):
+    """
+    Compute differences for every row of `input_path` and stream them to `output_path` as CSV.
+    `start_zone` and `end_zone` name the time zones of the two columns (None: naive times).
+    With a BusinessCalendar as `business`, a business_seconds column is added.
+    `progress`, if given, is called with the number of rows done after each chunk.
+    Returns the number of rows processed.
+    """
+    rows = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(OUTPUT_FIELDS + ((BUSINESS_FIELD,) if business is not None else ()))
+        for starts, ends in read_chunks(input_path, start_column, end_column, chunk_rows, delimiter):
+            total_seconds, parts, valid = compute_differences(starts, ends, date_format, start_zone, end_zone, business)
+            writer.writerows(result_rows(starts, ends, total_seconds, parts, valid))
+            rows += len(starts)
+            if progress:
+                progress(rows)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute time differences for start/end columns of a CSV or log file')
+    parser.add_argument('input', help='CSV or delimited log file with a header row')
+    parser.add_argument('output', help='CSV file to write the results to')
+    parser.add_argument('--start', default='start', help='start column name or zero-based index')
+    parser.add_argument('--end', default='end', help='end column name or zero-based index')
+    parser.add_argument('--format', help='Qt date format of the timestamps (default: ISO 8601)')
+    parser.add_argument('--start-zone', help='time zone of the start column, e.g. Europe/Berlin (default: naive)')
+    parser.add_argument('--end-zone', help='time zone of the end column (default: naive)')
+    parser.add_argument('--business', action='store_true', help='add a business_seconds column of working time')
+    parser.add_argument('--workdays', default=DEFAULT_WORKDAYS, help='working days for --business, e.g. Mon-Fri')
+    parser.add_argument('--hours', default=DEFAULT_HOURS, help='working hours for --business, e.g. 09:00-17:00')
+    parser.add_argument('--holidays', help='file of holiday dates (YYYY-MM-DD per line) for --business')
+    parser.add_argument('--delimiter', default=',', help=r"field delimiter, e.g. ';' or '\t'")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows processed per chunk')
+    args = parser.parse_args()
+
+    delimiter = args.delimiter.encode().decode('unicode_escape')
+    business = None
+    if args.business:
+        holidays = load_holidays(args.holidays) if args.holidays else ()
+        business = BusinessCalendar(args.workdays, args.hours, holidays)
+    start = time.perf_counter()
+    rows = process_file(args.input, args.output, args.start, args.end, args.format,
+                        args.chunk_rows, delimiter, start_zone=args.start_zone, end_zone=args.end_zone,
+                        business=business)
+    elapsed = time.perf_counter() - start
+    print(f"Processed {rows} rows in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
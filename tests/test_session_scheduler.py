@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_scheduler import SessionScheduler
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 1000.0
+
+	def __call__(self):
+		return self.now
+
+
+def test_clear_while_running_records_stopped_phase():
+	clock = FakeClock()
+	scheduler = SessionScheduler(clock=clock)
+	events = []
+	scheduler.listeners.append(events.append)
+	scheduler.add_session('00:25:00', '00:05:00')
+	scheduler.start()
+	clock.now += 60
+
+	scheduler.clear_sessions()
+
+	assert not scheduler.running
+	assert scheduler.sessions == []
+	ends = [event['record'] for event in events if event['event'] == 'end']
+	assert len(ends) == 1
+	assert ends[0]['outcome'] == 'stopped'
+	assert ends[0]['phase'] == 'study'
+	assert ends[0]['actual_end'] - ends[0]['actual_start'] == 60
+	assert [event['event'] for event in events][-2:] == ['stop', 'sessions']
+
+
+def test_clear_while_idle():
+	scheduler = SessionScheduler(clock=FakeClock())
+	scheduler.add_session('00:25:00', '00:05:00')
+	scheduler.clear_sessions()
+	assert scheduler.sessions == []
+	assert not scheduler.running